@@ -0,0 +1,95 @@
+"""Benchmark JSON decode time per block for every installed codec.
+
+Builds a synthetic ``block_api.get_block_range`` response (the shape returned
+by Hive nodes) and reports how long each codec needs to decode it, per block.
+Install ``orjson`` or ``msgspec`` to compare them against the standard library.
+
+    python examples/benchmark_codec.py --blocks 200 --ops 60
+"""
+
+import argparse
+import random
+import time
+
+from nectarlite.codec import available_codecs, get_codec
+
+
+def _synthetic_block(block_num, ops_per_block, rng):
+    transactions = []
+    for trx_num in range(ops_per_block):
+        voter = f"voter{rng.randrange(10_000)}"
+        transactions.append(
+            {
+                "ref_block_num": block_num & 0xFFFF,
+                "ref_block_prefix": rng.randrange(2**32),
+                "expiration": "2024-01-01T00:00:30",
+                "operations": [
+                    {
+                        "type": "vote_operation",
+                        "value": {
+                            "voter": voter,
+                            "author": f"author{rng.randrange(1000)}",
+                            "permlink": f"post-{rng.randrange(10**9):x}",
+                            "weight": rng.choice([10000, 5000, -10000]),
+                        },
+                    }
+                ],
+                "extensions": [],
+                "signatures": [f"{rng.randrange(2**256):064x}" * 2 + "1f"],
+            }
+        )
+    return {
+        "previous": f"{block_num - 1:08x}" + "0" * 32,
+        "timestamp": "2024-01-01T00:00:00",
+        "witness": "witness",
+        "transaction_merkle_root": "0" * 40,
+        "extensions": [],
+        "witness_signature": "1f" + "0" * 128,
+        "transactions": transactions,
+        "block_id": f"{block_num:08x}" + "0" * 32,
+        "signing_key": "STM" + "1" * 50,
+        "transaction_ids": [f"{rng.randrange(2**160):040x}" for _ in transactions],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--ops", type=int, default=60, help="transactions per block")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    response = {
+        "jsonrpc": "2.0",
+        "result": {
+            "blocks": [
+                _synthetic_block(num, args.ops, rng)
+                for num in range(1, args.blocks + 1)
+            ]
+        },
+        "id": 1,
+    }
+    payload = get_codec("json").dumps(response)
+    print(
+        f"Payload: {len(payload) / 1024 / 1024:.2f} MiB, "
+        f"{args.blocks} blocks x {args.ops} transactions"
+    )
+
+    for name in available_codecs():
+        codec = get_codec(name)
+        best = min(_timed(codec.loads, payload) for _ in range(max(1, args.rounds)))
+        print(
+            f"{name:>8}: {best * 1000:8.2f} ms total, "
+            f"{best / args.blocks * 1e6:8.1f} us per block"
+        )
+
+
+def _timed(func, arg):
+    start = time.perf_counter()
+    func(arg)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,221 @@
 """HTTP clients for interacting with Hive nodes."""
 
+import asyncio
+import contextvars
+import itertools
 import logging
 import threading
-from typing import Iterable, List, Mapping, Sequence
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import aclosing, contextmanager, nullcontext
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import httpx
 
-from .exceptions import NodeError
+try:  # pragma: no cover - optional dependency
+    import h2
+except ImportError:  # pragma: no cover - optional dependency
+    h2 = None
+
+try:  # pragma: no cover - optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from .cache import (
+    GLOBAL_PROPERTIES_METHODS,
+    RequestKey,
+    ResponseCache,
+    request_key,
+)
+from .codec import JsonCodec, get_codec
+from .exceptions import DeadlineExceeded, NodeError
+from .jsonstream import ResultItemParser
+from .limits import RequestLimiter
+from .metrics import MetricsRegistry
+from .retry import RetryPolicy
+from .nodes import (
+    CLOSED,
+    DEFAULT_BREAKERS,
+    BreakerRegistry,
+    HeadTracker,
+    MethodLatency,
+    NodeScorer,
+)
 
 log = logging.getLogger(__name__)
 
+#: Default number of JSON-RPC requests packed into a single batch POST.
+DEFAULT_MAX_BATCH_SIZE = 50
+
+#: Seconds between background latency probes started by ``start_probing``.
+DEFAULT_PROBE_INTERVAL = 60.0
+
+#: Methods that change chain state and must never be sent speculatively.
+BROADCAST_METHODS = frozenset(
+    {
+        "broadcast_block",
+        "broadcast_transaction",
+        "broadcast_transaction_synchronous",
+    }
+)
+
+#: Default cap on open connections to each node.
+DEFAULT_MAX_CONNECTIONS_PER_NODE = 10
+
+#: Seconds an idle keep-alive connection stays in the pool.  Longer than the
+#: 3 s block interval so streams polling the head reuse their connection.
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+#: Keep-alive connections held open to each local node.
+DEFAULT_LOCAL_MAX_CONNECTIONS = 100
+
+#: Hosts treated as local when a node is given as a plain ``http://`` URL.
+LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+#: Minimum latency samples for a method before its percentile drives hedging.
+HEDGE_MIN_SAMPLES = 20
+
+
+def _accept_encoding() -> str:
+    encodings = ["gzip", "deflate"]
+    if brotli is not None:
+        encodings.insert(0, "br")
+    if zstandard is not None:
+        encodings.insert(0, "zstd")
+    return ", ".join(encodings)
+
+
+#: Response encodings offered to nodes: gzip and deflate always, ``br`` and
+#: ``zstd`` when ``brotli`` and ``zstandard`` are installed.
+ACCEPT_ENCODING = _accept_encoding()
+
+_JSON_HEADERS = {"Content-Type": "application/json", "Accept-Encoding": ACCEPT_ENCODING}
+_IDENTITY_HEADERS = {"Content-Type": "application/json", "Accept-Encoding": "identity"}
+
+BatchRequest = Tuple[str, str, Iterable | Mapping | None]
+
+#: Node tried first by calls in the current context (set by ``call_many``).
+_preferred_node: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "nectarlite_preferred_node", default=None
+)
+
+#: Session whose call is running in the current context.
+_session: contextvars.ContextVar[Optional["Session"]] = contextvars.ContextVar(
+    "nectarlite_session", default=None
+)
+
+
+#: Monotonic time by which calls in the current context must finish.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "nectarlite_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Cap the total time of every call made inside the ``with`` block.
+
+    The budget covers all failover attempts, backoff and coalesced waits;
+    each attempt's HTTP timeout shrinks to what is left of it.  A nested
+    deadline can only shorten the enclosing one.  ``None`` leaves the current
+    deadline in place.  Calls that run out raise :class:`DeadlineExceeded`.
+    """
+    if seconds is None:
+        yield
+        return
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or ``None`` without one."""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def is_broadcast(api: str, method: str) -> bool:
+    """Return ``True`` if ``api.method`` broadcasts to the chain."""
+    return api == "network_broadcast_api" or method in BROADCAST_METHODS
+
+
+def _rpc_error(error: Any) -> NodeError:
+    """Build a :class:`NodeError` from a JSON-RPC ``error`` member."""
+    if isinstance(error, Mapping):
+        return NodeError(
+            error.get("message", str(error)), error.get("code"), error.get("data")
+        )
+    return NodeError(str(error))
+
+
+def _materialize(params: Iterable | Mapping | None) -> Any:
+    """Return ``params`` with one-shot iterables (generators, ``map``) listed.
+
+    The same object is then used for the cache key and every payload built
+    for the call, so failover attempts send the same params.
+    """
+    if params is None or isinstance(params, (Mapping, list)):
+        return params
+    return list(params)
+
+
+def _method_label(payload: Any) -> str:
+    """Return the metrics label of a request payload."""
+    return payload["method"] if isinstance(payload, Mapping) else "batch"
+
+
+def _wire_bytes(response: Optional[httpx.Response]) -> int:
+    """Bytes of ``response`` body as received, before content decoding."""
+    if response is None:
+        return 0
+    # Responses built in memory (mocks, cassettes) were never downloaded.
+    return response.num_bytes_downloaded or len(response.content)
+
+
+def is_local_node(node_url: str) -> bool:
+    """Return whether ``node_url`` is a Unix socket or plain-HTTP loopback node."""
+    if node_url.startswith("unix://"):
+        return True
+    try:
+        url = httpx.URL(node_url)
+    except httpx.InvalidURL:
+        return False
+    return url.scheme == "http" and url.host in LOCAL_HOSTS
+
+
+def _request_url(node_url: str) -> str:
+    """URL to request for ``node_url``; socket nodes are reached by path."""
+    if node_url.startswith("unix://"):
+        return "http://localhost/"
+    return node_url
+
 
 def _normalize_nodes(nodes: Sequence[str] | str) -> List[str]:
     if isinstance(nodes, str):
@@ -19,24 +225,398 @@ def _normalize_nodes(nodes: Sequence[str] | str) -> List[str]:
     return list(nodes)
 
 
-class Api:
-    """Synchronous HTTP JSON-RPC client using ``httpx``."""
+class _BaseApi:
+    """Transport-independent logic shared by :class:`Api` and :class:`AsyncApi`."""
 
-    def __init__(self, nodes: Sequence[str] | str, timeout: float = 5) -> None:
+    def __init__(
+        self,
+        nodes: Sequence[str] | str,
+        timeout: float = 5,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_sizes: Optional[Mapping[str, int]] = None,
+        scorer: Optional[NodeScorer] = None,
+        breakers: Optional[BreakerRegistry] = None,
+        coalesce: bool = True,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[JsonCodec] = None,
+        max_head_lag: int = 20,
+        limiter: Optional[RequestLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        max_connections_per_node: int = DEFAULT_MAX_CONNECTIONS_PER_NODE,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        metrics: Optional[MetricsRegistry] = None,
+        transport: Optional[Any] = None,
+        compression: bool | Mapping[str, bool] = True,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
         self.nodes = _normalize_nodes(nodes)
         self.timeout = timeout
-        self._current_node_index = -1
+        self.max_batch_size = max_batch_size
+        self.batch_sizes = dict(batch_sizes or {})
+        self.scorer = scorer or NodeScorer()
+        self.breakers = breakers if breakers is not None else DEFAULT_BREAKERS
+        self.method_latency = MethodLatency()
+        self.coalesce = coalesce
+        self.cache = cache
+        self.codec = codec or get_codec()
+        self.heads = HeadTracker(max_lag=max_head_lag)
+        self.limiter = limiter
+        self.retry = retry or RetryPolicy()
+        # httpx pools are shared by all hosts, so the per-node cap is scaled by
+        # the number of nodes.
+        pool_size = max_connections_per_node * len(self.nodes)
+        self.pool_limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and h2 is None:
+            log.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1.")
+            http2 = False
+        self.http2 = http2
+        self.metrics = metrics
+        self.transport = transport
+        self.local_nodes = [node for node in self.nodes if is_local_node(node)]
+        if isinstance(compression, Mapping):
+            self.compression = True
+            self._compression = {
+                node.rstrip("/"): bool(enabled) for node, enabled in compression.items()
+            }
+        else:
+            self.compression = bool(compression)
+            self._compression = {}
+        for node_url in self.local_nodes:
+            # Decoding costs more than loopback bandwidth.
+            self._compression.setdefault(node_url.rstrip("/"), False)
+        self._inflight: Dict[RequestKey, Any] = {}
         self._lock = threading.Lock()
-        self._client = httpx.Client(timeout=timeout)
-        self.is_async = False
+        self._request_ids = itertools.count(1)
+
+    @staticmethod
+    def _request_key(
+        api: str, method: str, params: Iterable | Mapping | None
+    ) -> Optional[RequestKey]:
+        """Return the cache/single-flight key for a call, or ``None`` if the
+        call must always be sent on its own."""
+        if is_broadcast(api, method):
+            return None
+        return request_key(api, method, params)
+
+    def _cached(self, key: Optional[RequestKey]) -> Tuple[bool, Any]:
+        if key is None or self.cache is None:
+            return False, None
+        return self.cache.get(key)
+
+    def _remember(self, key: Optional[RequestKey], params: Any, result: Any) -> Any:
+        if key is not None and self.cache is not None:
+            self.cache.put(key, params, result)
+        return result
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return response cache counters, or an empty dict without a cache."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def _ranked(self) -> List[str]:
+        """Nodes by score, with local nodes ahead of remote ones."""
+        ranked = self.scorer.ranked(self.nodes)
+        if not self.local_nodes:
+            return ranked
+        return [node for node in ranked if node in self.local_nodes] + [
+            node for node in ranked if node not in self.local_nodes
+        ]
+
+    def _node_order(self) -> Iterator[str]:
+        """Yield the nodes to try for one call, best candidate first.
+
+        Nodes whose circuit breaker is open are skipped and nodes whose head
+        block lags the best known head are tried last.  The breaker is
+        consulted lazily so a half-open probe slot is only claimed for a node
+        that is actually about to be called.  A healthy node preferred by the
+        current context (a :class:`Session` pin or a ``call_many`` worker) is
+        tried first.  Local nodes rank ahead of remote ones.
+        """
+        ordered = self.heads.partition(self._ranked())
+        session = _session.get()
+        if session is not None and session.client is self:
+            preferred = session.node
+        else:
+            preferred = _preferred_node.get()
+        if preferred in ordered and not self.heads.is_lagging(preferred):
+            ordered.remove(preferred)
+            ordered.insert(0, preferred)
+        for node_url in ordered:
+            if self.breakers.get(node_url).allow_request():
+                yield node_url
+            else:
+                log.debug("Skipping %s: circuit open.", node_url)
+
+    @staticmethod
+    def _exhausted() -> NodeError:
+        """Return the error raised once no attempt is left."""
+        remaining = _remaining()
+        if remaining is not None and remaining <= 0:
+            return DeadlineExceeded("Deadline exceeded before any node answered.")
+        return NodeError("All nodes failed.")
+
+    def _request_options(self) -> Tuple[Dict[str, Any], bool]:
+        """Per-request ``httpx`` options; shrinks the timeout to the deadline.
+
+        Also returns whether the timeout was shortened, in which case a
+        timeout says nothing about the node's health.
+        """
+        remaining = _remaining()
+        if remaining is None or remaining >= self.timeout:
+            return {}, False
+        return {"timeout": max(0.001, remaining)}, True
+
+    def _healthy_nodes(self) -> List[str]:
+        """Return nodes that are neither lagging nor tripped, best first."""
+        healthy = [
+            node_url
+            for node_url in self._ranked()
+            if not self.heads.is_lagging(node_url)
+            and self.breakers.get(node_url).state == CLOSED
+        ]
+        return healthy or list(self.nodes)
+
+    def _client_options(self) -> Dict[str, Any]:
+        """Keyword arguments for the underlying ``httpx`` client."""
+        options: Dict[str, Any] = {
+            "timeout": self.timeout,
+            "limits": self.pool_limits,
+            "http2": self.http2,
+        }
+        if self.transport is not None:
+            options["transport"] = self.transport
+        return options
+
+    def _local_client_options(
+        self, node_url: str, transport_class: type
+    ) -> Dict[str, Any]:
+        """Keyword arguments for the dedicated client of a local node.
+
+        Local nodes get a large keep-alive pool, HTTP/1.1 and no proxy lookup;
+        ``unix://`` nodes connect through the socket at the URL's path.
+        """
+        limits = httpx.Limits(
+            max_connections=DEFAULT_LOCAL_MAX_CONNECTIONS,
+            max_keepalive_connections=DEFAULT_LOCAL_MAX_CONNECTIONS,
+            keepalive_expiry=self.pool_limits.keepalive_expiry,
+        )
+        options: Dict[str, Any] = {
+            "timeout": self.timeout,
+            "limits": limits,
+            "trust_env": False,
+        }
+        if node_url.startswith("unix://"):
+            options["transport"] = transport_class(
+                uds=httpx.URL(node_url).path, limits=limits
+            )
+        return options
+
+    def _route(self, node_url: str) -> Tuple[Any, str]:
+        """Return the client and URL used to reach ``node_url``."""
+        return self._local_clients.get(node_url, self._client), _request_url(node_url)
+
+    def compression_enabled(self, node_url: str) -> bool:
+        """Return whether compressed responses are requested from ``node_url``."""
+        return self._compression.get(node_url.rstrip("/"), self.compression)
+
+    def set_compression(self, node_url: str, enabled: bool) -> None:
+        """Request compressed responses from ``node_url`` or turn them off.
+
+        Worth disabling for a node on a fast link when decoding costs more
+        CPU than the bandwidth it saves.
+        """
+        self._compression[node_url.rstrip("/")] = enabled
+
+    def _headers(self, node_url: str) -> Dict[str, str]:
+        if self.compression_enabled(node_url):
+            return _JSON_HEADERS
+        return _IDENTITY_HEADERS
+
+    def _warm_up_targets(self, connections: int) -> List[str]:
+        connections = max(1, min(connections, self.pool_limits.max_connections))
+        return [node for node in self.nodes for _ in range(connections)]
+
+    def _attempts(self, label: str = "batch") -> Iterator[Tuple[str, float]]:
+        """Yield ``(node_url, delay)`` for each attempt at one call.
+
+        Attempts stop after :attr:`retry` ``max_attempts``, when its retry
+        budget is exhausted or when the :func:`deadline` passes; ``delay`` is
+        the backoff to wait before sending.
+        ``label`` names the call in failover metrics.
+        """
+        self.retry.record_call()
+        nodes = self._node_order()
+        attempt = 0
+        while True:
+            step = self._next_attempt(nodes, attempt, label)
+            if step is None:
+                return
+            yield step
+            attempt += 1
+
+    def _next_attempt(
+        self, nodes: Iterator[str], attempt: int, label: str, event: str = "failover"
+    ) -> Optional[Tuple[str, float]]:
+        """Return ``(node_url, delay)`` for attempt number ``attempt``.
+
+        Returns ``None`` once the deadline, ``max_attempts``, the retry budget
+        or ``nodes`` run out.  ``event`` (``"failover"`` or ``"hedge"``) names
+        a later attempt in the metrics.
+        """
+        remaining = _remaining()
+        if remaining is not None and remaining <= 0:
+            return None
+        if (
+            attempt
+            and self.retry.max_attempts is not None
+            and attempt >= self.retry.max_attempts
+        ):
+            return None
+        # Only now pull the next node: that claims its half-open probe slot.
+        node_url = next(nodes, None)
+        if node_url is None:
+            return None
+        if attempt:
+            if not self.retry.acquire_retry():
+                log.warning("Retry budget exhausted; not trying %s.", node_url)
+                self.breakers.get(node_url).release()
+                return None
+            if self.metrics is not None and event == "hedge":
+                self.metrics.record_hedge(node_url, label)
+            elif self.metrics is not None:
+                self.metrics.record_failover(node_url, label)
+        delay = self.retry.backoff(attempt)
+        return node_url, delay if remaining is None else min(delay, remaining)
+
+    def _measure(
+        self,
+        node_url: str,
+        payload: Any,
+        elapsed: float,
+        content: bytes,
+        response: Optional[httpx.Response],
+        error: Optional[str],
+    ) -> None:
+        """Record one round trip in :attr:`metrics`."""
+        self.metrics.record_request(
+            node_url,
+            _method_label(payload),
+            elapsed,
+            len(content),
+            len(response.content) if response is not None else 0,
+            error,
+            _wire_bytes(response),
+        )
 
-    def _get_next_node(self) -> str:
+    def _record_stream(
+        self,
+        node_url: str,
+        label: str,
+        start: float,
+        first_byte: Optional[float],
+        content: bytes,
+        received: int,
+        wire_bytes: int,
+        error: Optional[BaseException],
+    ) -> None:
+        """Account for a streamed response once it has ended.
+
+        Node health uses the time to the response headers, so a slow consumer
+        does not make the node look slow.
+        """
+        latency = (first_byte or time.monotonic()) - start
+        if isinstance(error, DeadlineExceeded):
+            # Cut short by the caller's deadline: no verdict on the node.
+            pass
+        elif error is None or isinstance(error, NodeError) and first_byte is not None:
+            self._record_success(node_url, latency)
+        else:
+            self._record_failure(node_url, latency)
+        if self.metrics is not None:
+            self.metrics.record_request(
+                node_url,
+                label,
+                time.monotonic() - start,
+                len(content),
+                received,
+                None if error is None else type(error).__name__,
+                wire_bytes,
+            )
+
+    def _record_success(self, node_url: str, elapsed: float) -> None:
+        self.scorer.record_success(node_url, elapsed)
+        self.breakers.get(node_url).record_success()
+        session = _session.get()
+        if session is not None and session.client is self:
+            # Follow failovers so the rest of the session stays together.
+            session.node = node_url
+
+    def _deadline_cut(self, node_url: str, exc: httpx.TimeoutException) -> NodeError:
+        """Handle an attempt stopped by the caller's deadline, not the node.
+
+        The node's score and breaker are left alone; a claimed half-open probe
+        slot is given back.
+        """
+        self.breakers.get(node_url).release()
+        return DeadlineExceeded(f"Deadline exceeded waiting for {node_url}: {exc}")
+
+    def _record_failure(self, node_url: str, elapsed: float) -> None:
+        self.scorer.record_failure(node_url, elapsed)
+        self.breakers.get(node_url).record_failure()
+
+    def _observe_heads(self, node_url: str, payload: Any, body: Any) -> None:
+        """Feed head block numbers from DGP responses into :attr:`heads`."""
+        if isinstance(payload, Mapping):
+            if payload["method"] in GLOBAL_PROPERTIES_METHODS and isinstance(
+                body, Mapping
+            ):
+                self.heads.observe_properties(node_url, body.get("result"))
+            return
+        wanted = {p["id"] for p in payload if p["method"] in GLOBAL_PROPERTIES_METHODS}
+        if wanted and isinstance(body, list):
+            for item in body:
+                if isinstance(item, Mapping) and item.get("id") in wanted:
+                    self.heads.observe_properties(node_url, item.get("result"))
+
+    def node_heads(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Return the last head block reported by each node and its lag."""
+        return self.heads.snapshot()
+
+    def breaker_states(self) -> Dict[str, str]:
+        """Return the circuit breaker state of each configured node."""
+        return self.breakers.states(self.nodes)
+
+    @staticmethod
+    def _unwrap(body: Any) -> Any:
+        if not isinstance(body, Mapping):
+            raise NodeError("Node returned a malformed JSON-RPC response.")
+        if "error" in body:
+            raise _rpc_error(body["error"])
+        return body.get("result")
+
+    def _probe_payload(self) -> dict:
+        return self._build_payload(
+            "condenser_api",
+            "get_dynamic_global_properties",
+            [],
+            self._next_request_id(),
+        )
+
+    def _next_request_id(self) -> int:
         with self._lock:
-            self._current_node_index = (self._current_node_index + 1) % len(self.nodes)
-            return self.nodes[self._current_node_index]
+            return next(self._request_ids)
 
     def _build_payload(
-        self, api: str, method: str, params: Iterable | Mapping | None
+        self,
+        api: str,
+        method: str,
+        params: Iterable | Mapping | None,
+        request_id: int = 1,
     ) -> dict:
         if params is None:
             payload_params: Iterable | Mapping = []
@@ -48,31 +628,498 @@ class Api:
             "jsonrpc": "2.0",
             "method": f"{api}.{method}",
             "params": payload_params,
-            "id": 1,
+            "id": request_id,
         }
 
-    def call(self, api: str, method: str, params: Iterable | Mapping | None = None):
-        """Make an RPC call to a Hive node."""
+    def _batch_size_for(self, node_url: str) -> int:
+        """Return the maximum number of requests ``node_url`` accepts per batch."""
+        return max(1, int(self.batch_sizes.get(node_url, self.max_batch_size)))
+
+    def _build_batch(self, requests: Sequence[BatchRequest]) -> List[dict]:
+        return [
+            self._build_payload(api, method, params, self._next_request_id())
+            for api, method, params in requests
+        ]
+
+    @staticmethod
+    def _parse_batch_response(payloads: Sequence[dict], body: Any) -> List[Any]:
+        """Match batch response items to ``payloads`` by id.
+
+        Per-item JSON-RPC errors are returned as :class:`NodeError` instances in
+        place of the result.  A response that is not a list (e.g. a node that
+        rejects batching outright) raises :class:`NodeError`.
+        """
+        if isinstance(body, Mapping) and "error" in body:
+            raise _rpc_error(body["error"])
+        if not isinstance(body, list):
+            raise NodeError("Node returned a non-batch response to a batch request.")
+
+        by_id = {item.get("id"): item for item in body if isinstance(item, Mapping)}
+        results: List[Any] = []
+        for payload in payloads:
+            item = by_id.get(payload["id"])
+            if item is None:
+                results.append(
+                    NodeError(f"No response for batch item {payload['method']}.")
+                )
+            elif "error" in item:
+                results.append(_rpc_error(item["error"]))
+            else:
+                results.append(item.get("result"))
+        return results
+
+
+class Api(_BaseApi):
+    """Synchronous HTTP JSON-RPC client using ``httpx``."""
+
+    def __init__(
+        self,
+        nodes: Sequence[str] | str,
+        timeout: float = 5,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_sizes: Optional[Mapping[str, int]] = None,
+        scorer: Optional[NodeScorer] = None,
+        breakers: Optional[BreakerRegistry] = None,
+        coalesce: bool = True,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[JsonCodec] = None,
+        max_head_lag: int = 20,
+        limiter: Optional[RequestLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        max_connections_per_node: int = DEFAULT_MAX_CONNECTIONS_PER_NODE,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        metrics: Optional[MetricsRegistry] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        compression: bool | Mapping[str, bool] = True,
+    ) -> None:
+        """Create the client.
+
+        With ``coalesce=True`` concurrent identical read calls made from
+        different threads share one in-flight request; every caller receives
+        the same result object (or exception).  ``cache`` puts a
+        :class:`~nectarlite.cache.ResponseCache` in front of :meth:`call`.
+        ``codec`` overrides the JSON codec (default: the fastest installed).
+        Nodes whose last reported head block is more than ``max_head_lag``
+        blocks behind the best node are only used as a last resort.
+        ``limiter`` caps concurrent requests and requests per second (see
+        :class:`~nectarlite.limits.RequestLimiter`).  ``retry`` controls which
+        errors fail over to the next node, backoff and the retry budget (see
+        :class:`~nectarlite.retry.RetryPolicy`).
+
+        Up to ``max_connections_per_node`` connections per node are kept in
+        the pool and reused until idle for ``keepalive_expiry`` seconds.
+        ``http2=True`` multiplexes requests over one connection per node when
+        the ``h2`` package is installed (``pip install nectarlite[http2]``).  Call
+        :meth:`warm_up` to open connections before the first real request.
+        ``metrics`` records per-node, per-method counters and latency (see
+        :class:`~nectarlite.metrics.MetricsRegistry`).  ``transport`` replaces
+        the ``httpx`` network transport, e.g. with a
+        :class:`~nectarlite.cassette.ReplayTransport`.
+
+        Responses are requested gzip, brotli or zstd compressed, as far as the
+        decoders are installed (see :data:`ACCEPT_ENCODING`).  Pass
+        ``compression=False`` to ask every node for uncompressed bodies, or a
+        ``{node: bool}`` mapping to choose per node; :meth:`set_compression`
+        changes it later.
+
+        Nodes given as ``unix:///path/to.sock`` or as plain ``http://`` on a
+        loopback host are local: they are tried before remote nodes, get
+        their own client with a large keep-alive pool and are asked for
+        uncompressed responses unless ``compression`` names them.
+        """
+        super().__init__(
+            nodes,
+            timeout,
+            max_batch_size,
+            batch_sizes,
+            scorer,
+            breakers,
+            coalesce,
+            cache,
+            codec,
+            max_head_lag,
+            limiter,
+            retry,
+            max_connections_per_node,
+            keepalive_expiry,
+            http2,
+            metrics,
+            transport,
+            compression,
+        )
+        self._client = httpx.Client(**self._client_options())
+        self._local_clients: Dict[str, httpx.Client] = {}
+        if transport is None:
+            for node_url in self.local_nodes:
+                self._local_clients[node_url] = httpx.Client(
+                    **self._local_client_options(node_url, httpx.HTTPTransport)
+                )
+        self._probe_stop: Optional[threading.Event] = None
+        self.is_async = False
+
+    def _post(self, node_url: str, payload: Any) -> Any:
+        """POST ``payload`` to ``node_url`` and return the decoded body.
+
+        Waits for :attr:`limiter` first when one is configured.
+        """
+        if self.limiter is None:
+            return self._send(node_url, payload)
+        with self.limiter.slot(node_url):
+            return self._send(node_url, payload)
+
+    def _send(self, node_url: str, payload: Any) -> Any:
+        """Send one request; latency and failures feed node health tracking."""
+        content = self.codec.dumps(payload)
+        client, url = self._route(node_url)
+        options, cut = self._request_options()
+        response = None
+        start = time.monotonic()
+        try:
+            response = client.post(
+                url,
+                content=content,
+                headers=self._headers(node_url),
+                **options,
+            )
+            response.raise_for_status()
+            body = self.codec.loads(response.content)
+        except httpx.HTTPError as exc:
+            elapsed = time.monotonic() - start
+            if cut and isinstance(exc, httpx.TimeoutException):
+                if self.metrics is not None:
+                    self._measure(
+                        node_url,
+                        payload,
+                        elapsed,
+                        content,
+                        response,
+                        "DeadlineExceeded",
+                    )
+                raise self._deadline_cut(node_url, exc) from exc
+            self._record_failure(node_url, elapsed)
+            if self.metrics is not None:
+                self._measure(
+                    node_url, payload, elapsed, content, response, type(exc).__name__
+                )
+            raise
+        except ValueError as exc:
+            elapsed = time.monotonic() - start
+            self._record_failure(node_url, elapsed)
+            if self.metrics is not None:
+                self._measure(
+                    node_url, payload, elapsed, content, response, "InvalidJSON"
+                )
+            raise NodeError(f"Invalid JSON response from {node_url}: {exc}") from exc
+        elapsed = time.monotonic() - start
+        self._record_success(node_url, elapsed)
+        if self.metrics is not None:
+            error = (
+                "NodeError" if isinstance(body, Mapping) and "error" in body else None
+            )
+            self._measure(node_url, payload, elapsed, content, response, error)
+        if isinstance(payload, Mapping):
+            self.method_latency.record(payload["method"], elapsed)
+        self._observe_heads(node_url, payload, body)
+        return body
+
+    def call(
+        self,
+        api: str,
+        method: str,
+        params: Iterable | Mapping | None = None,
+        timeout: Optional[float] = None,
+    ):
+        """Make an RPC call to a Hive node.
+
+        ``timeout`` caps the total seconds spent across all failover attempts
+        (see :func:`deadline`).
+        """
+        with deadline(timeout):
+            return self._call_shared(api, method, _materialize(params))
+
+    def session(self) -> "Session":
+        """Return a :class:`Session` pinning calls to the best healthy node."""
+        return Session(self, self._healthy_nodes()[0])
+
+    def _call_shared(self, api: str, method: str, params: Iterable | Mapping | None):
+        """Serve a call from the cache or an identical in-flight call."""
+        key = self._request_key(api, method, params)
+        hit, result = self._cached(key)
+        if hit:
+            return result
+        if key is None or not self.coalesce:
+            return self._fetch(key, api, method, params)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            try:
+                return future.result(timeout=_remaining())
+            except FutureTimeoutError:
+                raise DeadlineExceeded(
+                    "Deadline exceeded waiting for a shared call."
+                ) from None
+
+        try:
+            result = self._fetch(key, api, method, params)
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def _fetch(self, key: Optional[RequestKey], api: str, method: str, params):
+        return self._remember(key, params, self._call(api, method, params))
+
+    def _call(self, api: str, method: str, params: Iterable | Mapping | None):
+        params = _materialize(params)
+        for node_url, delay in self._attempts(f"{api}.{method}"):
+            if delay:
+                time.sleep(delay)
+            payload = self._build_payload(api, method, params, self._next_request_id())
+            try:
+                return self._unwrap(self._post(node_url, payload))
+            except httpx.HTTPError as exc:
+                log.error("Error calling %s: %s", node_url, exc)
+            except NodeError as exc:
+                log.error("Node error from %s: %s", node_url, exc)
+                if not self.retry.is_retriable(exc):
+                    raise
+
+        raise self._exhausted()
+
+    def call_batch(
+        self,
+        requests: Iterable[BatchRequest],
+        max_batch_size: Optional[int] = None,
+    ) -> List[Any]:
+        """Send many ``(api, method, params)`` calls as JSON-RPC batches.
+
+        Requests are split into chunks no larger than the node's batch size
+        (``max_batch_size`` overrides the per-node setting).  Results are
+        returned in input order; items the node rejected are returned as
+        :class:`NodeError` instances instead of raising.
+        """
+
+        pending = [
+            (api, method, _materialize(params)) for api, method, params in requests
+        ]
+        results: List[Any] = []
+        while pending:
+            chunk_results = self._send_batch_chunk(pending, max_batch_size)
+            results.extend(chunk_results)
+            pending = pending[len(chunk_results) :]
+        return results
 
-        for _ in range(len(self.nodes)):
-            node_url = self._get_next_node()
-            payload = self._build_payload(api, method, params)
+    def call_many(
+        self,
+        requests: Iterable[BatchRequest],
+        max_workers: Optional[int] = None,
+    ) -> List[Any]:
+        """Run independent ``(api, method, params)`` calls concurrently.
+
+        Calls are made with :meth:`call` from a thread pool sharing this
+        client's connection pool, so caching, coalescing and failover still
+        apply.  Each call starts on a different healthy node, round-robin.
+        Results are returned in input order; a call that failed is returned
+        as its exception instead of raising.  ``max_workers`` defaults to the
+        connection pool size.
+        """
+        pending = list(requests)
+        if not pending:
+            return []
+        workers = max_workers or self.pool_limits.max_connections or len(pending)
+        nodes = itertools.cycle(self._healthy_nodes())
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            thread_name_prefix="nectarlite-call",
+        ) as pool:
+            # Each worker runs in a copy of this context so a surrounding
+            # deadline() applies to every call.
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run, self._call_on, next(nodes), request
+                )
+                for request in pending
+            ]
+            return [future.result() for future in futures]
+
+    def stream_call(
+        self,
+        api: str,
+        method: str,
+        params: Iterable | Mapping | None = None,
+        key: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """Yield the items of an array result while the response downloads.
+
+        The items of ``result`` (or ``result[key]``, e.g. ``"blocks"`` for
+        ``block_api.get_block_range``) are parsed incrementally, so the first
+        item arrives before the body is complete and the whole response is
+        never held in memory.  If a node fails mid-stream the call resumes on
+        the next node and skips the items already yielded, which assumes the
+        result is the same on every node.  Streamed calls are neither cached
+        nor coalesced.
+        """
+        label = f"{api}.{method}"
+        params = _materialize(params)
+        yielded = 0
+        for node_url, delay in self._attempts(label):
+            if delay:
+                time.sleep(delay)
+            payload = self._build_payload(api, method, params, self._next_request_id())
             try:
-                response = self._client.post(node_url, json=payload)
+                for index, item in enumerate(self._stream(node_url, payload, key)):
+                    if index >= yielded:
+                        yielded += 1
+                        yield item
+                return
+            except (httpx.HTTPError, ValueError) as exc:
+                log.error("Error streaming from %s: %s", node_url, exc)
+            except NodeError as exc:
+                log.error("Node error from %s: %s", node_url, exc)
+                if not self.retry.is_retriable(exc):
+                    raise
+
+        raise self._exhausted()
+
+    def _stream(
+        self, node_url: str, payload: dict, key: Optional[str]
+    ) -> Iterator[Any]:
+        content = self.codec.dumps(payload)
+        client, url = self._route(node_url)
+        parser = ResultItemParser(key)
+        limit = self.limiter.slot(node_url) if self.limiter else nullcontext()
+        start = time.monotonic()
+        first_byte = None
+        received = 0
+        response: Optional[httpx.Response] = None
+        error: Optional[BaseException] = None
+        options, cut = self._request_options()
+        try:
+            with (
+                limit,
+                client.stream(
+                    "POST",
+                    url,
+                    content=content,
+                    headers=self._headers(node_url),
+                    **options,
+                ) as response,
+            ):
+                first_byte = time.monotonic()
                 response.raise_for_status()
-                result = response.json()
-                if "error" in result:
-                    raise NodeError(result["error"]["message"])
-                return result.get("result")
+                for chunk in response.iter_bytes():
+                    received += len(chunk)
+                    yield from parser.feed(chunk)
+                yield from parser.close()
+        except (httpx.HTTPError, NodeError, ValueError) as exc:
+            if cut and isinstance(exc, httpx.TimeoutException):
+                error = self._deadline_cut(node_url, exc)
+                raise error from exc
+            error = exc
+            raise
+        finally:
+            self._record_stream(
+                node_url,
+                payload["method"],
+                start,
+                first_byte,
+                content,
+                received,
+                response.num_bytes_downloaded if response is not None else 0,
+                error,
+            )
+
+    def _call_on(self, node_url: str, request: BatchRequest) -> Any:
+        token = _preferred_node.set(node_url)
+        try:
+            return self.call(*request)
+        except Exception as exc:  # noqa: BLE001 - returned to the caller
+            return exc
+        finally:
+            _preferred_node.reset(token)
+
+    def _send_batch_chunk(
+        self, pending: Sequence[BatchRequest], max_batch_size: Optional[int]
+    ) -> List[Any]:
+        for node_url, delay in self._attempts():
+            if delay:
+                time.sleep(delay)
+            size = max_batch_size or self._batch_size_for(node_url)
+            payloads = self._build_batch(pending[:size])
+            try:
+                body = self._post(node_url, payloads)
+                return self._parse_batch_response(payloads, body)
             except httpx.HTTPError as exc:
                 log.error("Error calling %s: %s", node_url, exc)
             except NodeError as exc:
                 log.error("Node error from %s: %s", node_url, exc)
 
-        raise NodeError("All nodes failed.")
+        raise self._exhausted()
+
+    def probe_nodes(self) -> None:
+        """Measure every node with ``get_dynamic_global_properties``."""
+        for node_url in self.nodes:
+            try:
+                self._unwrap(self._post(node_url, self._probe_payload()))
+            except (httpx.HTTPError, NodeError) as exc:
+                log.debug("Probe of %s failed: %s", node_url, exc)
+
+    def _warm(self, node_url: str) -> bool:
+        try:
+            self._unwrap(self._post(node_url, self._probe_payload()))
+        except (httpx.HTTPError, NodeError) as exc:
+            log.debug("Warm-up of %s failed: %s", node_url, exc)
+            return False
+        return True
+
+    def warm_up(self, connections: int = 1) -> Dict[str, bool]:
+        """Open ``connections`` pooled connections to every node.
+
+        Each connection completes its TCP and TLS handshakes with a
+        ``get_dynamic_global_properties`` request, which also seeds latency
+        and head tracking.  Returns whether each node answered.
+        """
+        targets = self._warm_up_targets(connections)
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            results = list(pool.map(self._warm, targets))
+        status = dict.fromkeys(self.nodes, False)
+        for node_url, ok in zip(targets, results):
+            status[node_url] = status[node_url] or ok
+        return status
+
+    def start_probing(self, interval: float = DEFAULT_PROBE_INTERVAL) -> None:
+        """Probe all nodes every ``interval`` seconds in a daemon thread."""
+        if self._probe_stop is not None:
+            return
+        stop = self._probe_stop = threading.Event()
+
+        def _run() -> None:
+            while not stop.is_set():
+                self.probe_nodes()
+                stop.wait(interval)
+
+        threading.Thread(target=_run, name="nectarlite-probe", daemon=True).start()
+
+    def stop_probing(self) -> None:
+        if self._probe_stop is not None:
+            self._probe_stop.set()
+            self._probe_stop = None
 
     def close(self) -> None:
+        self.stop_probing()
         self._client.close()
+        for client in self._local_clients.values():
+            client.close()
 
     def __enter__(self) -> "Api":
         return self
@@ -81,65 +1128,575 @@ class Api:
         self.close()
 
 
-class AsyncApi:
+class AsyncApi(_BaseApi):
     """Async HTTP JSON-RPC client backed by ``httpx.AsyncClient``."""
 
-    def __init__(self, nodes: Sequence[str] | str, timeout: float = 5) -> None:
-        self.nodes = _normalize_nodes(nodes)
-        self.timeout = timeout
-        self._current_node_index = -1
-        self._lock = threading.Lock()
-        self._client = httpx.AsyncClient(timeout=timeout)
+    def __init__(
+        self,
+        nodes: Sequence[str] | str,
+        timeout: float = 5,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_sizes: Optional[Mapping[str, int]] = None,
+        scorer: Optional[NodeScorer] = None,
+        breakers: Optional[BreakerRegistry] = None,
+        hedge: bool = False,
+        hedge_percentile: float = 0.9,
+        hedge_delay: float = 1.0,
+        hedge_methods: Optional[Iterable[str]] = None,
+        hedge_exclude: Iterable[str] = (),
+        coalesce: bool = True,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[JsonCodec] = None,
+        max_head_lag: int = 20,
+        limiter: Optional[RequestLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        max_connections_per_node: int = DEFAULT_MAX_CONNECTIONS_PER_NODE,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        metrics: Optional[MetricsRegistry] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        compression: bool | Mapping[str, bool] = True,
+    ) -> None:
+        """Create the client.
+
+        With ``hedge=True`` read calls that have not answered within the
+        ``hedge_percentile`` latency observed for that method (``hedge_delay``
+        seconds until enough samples exist) are re-sent to the next-best node
+        and the first answer wins.  ``hedge_methods`` restricts hedging to the
+        listed ``"api.method"`` names; ``hedge_exclude`` adds names that are
+        never hedged.  Broadcast methods are never hedged.
+
+        With ``coalesce=True`` concurrent identical read calls share one
+        in-flight request; every awaiting task receives the same result object
+        (or exception).  ``cache`` puts a
+        :class:`~nectarlite.cache.ResponseCache` in front of :meth:`call`.
+        ``codec`` overrides the JSON codec (default: the fastest installed).
+        Nodes whose last reported head block is more than ``max_head_lag``
+        blocks behind the best node are only used as a last resort.
+        ``limiter`` caps concurrent requests and requests per second (see
+        :class:`~nectarlite.limits.RequestLimiter`).  ``retry`` controls which
+        errors fail over to the next node, backoff and the retry budget (see
+        :class:`~nectarlite.retry.RetryPolicy`).
+
+        Up to ``max_connections_per_node`` connections per node are kept in
+        the pool and reused until idle for ``keepalive_expiry`` seconds.
+        ``http2=True`` multiplexes requests over one connection per node when
+        the ``h2`` package is installed (``pip install nectarlite[http2]``).  Call
+        :meth:`warm_up` to open connections before the first real request.
+        ``metrics`` records per-node, per-method counters and latency (see
+        :class:`~nectarlite.metrics.MetricsRegistry`).  ``transport`` replaces
+        the ``httpx`` network transport, e.g. with a
+        :class:`~nectarlite.cassette.ReplayTransport`.
+
+        Responses are requested gzip, brotli or zstd compressed, as far as the
+        decoders are installed (see :data:`ACCEPT_ENCODING`).  Pass
+        ``compression=False`` to ask every node for uncompressed bodies, or a
+        ``{node: bool}`` mapping to choose per node; :meth:`set_compression`
+        changes it later.
+
+        Nodes given as ``unix:///path/to.sock`` or as plain ``http://`` on a
+        loopback host are local: they are tried before remote nodes, get
+        their own client with a large keep-alive pool and are asked for
+        uncompressed responses unless ``compression`` names them.
+        """
+        super().__init__(
+            nodes,
+            timeout,
+            max_batch_size,
+            batch_sizes,
+            scorer,
+            breakers,
+            coalesce,
+            cache,
+            codec,
+            max_head_lag,
+            limiter,
+            retry,
+            max_connections_per_node,
+            keepalive_expiry,
+            http2,
+            metrics,
+            transport,
+            compression,
+        )
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.hedge_methods = frozenset(hedge_methods) if hedge_methods else None
+        self.hedge_exclude = frozenset(hedge_exclude)
+        self._client = httpx.AsyncClient(**self._client_options())
+        self._local_clients: Dict[str, httpx.AsyncClient] = {}
+        if transport is None:
+            for node_url in self.local_nodes:
+                self._local_clients[node_url] = httpx.AsyncClient(
+                    **self._local_client_options(node_url, httpx.AsyncHTTPTransport)
+                )
+        self._probe_task: Optional[asyncio.Task] = None
         self.is_async = True
 
-    def _get_next_node(self) -> str:
-        with self._lock:
-            self._current_node_index = (self._current_node_index + 1) % len(self.nodes)
-            return self.nodes[self._current_node_index]
+    async def _post(self, node_url: str, payload: Any) -> Any:
+        """Asynchronously POST ``payload`` and return the decoded body."""
+        if self.limiter is None:
+            return await self._send(node_url, payload)
+        async with self.limiter.async_slot(node_url):
+            return await self._send(node_url, payload)
 
-    def _build_payload(
-        self, api: str, method: str, params: Iterable | Mapping | None
-    ) -> dict:
-        if params is None:
-            payload_params: Iterable | Mapping = []
-        elif isinstance(params, Mapping):
-            payload_params = params
-        else:
-            payload_params = list(params)
-        return {
-            "jsonrpc": "2.0",
-            "method": f"{api}.{method}",
-            "params": payload_params,
-            "id": 1,
-        }
+    async def _send(self, node_url: str, payload: Any) -> Any:
+        """Send one request; latency and failures feed node health tracking."""
+        content = self.codec.dumps(payload)
+        client, url = self._route(node_url)
+        options, cut = self._request_options()
+        response = None
+        start = time.monotonic()
+        try:
+            response = await client.post(
+                url,
+                content=content,
+                headers=self._headers(node_url),
+                **options,
+            )
+            response.raise_for_status()
+            body = self.codec.loads(response.content)
+        except httpx.HTTPError as exc:
+            elapsed = time.monotonic() - start
+            if cut and isinstance(exc, httpx.TimeoutException):
+                if self.metrics is not None:
+                    self._measure(
+                        node_url,
+                        payload,
+                        elapsed,
+                        content,
+                        response,
+                        "DeadlineExceeded",
+                    )
+                raise self._deadline_cut(node_url, exc) from exc
+            self._record_failure(node_url, elapsed)
+            if self.metrics is not None:
+                self._measure(
+                    node_url, payload, elapsed, content, response, type(exc).__name__
+                )
+            raise
+        except ValueError as exc:
+            elapsed = time.monotonic() - start
+            self._record_failure(node_url, elapsed)
+            if self.metrics is not None:
+                self._measure(
+                    node_url, payload, elapsed, content, response, "InvalidJSON"
+                )
+            raise NodeError(f"Invalid JSON response from {node_url}: {exc}") from exc
+        elapsed = time.monotonic() - start
+        self._record_success(node_url, elapsed)
+        if self.metrics is not None:
+            error = (
+                "NodeError" if isinstance(body, Mapping) and "error" in body else None
+            )
+            self._measure(node_url, payload, elapsed, content, response, error)
+        if isinstance(payload, Mapping):
+            self.method_latency.record(payload["method"], elapsed)
+        self._observe_heads(node_url, payload, body)
+        return body
 
     async def call(
-        self, api: str, method: str, params: Iterable | Mapping | None = None
+        self,
+        api: str,
+        method: str,
+        params: Iterable | Mapping | None = None,
+        timeout: Optional[float] = None,
     ):
-        """Asynchronously make an RPC call to a Hive node."""
+        """Asynchronously make an RPC call to a Hive node.
+
+        ``timeout`` caps the total seconds spent across all failover attempts
+        and hedges (see :func:`deadline`).
+        """
+        with deadline(timeout):
+            return await self._call_shared(api, method, _materialize(params))
+
+    def session(self) -> "AsyncSession":
+        """Return an :class:`AsyncSession` pinning calls to the best healthy node."""
+        return AsyncSession(self, self._healthy_nodes()[0])
+
+    async def _call_shared(
+        self, api: str, method: str, params: Iterable | Mapping | None
+    ):
+        """Serve a call from the cache or an identical in-flight call."""
+        key = self._request_key(api, method, params)
+        hit, result = self._cached(key)
+        if hit:
+            return result
+        if key is None or not self.coalesce:
+            return await self._fetch(key, api, method, params)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, api, method, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        # Shield the shared request so one cancelled waiter doesn't cancel it
+        # for everybody else.
+        remaining = _remaining()
+        if remaining is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(0.0, remaining))
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(
+                "Deadline exceeded waiting for a shared call."
+            ) from None
+
+    def _finish_inflight(self, key: RequestKey, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved; waiters re-raise it themselves.
+            task.exception()
 
-        for _ in range(len(self.nodes)):
-            node_url = self._get_next_node()
-            payload = self._build_payload(api, method, params)
+    async def _fetch(self, key: Optional[RequestKey], api: str, method: str, params):
+        return self._remember(key, params, await self._call(api, method, params))
+
+    async def _call(self, api: str, method: str, params: Iterable | Mapping | None):
+        params = _materialize(params)
+        if self._should_hedge(api, method):
+            return await self._call_hedged(api, method, params)
+
+        for node_url, delay in self._attempts(f"{api}.{method}"):
+            if delay:
+                await asyncio.sleep(delay)
+            payload = self._build_payload(api, method, params, self._next_request_id())
             try:
-                response = await self._client.post(node_url, json=payload)
+                return self._unwrap(await self._post(node_url, payload))
+            except httpx.HTTPError as exc:
+                log.error("Error calling %s: %s", node_url, exc)
+            except NodeError as exc:
+                log.error("Node error from %s: %s", node_url, exc)
+                if not self.retry.is_retriable(exc):
+                    raise
+
+        raise self._exhausted()
+
+    def _should_hedge(self, api: str, method: str) -> bool:
+        if not self.hedge or len(self.nodes) < 2 or is_broadcast(api, method):
+            return False
+        if _session.get() is not None:
+            return False
+        name = f"{api}.{method}"
+        if name in self.hedge_exclude:
+            return False
+        return self.hedge_methods is None or name in self.hedge_methods
+
+    def _hedge_after(self, name: str) -> float:
+        if self.method_latency.count(name) < HEDGE_MIN_SAMPLES:
+            return self.hedge_delay
+        return self.method_latency.percentile(name, self.hedge_percentile)
+
+    async def _attempt(
+        self, node_url: str, api: str, method: str, params, delay: float = 0.0
+    ) -> Any:
+        if delay:
+            await asyncio.sleep(delay)
+        payload = self._build_payload(api, method, params, self._next_request_id())
+        return self._unwrap(await self._post(node_url, payload))
+
+    async def _call_hedged(self, api: str, method: str, params) -> Any:
+        self.retry.record_call()
+        candidates = self._node_order()
+        pending: Dict[asyncio.Task, str] = {}
+        name = f"{api}.{method}"
+        attempts = 0
+
+        def launch(event: str = "failover") -> bool:
+            nonlocal attempts
+            step = self._next_attempt(candidates, attempts, name, event)
+            if step is None:
+                return False
+            attempts += 1
+            node_url, delay = step
+            if event == "hedge":
+                delay = 0.0
+            task = asyncio.ensure_future(
+                self._attempt(node_url, api, method, params, delay)
+            )
+            pending[task] = node_url
+            return True
+
+        launch()
+        hedge_after: Optional[float] = self._hedge_after(name)
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_after, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    log.debug("Hedging %s.%s after %.3fs.", api, method, hedge_after)
+                    hedge_after = None
+                    launch("hedge")
+                    continue
+                for task in done:
+                    node_url = pending.pop(task)
+                    exc = task.exception()
+                    if exc is None:
+                        return task.result()
+                    if not isinstance(exc, (httpx.HTTPError, NodeError)):
+                        raise exc
+                    log.error("Error calling %s: %s", node_url, exc)
+                    if not self.retry.is_retriable(exc):
+                        raise exc
+                if not pending:
+                    launch("failover")
+        finally:
+            for task, node_url in pending.items():
+                task.cancel()
+                # The abandoned request reports no outcome to the breaker.
+                self.breakers.get(node_url).release()
+
+        raise self._exhausted()
+
+    async def stream_call(
+        self,
+        api: str,
+        method: str,
+        params: Iterable | Mapping | None = None,
+        key: Optional[str] = None,
+    ) -> AsyncIterator[Any]:
+        """Asynchronously yield the items of an array result as they arrive.
+
+        See :meth:`Api.stream_call` for the parsing and failover semantics.
+        """
+        label = f"{api}.{method}"
+        params = _materialize(params)
+        yielded = 0
+        for node_url, delay in self._attempts(label):
+            if delay:
+                await asyncio.sleep(delay)
+            payload = self._build_payload(api, method, params, self._next_request_id())
+            index = 0
+            try:
+                async with aclosing(self._stream(node_url, payload, key)) as items:
+                    async for item in items:
+                        if index >= yielded:
+                            yielded += 1
+                            yield item
+                        index += 1
+                return
+            except (httpx.HTTPError, ValueError) as exc:
+                log.error("Error streaming from %s: %s", node_url, exc)
+            except NodeError as exc:
+                log.error("Node error from %s: %s", node_url, exc)
+                if not self.retry.is_retriable(exc):
+                    raise
+
+        raise self._exhausted()
+
+    async def _stream(
+        self, node_url: str, payload: dict, key: Optional[str]
+    ) -> AsyncIterator[Any]:
+        content = self.codec.dumps(payload)
+        client, url = self._route(node_url)
+        parser = ResultItemParser(key)
+        limit = self.limiter.async_slot(node_url) if self.limiter else nullcontext()
+        start = time.monotonic()
+        first_byte = None
+        received = 0
+        response: Optional[httpx.Response] = None
+        error: Optional[BaseException] = None
+        options, cut = self._request_options()
+        try:
+            async with (
+                limit,
+                client.stream(
+                    "POST",
+                    url,
+                    content=content,
+                    headers=self._headers(node_url),
+                    **options,
+                ) as response,
+            ):
+                first_byte = time.monotonic()
                 response.raise_for_status()
-                result = response.json()
-                if "error" in result:
-                    raise NodeError(result["error"]["message"])
-                return result.get("result")
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    for item in parser.feed(chunk):
+                        yield item
+                for item in parser.close():
+                    yield item
+        except (httpx.HTTPError, NodeError, ValueError) as exc:
+            if cut and isinstance(exc, httpx.TimeoutException):
+                error = self._deadline_cut(node_url, exc)
+                raise error from exc
+            error = exc
+            raise
+        finally:
+            self._record_stream(
+                node_url,
+                payload["method"],
+                start,
+                first_byte,
+                content,
+                received,
+                response.num_bytes_downloaded if response is not None else 0,
+                error,
+            )
+
+    async def call_batch(
+        self,
+        requests: Iterable[BatchRequest],
+        max_batch_size: Optional[int] = None,
+    ) -> List[Any]:
+        """Asynchronously send many calls as JSON-RPC batches.
+
+        See :meth:`Api.call_batch` for chunking and error semantics.
+        """
+
+        pending = [
+            (api, method, _materialize(params)) for api, method, params in requests
+        ]
+        results: List[Any] = []
+        while pending:
+            chunk_results = await self._send_batch_chunk(pending, max_batch_size)
+            results.extend(chunk_results)
+            pending = pending[len(chunk_results) :]
+        return results
+
+    async def _send_batch_chunk(
+        self, pending: Sequence[BatchRequest], max_batch_size: Optional[int]
+    ) -> List[Any]:
+        for node_url, delay in self._attempts():
+            if delay:
+                await asyncio.sleep(delay)
+            size = max_batch_size or self._batch_size_for(node_url)
+            payloads = self._build_batch(pending[:size])
+            try:
+                body = await self._post(node_url, payloads)
+                return self._parse_batch_response(payloads, body)
             except httpx.HTTPError as exc:
                 log.error("Error calling %s: %s", node_url, exc)
             except NodeError as exc:
                 log.error("Node error from %s: %s", node_url, exc)
 
-        raise NodeError("All nodes failed.")
+        raise self._exhausted()
+
+    async def probe_nodes(self) -> None:
+        """Measure every node concurrently with ``get_dynamic_global_properties``."""
+
+        async def _probe(node_url: str) -> None:
+            try:
+                self._unwrap(await self._post(node_url, self._probe_payload()))
+            except (httpx.HTTPError, NodeError) as exc:
+                log.debug("Probe of %s failed: %s", node_url, exc)
+
+        await asyncio.gather(*(_probe(node_url) for node_url in self.nodes))
+
+    async def _warm(self, node_url: str) -> bool:
+        try:
+            self._unwrap(await self._post(node_url, self._probe_payload()))
+        except (httpx.HTTPError, NodeError) as exc:
+            log.debug("Warm-up of %s failed: %s", node_url, exc)
+            return False
+        return True
+
+    async def warm_up(self, connections: int = 1) -> Dict[str, bool]:
+        """Open ``connections`` pooled connections to every node concurrently.
+
+        Each connection completes its TCP and TLS handshakes with a
+        ``get_dynamic_global_properties`` request, which also seeds latency
+        and head tracking.  With HTTP/2 one connection per node is enough.
+        Returns whether each node answered.
+        """
+        targets = self._warm_up_targets(connections)
+        results = await asyncio.gather(*(self._warm(node) for node in targets))
+        status = dict.fromkeys(self.nodes, False)
+        for node_url, ok in zip(targets, results):
+            status[node_url] = status[node_url] or ok
+        return status
+
+    def start_probing(self, interval: float = DEFAULT_PROBE_INTERVAL) -> None:
+        """Probe all nodes every ``interval`` seconds in a background task."""
+        if self._probe_task is not None and not self._probe_task.done():
+            return
+
+        async def _run() -> None:
+            while True:
+                await self.probe_nodes()
+                await asyncio.sleep(interval)
+
+        self._probe_task = asyncio.get_running_loop().create_task(_run())
+
+    def stop_probing(self) -> None:
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
 
     async def aclose(self) -> None:
+        self.stop_probing()
         await self._client.aclose()
+        for client in self._local_clients.values():
+            await client.aclose()
 
     async def __aenter__(self) -> "AsyncApi":
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         await self.aclose()
+
+
+class Session:
+    """A scope in which every call goes to the same node.
+
+    Returned by :meth:`Api.session`; use it in place of the client, directly
+    or as ``with api.session() as s``.  Calls are sent to :attr:`node`.  If
+    one fails there it fails over as usual, and the session moves to the node
+    that answered so later calls stay together.  Session calls bypass the
+    response cache and coalescing so every answer reflects the pinned node's
+    view of the chain.  Other attributes are read from the client.
+    """
+
+    def __init__(self, client: _BaseApi, node: str) -> None:
+        self.client = client
+        self.node = node
+
+    def call(
+        self,
+        api: str,
+        method: str,
+        params: Iterable | Mapping | None = None,
+        timeout: Optional[float] = None,
+    ):
+        """Make an RPC call on the session's node."""
+        token = _session.set(self)
+        try:
+            with deadline(timeout):
+                return self.client._call(api, method, params)
+        finally:
+            _session.reset(token)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+class AsyncSession(Session):
+    """:class:`Session` for :class:`AsyncApi`; calls are awaited."""
+
+    async def call(
+        self,
+        api: str,
+        method: str,
+        params: Iterable | Mapping | None = None,
+        timeout: Optional[float] = None,
+    ):
+        """Asynchronously make an RPC call on the session's node."""
+        token = _session.set(self)
+        try:
+            with deadline(timeout):
+                return await self.client._call(api, method, params)
+        finally:
+            _session.reset(token)
+
+    async def __aenter__(self) -> "AsyncSession":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
@@ -19,6 +19,8 @@ class Block:
         self.block_num = block_num
         self.api = api
         self._data = data or {}
+        #: Seconds from production to delivery, set by block listeners.
+        self.delivery_delay = None
 
     def refresh(self):
         """Fetch the block data from the blockchain."""
@@ -0,0 +1,220 @@
+"""Method-aware response cache for :class:`~nectarlite.api.Api` clients."""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+#: Default memory budget for cached responses (approximate encoded bytes).
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+#: Hive produces one block every three seconds.
+BLOCK_INTERVAL = 3.0
+
+RequestKey = Tuple[str, str, str]
+
+#: Methods whose result only depends on the chain state at one block; cached
+#: without expiry once that block is irreversible.
+IRREVERSIBLE_METHODS = frozenset(
+    {
+        "condenser_api.get_block",
+        "condenser_api.get_block_header",
+        "condenser_api.get_ops_in_block",
+        "condenser_api.get_transaction",
+        "block_api.get_block",
+        "block_api.get_block_header",
+        "block_api.get_block_range",
+        "account_history_api.get_ops_in_block",
+        "account_history_api.get_transaction",
+    }
+)
+
+#: Methods returning the dynamic global properties; cached for one block.
+GLOBAL_PROPERTIES_METHODS = frozenset(
+    {
+        "condenser_api.get_dynamic_global_properties",
+        "database_api.get_dynamic_global_properties",
+    }
+)
+
+#: Account and content lookups; cached for the configurable ``ttl``.
+ACCOUNT_CONTENT_METHODS = frozenset(
+    {
+        "condenser_api.get_accounts",
+        "condenser_api.get_content",
+        "condenser_api.get_active_votes",
+        "database_api.find_accounts",
+        "database_api.find_comments",
+        "bridge.get_post",
+        "bridge.get_profile",
+        "rc_api.find_rc_accounts",
+    }
+)
+
+
+def request_key(
+    api: str, method: str, params: Iterable | Mapping | None
+) -> Optional[RequestKey]:
+    """Return a hashable key for a call, or ``None`` if params don't encode."""
+    if params is not None and not isinstance(params, Mapping):
+        params = list(params)
+    try:
+        encoded = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return (api, method, encoded)
+
+
+def _block_span(method: str, params: Any) -> Optional[int]:
+    """Return the highest block number a block-scoped call refers to."""
+    if isinstance(params, Mapping):
+        if "starting_block_num" in params:
+            return int(params["starting_block_num"]) + int(params.get("count", 1)) - 1
+        if "block_num" in params:
+            return int(params["block_num"])
+        return None
+    if isinstance(params, list) and params and isinstance(params[0], int):
+        return params[0]
+    return None
+
+
+class ResponseCache:
+    """LRU cache of JSON-RPC results with per-method expiry policies.
+
+    * Blocks, block headers, ops-in-block and transactions are kept with no
+      expiry once their block is at or below the last irreversible block seen
+      in a dynamic global properties response; reversible ones are not cached.
+    * Dynamic global properties are kept for ``block_interval`` seconds.
+    * Accounts and content are kept for ``ttl`` seconds.
+    * ``ttls`` maps additional ``"api.method"`` names to a lifetime in seconds
+      (``None`` for no expiry) and overrides the defaults above.
+    * Broadcast methods and everything else are never cached.
+
+    The cache is bounded by ``max_bytes`` of JSON-encoded results and evicts
+    least recently used entries first.  Results are shared between callers and
+    must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = 30.0,
+        block_interval: float = BLOCK_INTERVAL,
+        ttls: Optional[Mapping[str, Optional[float]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.block_interval = block_interval
+        self.ttls = dict(ttls or {})
+        self.last_irreversible_block: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries: "OrderedDict[RequestKey, Tuple[Any, Optional[float], int]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _lifetime(self, name: str, method: str, params: Any, result: Any):
+        """Return ``(cacheable, ttl)`` for a result of ``name``."""
+        if name in self.ttls:
+            return True, self.ttls[name]
+        if name in GLOBAL_PROPERTIES_METHODS:
+            return True, self.block_interval
+        if name in ACCOUNT_CONTENT_METHODS:
+            return True, self.ttl
+        if name in IRREVERSIBLE_METHODS:
+            lib = self.last_irreversible_block
+            if lib is None:
+                return False, None
+            if isinstance(result, Mapping) and "block_num" in result:
+                block_num = result["block_num"]
+            else:
+                block_num = _block_span(method, params)
+            if block_num is None or block_num > lib:
+                return False, None
+            return True, None
+        return False, None
+
+    def get(self, key: RequestKey) -> Tuple[bool, Any]:
+        """Return ``(hit, result)`` for ``key``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires, _ = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, result
+                self._drop(key)
+            self.misses += 1
+            return False, None
+
+    def put(self, key: RequestKey, params: Any, result: Any) -> None:
+        """Store ``result`` for ``key`` if the method's policy allows it."""
+        api, method, _ = key
+        name = f"{api}.{method}"
+        if name in GLOBAL_PROPERTIES_METHODS and isinstance(result, Mapping):
+            self.observe_irreversible(result.get("last_irreversible_block_num"))
+        if result is None:
+            return
+        cacheable, ttl = self._lifetime(name, method, params, result)
+        if not cacheable:
+            return
+        try:
+            size = len(json.dumps(result, separators=(",", ":")))
+        except (TypeError, ValueError):
+            return
+        if size > self.max_bytes:
+            return
+        expires = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (result, expires, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def observe_irreversible(self, block_num: Optional[int]) -> None:
+        """Advance the known last irreversible block number."""
+        if block_num is None:
+            return
+        with self._lock:
+            if (
+                self.last_irreversible_block is None
+                or block_num > self.last_irreversible_block
+            ):
+                self.last_irreversible_block = block_num
+
+    def _drop(self, key: RequestKey) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counters plus the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+__all__ = ["ResponseCache", "request_key"]
@@ -0,0 +1,286 @@
+"""Record and replay HTTP exchanges for offline, reproducible runs.
+
+A cassette is a gzip-compressed file with one JSON object per exchange.  Pass
+a :class:`RecordingTransport` to :class:`~nectarlite.api.Api`,
+:class:`~nectarlite.api.AsyncApi` or :class:`~nectarlite.haf.HAF` to capture
+live traffic, then a :class:`ReplayTransport` to serve it back without the
+network::
+
+    with RecordingTransport("session.jsonl.gz") as transport:
+        api = Api(nodes, transport=transport)
+        ...
+
+    api = Api(nodes, transport=ReplayTransport("session.jsonl.gz", speed=1.0))
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from .exceptions import CassetteError
+
+log = logging.getLogger(__name__)
+
+#: Exchanges buffered in memory before they are appended to the cassette.
+FLUSH_EVERY = 500
+
+
+def _strip_ids(document: Any) -> Any:
+    if isinstance(document, dict):
+        return {key: value for key, value in document.items() if key != "id"}
+    if isinstance(document, list):
+        return [_strip_ids(item) for item in document]
+    return document
+
+
+def _match_key(method: str, url: str, body: str) -> Tuple[str, str, str]:
+    """Key identifying a request regardless of its JSON-RPC ids."""
+    try:
+        document = json.loads(body)
+    except ValueError:
+        return method, url, body
+    return method, url, json.dumps(_strip_ids(document), sort_keys=True)
+
+
+def _ids(document: Any) -> List[Any]:
+    if isinstance(document, dict):
+        return [document.get("id")]
+    if isinstance(document, list):
+        return [item.get("id") for item in document if isinstance(item, dict)]
+    return []
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Forward requests to a real transport and record every exchange.
+
+    Exchanges are appended to ``path`` in batches and whenever the transport
+    is closed, so one transport may be shared by several clients.  An
+    existing cassette is replaced unless ``append`` is true.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+        append: bool = False,
+    ) -> None:
+        self.path = os.fspath(path)
+        self._transport = transport
+        self._async_transport = async_transport
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self.recorded = 0
+        if not append and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._buffer.append(json.dumps(entry, separators=(",", ":")))
+            self.recorded += 1
+            if len(self._buffer) >= FLUSH_EVERY:
+                self._flush_locked()
+
+    def _record_error(
+        self, request: httpx.Request, exc: httpx.TransportError, elapsed: float
+    ) -> None:
+        self._write(
+            {
+                "method": request.method,
+                "url": str(request.url),
+                "request": request.content.decode("utf-8", "replace"),
+                "error": type(exc).__name__,
+                "message": str(exc),
+                "elapsed": round(elapsed, 6),
+            }
+        )
+
+    def _record(
+        self, request: httpx.Request, response: httpx.Response, elapsed: float
+    ) -> httpx.Response:
+        entry = {
+            "method": request.method,
+            "url": str(request.url),
+            "request": request.content.decode("utf-8", "replace"),
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type"),
+            "response": response.content.decode("utf-8", "replace"),
+            "elapsed": round(elapsed, 6),
+        }
+        self._write(entry)
+        # The body was decoded while reading; hand back a plain copy.
+        return httpx.Response(
+            response.status_code,
+            headers={"content-type": entry["content_type"] or "application/json"},
+            content=response.content,
+            request=request,
+        )
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        # Each flush appends one gzip member; readers see a single stream.
+        with gzip.open(self.path, "at", encoding="utf-8") as fh:
+            fh.write("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+
+    def flush(self) -> None:
+        """Write buffered exchanges to the cassette."""
+        with self._lock:
+            self._flush_locked()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+        request.read()
+        start = time.monotonic()
+        try:
+            response = self._transport.handle_request(request)
+            try:
+                response.read()
+            finally:
+                response.close()
+        except httpx.TransportError as exc:
+            self._record_error(request, exc, time.monotonic() - start)
+            raise
+        return self._record(request, response, time.monotonic() - start)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._async_transport is None:
+            self._async_transport = httpx.AsyncHTTPTransport()
+        await request.aread()
+        start = time.monotonic()
+        try:
+            response = await self._async_transport.handle_async_request(request)
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+        except httpx.TransportError as exc:
+            self._record_error(request, exc, time.monotonic() - start)
+            raise
+        return self._record(request, response, time.monotonic() - start)
+
+    def close(self) -> None:
+        self.flush()
+        if self._transport is not None:
+            self._transport.close()
+
+    async def aclose(self) -> None:
+        self.flush()
+        if self._async_transport is not None:
+            await self._async_transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Serve the exchanges of a cassette instead of contacting nodes.
+
+    Requests are matched by method, URL and body, ignoring JSON-RPC ids;
+    responses get the ids of the new request and recorded transport errors
+    are raised again.  Identical requests are answered in recorded order and
+    the last answer is repeated once they run out.  Unknown requests raise
+    :class:`~nectarlite.exceptions.CassetteError`.
+
+    With ``speed=None`` answers are immediate; otherwise each one is delayed
+    by its recorded latency divided by ``speed`` (``1.0`` = original timing).
+    """
+
+    def __init__(self, path: str | os.PathLike, speed: Optional[float] = None) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self.path = os.fspath(path)
+        self.speed = speed
+        self._exchanges: Dict[Tuple[str, str, str], Deque[Dict[str, Any]]] = {}
+        self._last: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = _match_key(entry["method"], entry["url"], entry["request"])
+                self._exchanges.setdefault(key, deque()).append(entry)
+        log.debug("Loaded %d request shapes from %s.", len(self._exchanges), self.path)
+
+    def _next(self, request: httpx.Request) -> Tuple[Dict[str, Any], str]:
+        body = request.content.decode("utf-8", "replace")
+        key = _match_key(request.method, str(request.url), body)
+        with self._lock:
+            queue = self._exchanges.get(key)
+            if queue:
+                entry = self._last[key] = queue.popleft()
+            elif key in self._last:
+                entry = self._last[key]
+            else:
+                raise CassetteError(
+                    f"No recorded response for {request.method} {request.url}: "
+                    f"{body[:200]}"
+                )
+        return entry, body
+
+    @staticmethod
+    def _with_ids(entry: Dict[str, Any], body: str) -> str:
+        """Rewrite response ids from the recorded request to ``body``'s."""
+        try:
+            recorded_ids = _ids(json.loads(entry["request"]))
+            new_ids = _ids(json.loads(body))
+            document = json.loads(entry["response"])
+        except ValueError:
+            return entry["response"]
+        if recorded_ids == new_ids:
+            return entry["response"]
+        mapping = dict(zip(recorded_ids, new_ids))
+        items = document if isinstance(document, list) else [document]
+        for item in items:
+            if isinstance(item, dict) and item.get("id") in mapping:
+                item["id"] = mapping[item["id"]]
+        return json.dumps(document, separators=(",", ":"))
+
+    def _response(
+        self, request: httpx.Request, entry: Dict[str, Any], body: str
+    ) -> httpx.Response:
+        if "error" in entry:
+            error = getattr(httpx, entry["error"], None)
+            if not (
+                isinstance(error, type) and issubclass(error, httpx.TransportError)
+            ):
+                error = httpx.TransportError
+            raise error(entry.get("message", ""), request=request)
+        return httpx.Response(
+            entry["status"],
+            headers={"content-type": entry["content_type"] or "application/json"},
+            content=self._with_ids(entry, body).encode("utf-8"),
+            request=request,
+        )
+
+    def _delay(self, entry: Dict[str, Any]) -> float:
+        if self.speed is None:
+            return 0.0
+        return entry.get("elapsed", 0.0) / self.speed
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        entry, body = self._next(request)
+        delay = self._delay(entry)
+        if delay:
+            time.sleep(delay)
+        return self._response(request, entry, body)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        entry, body = self._next(request)
+        delay = self._delay(entry)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._response(request, entry, body)
+
+
+__all__ = ["RecordingTransport", "ReplayTransport"]
@@ -0,0 +1,144 @@
+"""Persist how far a :class:`~nectarlite.stream.Stream` has processed the chain.
+
+A stream given a checkpoint resumes after the last block it saved, and saves
+each block once its consumer has finished with it.  Saves are batched, so a
+crash replays at most the blocks since the last flush: processing is
+at-least-once and handlers should tolerate seeing a block twice::
+
+    stream = Stream(api, checkpoint="bot.checkpoint")
+    for op in stream.on("vote"):
+        ...
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+log = logging.getLogger(__name__)
+
+#: Blocks consumed between checkpoint writes.
+DEFAULT_FLUSH_EVERY = 100
+
+#: Longest time (seconds) a consumed block waits before it is written.
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+
+class CheckpointStore:
+    """In-memory checkpoint; the base class of all checkpoint stores.
+
+    Subclasses persist :attr:`block_num` in :meth:`flush` and read it back in
+    :meth:`load`.  :meth:`save` is called for every consumed block and
+    decides when to flush.
+    """
+
+    def __init__(self) -> None:
+        self.block_num: Optional[int] = None
+
+    def load(self) -> Optional[int]:
+        """Return the last saved block number, or ``None`` if there is none."""
+        return self.block_num
+
+    def save(self, block_num: int) -> None:
+        """Record that ``block_num`` and every block before it are processed."""
+        self.block_num = block_num
+
+    def flush(self) -> None:
+        """Persist the last saved block number."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Checkpoint kept in a small JSON file.
+
+    The file is rewritten after ``flush_every`` saved blocks or once
+    ``flush_interval`` seconds have passed since the last write, whichever
+    comes first, and on :meth:`flush`/:meth:`close`.  Writes go to a
+    temporary file that replaces ``path`` atomically, so a crash leaves
+    either the old or the new checkpoint, never a torn one.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self.path = os.fspath(path)
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._flushed_at = clock()
+        self.block_num = self._read()
+
+    def _read(self) -> Optional[int]:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                return int(json.load(fh)["block_num"])
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError) as exc:
+            log.warning("Ignoring unreadable checkpoint %s: %s", self.path, exc)
+            return None
+
+    def save(self, block_num: int) -> None:
+        with self._lock:
+            self.block_num = block_num
+            self._pending += 1
+            due = self._pending >= self.flush_every or (
+                self.flush_interval is not None
+                and self._clock() - self._flushed_at >= self.flush_interval
+            )
+            if due:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._flushed_at = self._clock()
+        if not self._pending or self.block_num is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=".checkpoint-", suffix=".tmp", dir=directory
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"block_num": self.block_num}, fh)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._pending = 0
+        log.debug("Checkpoint %s saved at block %s.", self.path, self.block_num)
+
+
+def open_checkpoint(
+    checkpoint: "str | os.PathLike | CheckpointStore | None",
+) -> Optional[CheckpointStore]:
+    """Return ``checkpoint`` as a store; paths become :class:`FileCheckpointStore`."""
+    if checkpoint is None or isinstance(checkpoint, CheckpointStore):
+        return checkpoint
+    return FileCheckpointStore(checkpoint)
+
+
+__all__ = [
+    "CheckpointStore",
+    "FileCheckpointStore",
+    "open_checkpoint",
+    "DEFAULT_FLUSH_EVERY",
+    "DEFAULT_FLUSH_INTERVAL",
+]
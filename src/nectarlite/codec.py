@@ -0,0 +1,118 @@
+"""JSON codecs used to encode requests and decode node responses.
+
+``orjson`` or ``msgspec`` are used when installed; both decode straight from
+the response bytes and are several times faster than the standard library on
+large block and account-history payloads.  ``pip install nectarlite[fast-json]``
+installs ``orjson``.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:  # pragma: no cover - optional dependency
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+log = logging.getLogger(__name__)
+
+
+class JsonCodec:
+    """Standard library codec; the base class of all codecs.
+
+    ``dumps`` returns bytes and ``loads`` accepts bytes or str.  Invalid
+    documents raise :class:`ValueError` whatever the backend.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec backed by ``orjson``.
+
+    ``orjson`` rejects integers outside the 64-bit range; such documents fall
+    back to the standard library.
+    """
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """Codec backed by ``msgspec.json``."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except (TypeError, msgspec.EncodeError):
+            return super().dumps(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError:
+            return super().loads(data)
+
+
+def available_codecs() -> Dict[str, type]:
+    """Return the installed codecs, fastest first."""
+    codecs: Dict[str, type] = {}
+    if orjson is not None:
+        codecs[OrjsonCodec.name] = OrjsonCodec
+    if msgspec is not None:
+        codecs[MsgspecCodec.name] = MsgspecCodec
+    codecs[JsonCodec.name] = JsonCodec
+    return codecs
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """Return the codec called ``name``, or the fastest installed one."""
+    codecs = available_codecs()
+    if name is None:
+        name = next(iter(codecs))
+    try:
+        codec = codecs[name]()
+    except KeyError:
+        raise ValueError(
+            f"JSON codec '{name}' is not available; installed: {', '.join(codecs)}"
+        ) from None
+    log.debug("Using %s JSON codec.", codec.name)
+    return codec
+
+
+__all__ = [
+    "JsonCodec",
+    "OrjsonCodec",
+    "MsgspecCodec",
+    "available_codecs",
+    "get_codec",
+]
@@ -8,11 +8,29 @@ class NectarliteException(Exception):
 
 
 class NodeError(NectarliteException):
-    """Raised when a Hive node returns an error."""
+    """Raised when a Hive node returns an error.
 
-    def __init__(self, message):
+    ``code`` and ``data`` carry the JSON-RPC error code and data object when
+    the error came from the node itself.
+    """
+
+    def __init__(self, message, code=None, data=None):
         super().__init__(message)
         self.message = message
+        self.code = code
+        self.data = data
+
+
+class DeadlineExceeded(NodeError):
+    """Raised when a call runs out of its time budget across all attempts."""
+
+    pass
+
+
+class CassetteError(NectarliteException):
+    """Raised when a replayed request has no recorded response."""
+
+    pass
 
 
 class MissingKeyError(NectarliteException):
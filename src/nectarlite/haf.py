@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
-import json
 import logging
 from typing import Any, Dict, Optional
 
 import httpx
 
+from .codec import JsonCodec, get_codec
+
 log = logging.getLogger(__name__)
 
 
@@ -13,16 +14,31 @@ class HAF(object):
 
     DEFAULT_APIS = ["https://api.hive.blog", "https://api.syncad.com"]
 
-    def __init__(self, api: Optional[str] = None, timeout: Optional[float] = None):
+    def __init__(
+        self,
+        api: Optional[str] = None,
+        timeout: Optional[float] = None,
+        codec: Optional[JsonCodec] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        compression: bool = True,
+    ):
         """
         Initialize the HAF client.
 
         Parameters:
             api (str, optional): Base API URL. If None, uses the first available default API.
             timeout (float, optional): Timeout for requests in seconds.
+            codec (JsonCodec, optional): JSON codec; defaults to the fastest installed.
+            transport (httpx.BaseTransport, optional): Transport replacing the network,
+                e.g. a cassette ``ReplayTransport``.
+            compression (bool, optional): Request gzip/brotli/zstd compressed
+                responses (default). ``False`` asks for uncompressed bodies.
         """
         self.api = api or self.DEFAULT_APIS[0]
         self._timeout = float(timeout) if timeout else 30.0
+        self._codec = codec or get_codec()
+        self._transport = transport
+        self._compression = compression
 
         if not self.api.startswith(("http://", "https://")):
             raise ValueError(
@@ -45,7 +61,13 @@ class HAF(object):
         timeout = kwargs.pop("timeout", self._timeout)
 
         try:
-            with httpx.Client(timeout=timeout) as client:
+            client_options: Dict[str, Any] = {"timeout": timeout}
+            if not self._compression:
+                # Compressed responses are the httpx default.
+                client_options["headers"] = {"Accept-Encoding": "identity"}
+            if self._transport is not None:
+                client_options["transport"] = self._transport
+            with httpx.Client(**client_options) as client:
                 response = client.request(
                     method,
                     url,
@@ -53,12 +75,12 @@ class HAF(object):
                     **kwargs,
                 )
                 response.raise_for_status()
-                return response.json()
+                return self._codec.loads(response.content)
 
         except httpx.HTTPError as e:
             log.error(f"Request failed for {url}: {e}")
             raise
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             log.error(f"Invalid JSON response from {url}: {e}")
             raise ValueError(f"Invalid JSON response from API: {e}")
 
@@ -1,7 +1,8 @@
 """Convenience helpers for common read-only Hive RPC calls."""
 
 import logging
-from typing import Any, Dict, Iterable, List, Optional
+import weakref
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from .api import Api
 from .exceptions import NodeError
@@ -217,6 +218,128 @@ def get_block(api: Api, block_num: int) -> Optional[Dict[str, Any]]:
     return None
 
 
+#: Largest ``count`` a node accepts for ``block_api.get_block_range``.
+MAX_BLOCK_RANGE = 1000
+
+#: JSON-RPC error code for a method or API the node does not serve.
+METHOD_NOT_FOUND = -32601
+
+# Clients whose nodes answered that they have no block_api.get_block_range.
+_NO_BLOCK_RANGE: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+_NAI_SYMBOLS = {
+    "@@000000021": "HIVE",
+    "@@000000013": "HBD",
+    "@@000000037": "VESTS",
+}
+
+
+def _legacy_value(value: Any) -> Any:
+    """Rewrite appbase NAI amounts inside ``value`` as legacy asset strings."""
+    if isinstance(value, list):
+        return [_legacy_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if value.keys() == {"amount", "precision", "nai"} and value["nai"] in _NAI_SYMBOLS:
+        precision = int(value["precision"])
+        amount = int(value["amount"])
+        sign = "-" if amount < 0 else ""
+        units, fraction = divmod(abs(amount), 10**precision)
+        number = f"{units}.{fraction:0{precision}d}" if precision else str(units)
+        return f"{sign}{number} {_NAI_SYMBOLS[value['nai']]}"
+    return {key: _legacy_value(item) for key, item in value.items()}
+
+
+def normalize_block(block: Dict[str, Any], block_num: int) -> Dict[str, Any]:
+    """Convert a ``block_api`` block to the ``condenser_api.get_block`` shape.
+
+    Operations become ``[name, value]`` pairs, NAI amounts become asset
+    strings and each transaction gets its id, block number and position.
+    """
+
+    transaction_ids = block.get("transaction_ids") or []
+    transactions = []
+    for index, trx in enumerate(block.get("transactions") or []):
+        operations = []
+        for op in trx.get("operations", []):
+            if isinstance(op, dict):
+                name = op["type"]
+                if name.endswith("_operation"):
+                    name = name[: -len("_operation")]
+                op = [name, _legacy_value(op["value"])]
+            operations.append(op)
+        trx = dict(trx, operations=operations)
+        if index < len(transaction_ids):
+            trx.setdefault("transaction_id", transaction_ids[index])
+        trx.setdefault("block_num", block_num)
+        trx.setdefault("transaction_num", index)
+        transactions.append(trx)
+    return dict(block, transactions=transactions)
+
+
+def is_method_not_found(exc: BaseException) -> bool:
+    """Return ``True`` if ``exc`` says the node does not serve the method."""
+    if not isinstance(exc, NodeError):
+        return False
+    return exc.code == METHOD_NOT_FOUND or "Could not find" in str(exc.message or "")
+
+
+def get_blocks(api: Api, start: int, count: int) -> List[Dict[str, Any]]:
+    """Return up to ``count`` blocks from ``start`` in ``condenser_api`` format.
+
+    Blocks are fetched with ``block_api.get_block_range`` in chunks of
+    :data:`MAX_BLOCK_RANGE`.  Once a client's node reports that it has no
+    range API, that client is asked for one block at a time instead.  The
+    list stops early at the node's head block.
+    """
+
+    log.debug("Fetching %s blocks from %s.", count, start)
+    blocks: List[Dict[str, Any]] = []
+    block_num = start
+    stop = start + count
+    while block_num < stop and api not in _NO_BLOCK_RANGE:
+        chunk = min(MAX_BLOCK_RANGE, stop - block_num)
+        try:
+            response = api.call(
+                "block_api",
+                "get_block_range",
+                {"starting_block_num": block_num, "count": chunk},
+            )
+        except Exception as exc:  # noqa: BLE001 - surface as NodeError
+            if not is_method_not_found(exc):
+                if isinstance(exc, NodeError):
+                    raise
+                raise NodeError(str(exc)) from exc
+            log.info("%s; fetching blocks one by one from now on.", exc)
+            _NO_BLOCK_RANGE.add(api)
+            break
+        if not isinstance(response, dict) or "blocks" not in response:
+            break
+        for block in response["blocks"]:
+            blocks.append(normalize_block(block, block_num))
+            block_num += 1
+        if len(response["blocks"]) < chunk:
+            return blocks
+    blocks.extend(_get_blocks_one_by_one(api, block_num, stop))
+    return blocks
+
+
+def _get_blocks_one_by_one(api: Api, start: int, stop: int) -> List[Dict[str, Any]]:
+    blocks = []
+    for block_num in range(start, stop):
+        try:
+            block = api.call("condenser_api", "get_block", [block_num])
+        except Exception as exc:  # noqa: BLE001 - surface as NodeError
+            if isinstance(exc, NodeError):
+                raise
+            log.error("Failed to fetch block %s: %s", block_num, exc)
+            raise NodeError(str(exc)) from exc
+        if not block:
+            break
+        blocks.append(block)
+    return blocks
+
+
 def get_ops_in_block(
     api: Api,
     block_num: int,
@@ -273,6 +396,57 @@ def get_account_history(
     return []
 
 
+def iter_account_history(
+    api: Api,
+    account: str,
+    start: int = -1,
+    limit: int = 1000,
+) -> Iterator[Any]:
+    """Yield ``[index, op]`` history entries as the response is parsed.
+
+    Streaming variant of :func:`get_account_history` for large ``limit``
+    values: entries are yielded one at a time without decoding the whole
+    response first.
+    """
+
+    log.debug(
+        "Streaming account history for '%s' starting at %s (limit=%s).",
+        account,
+        start,
+        limit,
+    )
+    try:
+        yield from api.stream_call(
+            "condenser_api", "get_account_history", [account, start, limit]
+        )
+    except Exception as exc:  # noqa: BLE001 - surface as NodeError
+        if isinstance(exc, NodeError):
+            raise
+        log.error("Failed to stream account history for '%s': %s", account, exc)
+        raise NodeError(str(exc)) from exc
+
+
+def iter_block_range(api: Api, start: int, count: int) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` blocks from ``start`` via ``block_api.get_block_range``.
+
+    Blocks are yielded as soon as each one is parsed from the response.
+    """
+
+    log.debug("Streaming %s blocks from %s.", count, start)
+    try:
+        yield from api.stream_call(
+            "block_api",
+            "get_block_range",
+            {"starting_block_num": start, "count": count},
+            key="blocks",
+        )
+    except Exception as exc:  # noqa: BLE001 - surface as NodeError
+        if isinstance(exc, NodeError):
+            raise
+        log.error("Failed to stream blocks from %s: %s", start, exc)
+        raise NodeError(str(exc)) from exc
+
+
 def get_rc_accounts(api: Api, accounts: Iterable[str]) -> List[Dict[str, Any]]:
     """Return RC metrics for the provided ``accounts`` using ``rc_api.find_rc_accounts``."""
 
@@ -350,8 +524,13 @@ __all__ = [
     "RewardFunds",
     "MedianHistoryPrice",
     "get_block",
+    "get_blocks",
+    "is_method_not_found",
+    "normalize_block",
     "get_ops_in_block",
     "get_account_history",
+    "iter_account_history",
+    "iter_block_range",
     "get_rc_accounts",
     "get_market_ticker",
     "get_market_volume",
@@ -0,0 +1,160 @@
+"""Incremental parsing of JSON-RPC responses whose result is a large array.
+
+:class:`ResultItemParser` is fed the response body chunk by chunk and returns
+the items of the result array as soon as each one is complete, so callers see
+the first item before the body has finished downloading and never hold the
+whole decoded document in memory.
+"""
+
+import codecs
+import json
+from typing import Any, Generator, Iterable, Iterator, List, Optional
+
+from .exceptions import NodeError
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+#: Largest amount of unparsed text buffered while waiting for a value to end.
+MAX_PENDING_CHARS = 64 * 1024 * 1024
+
+# Yielded by the parser when it needs another chunk.
+_MORE = object()
+
+
+class ResultItemParser:
+    """Push parser yielding the items of ``result`` or ``result[key]``.
+
+    Call :meth:`feed` with each chunk of the body and :meth:`close` at the end;
+    both return the items completed so far.  A JSON-RPC ``error`` member
+    raises :class:`~nectarlite.exceptions.NodeError`; a malformed body, or a
+    target that is not an array, raises :class:`ValueError`.
+    """
+
+    def __init__(self, key: Optional[str] = None) -> None:
+        self.key = key
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+        self._done = False
+        self._parser = self._parse()
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Add a chunk of the body and return the items it completed."""
+        if data:
+            # Drop consumed text so the window only holds unparsed data.
+            self._text = self._text[self._pos :] + self._decoder.decode(data)
+            self._pos = 0
+            if len(self._text) > MAX_PENDING_CHARS:
+                raise ValueError("JSON value exceeds MAX_PENDING_CHARS")
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        """Mark the end of the body and return the remaining items."""
+        self._text = self._text[self._pos :] + self._decoder.decode(b"", final=True)
+        self._pos = 0
+        self._eof = True
+        items = self._drain()
+        if not self._done:
+            raise ValueError("Unexpected end of JSON document")
+        return items
+
+    def _drain(self) -> List[Any]:
+        items: List[Any] = []
+        while not self._done:
+            try:
+                item = next(self._parser)
+            except StopIteration:
+                self._done = True
+                break
+            if item is _MORE:
+                break
+            items.append(item)
+        return items
+
+    def _peek(self) -> Generator[Any, None, str]:
+        while True:
+            while self._pos < len(self._text) and self._text[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._text):
+                return self._text[self._pos]
+            if self._eof:
+                raise ValueError("Unexpected end of JSON document")
+            yield _MORE
+
+    def _expect(self, char: str) -> Generator[Any, None, None]:
+        found = yield from self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def _value(self) -> Generator[Any, None, Any]:
+        yield from self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                yield _MORE
+                continue
+            # A number at the end of the window may continue in the next chunk.
+            if end == len(self._text) and not self._eof:
+                yield _MORE
+                continue
+            self._pos = end
+            return value
+
+    def _parse(self) -> Generator[Any, None, None]:
+        path = ["result"] if self.key is None else ["result", self.key]
+        depth = 0
+        yield from self._expect("{")
+        while True:
+            if (yield from self._peek()) == "}":
+                raise ValueError(f"Response has no {'.'.join(path)} array")
+            name = yield from self._value()
+            yield from self._expect(":")
+            if name == path[depth]:
+                if depth + 1 < len(path):
+                    yield from self._expect("{")
+                    depth += 1
+                    continue
+                if (yield from self._peek()) != "[":
+                    raise ValueError(f"Response {'.'.join(path)} is not an array")
+                self._pos += 1
+                break
+            value = yield from self._value()
+            if depth == 0 and name == "error":
+                error = value if isinstance(value, dict) else {"message": str(value)}
+                raise NodeError(
+                    error.get("message", str(error)),
+                    error.get("code"),
+                    error.get("data"),
+                )
+            if (yield from self._peek()) == ",":
+                self._pos += 1
+
+        if (yield from self._peek()) == "]":
+            return
+        while True:
+            yield (yield from self._value())
+            separator = yield from self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in array, found {separator!r}")
+
+
+def iter_result_items(
+    chunks: Iterable[bytes], key: Optional[str] = None
+) -> Iterator[Any]:
+    """Yield the items of ``result`` (or ``result[key]``) from body ``chunks``."""
+    parser = ResultItemParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+__all__ = ["ResultItemParser", "iter_result_items"]
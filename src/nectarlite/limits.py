@@ -0,0 +1,266 @@
+"""Concurrency and request-rate limits for :class:`~nectarlite.api.Api` clients."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Iterator, Optional, Set
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket handing out reservations in arrival order.
+
+    Each :meth:`reserve` takes one token and returns how long the caller has to
+    wait before using it.  The balance may go negative, which queues callers
+    fairly: whoever reserved first is allowed through first.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return the number of seconds to wait for it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class _FairSemaphore:
+    """Thread semaphore that grants slots strictly first-come, first-served."""
+
+    def __init__(self, value: int) -> None:
+        self._value = value
+        self._waiters: Deque[threading.Event] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        # release() hands its slot directly to the oldest waiter.
+        event.wait()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._value += 1
+
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _AsyncFairSemaphore:
+    """Asyncio counterpart of :class:`_FairSemaphore`, usable from any loop.
+
+    Each waiter is a future of its own running loop, so the semaphore is not
+    bound to the loop it was first used on and one limiter can serve several
+    ``asyncio.run()`` calls or loops in different threads.
+    """
+
+    def __init__(self, value: int) -> None:
+        self._value = value
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._granted: Set["asyncio.Future[None]"] = set()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            with self._lock:
+                granted = waiter in self._granted
+                self._granted.discard(waiter)
+                if not granted:
+                    self._waiters.remove(waiter)
+            # Cancelled after release() picked us: pass the slot on.
+            if granted:
+                self.release()
+            raise
+        with self._lock:
+            self._granted.discard(waiter)
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+                except RuntimeError:  # the waiter's loop is closed
+                    continue
+                self._granted.add(waiter)
+                return
+            self._value += 1
+
+
+class _Gate:
+    """Concurrency and rate limits for one scope (a node, or all nodes)."""
+
+    def __init__(
+        self, concurrency: Optional[int], rate: Optional[float], burst: Optional[float]
+    ) -> None:
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.semaphore = _FairSemaphore(concurrency) if concurrency else None
+        self.async_semaphore = _AsyncFairSemaphore(concurrency) if concurrency else None
+        self.in_flight = 0
+        self.waiting = 0
+
+
+class RequestLimiter:
+    """Cap concurrent requests and requests per second, globally and per node.
+
+    ``max_concurrency`` and ``rate`` apply across all nodes;
+    ``per_node_concurrency`` and ``per_node_rate`` apply to each node URL
+    separately.  ``None`` disables a limit.  Waiting callers are served in
+    arrival order; :meth:`stats` reports how many are queued.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_node_concurrency: Optional[int] = None,
+        rate: Optional[float] = None,
+        per_node_rate: Optional[float] = None,
+        burst: Optional[float] = None,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.per_node_concurrency = per_node_concurrency
+        self.rate = rate
+        self.per_node_rate = per_node_rate
+        self.burst = burst
+        self._global = _Gate(max_concurrency, rate, burst)
+        self._nodes: Dict[str, _Gate] = {}
+        self._lock = threading.Lock()
+
+    def _gates(self, node: str):
+        with self._lock:
+            gate = self._nodes.get(node)
+            if gate is None:
+                gate = self._nodes[node] = _Gate(
+                    self.per_node_concurrency, self.per_node_rate, self.burst
+                )
+        # Node first: a caller waiting for a busy node must not hold a global
+        # slot that requests to other nodes could use.
+        return gate, self._global
+
+    def _adjust(self, gates, waiting: int = 0, in_flight: int = 0) -> None:
+        with self._lock:
+            for gate in gates:
+                gate.waiting += waiting
+                gate.in_flight += in_flight
+
+    @contextmanager
+    def slot(self, node: str) -> Iterator[None]:
+        """Block until a request to ``node`` is allowed, then hold a slot."""
+        gates = self._gates(node)
+        acquired = []
+        self._adjust(gates, waiting=1)
+        try:
+            for gate in gates:
+                if gate.semaphore is not None:
+                    gate.semaphore.acquire()
+                    acquired.append(gate.semaphore)
+            delay = max(
+                (gate.bucket.reserve() for gate in gates if gate.bucket), default=0.0
+            )
+            if delay > 0:
+                time.sleep(delay)
+        except BaseException:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            raise
+        finally:
+            self._adjust(gates, waiting=-1)
+        self._adjust(gates, in_flight=1)
+        try:
+            yield
+        finally:
+            self._adjust(gates, in_flight=-1)
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+    @asynccontextmanager
+    async def async_slot(self, node: str) -> AsyncIterator[None]:
+        """Wait until a request to ``node`` is allowed, then hold a slot."""
+        gates = self._gates(node)
+        acquired = []
+        self._adjust(gates, waiting=1)
+        try:
+            for gate in gates:
+                if gate.async_semaphore is not None:
+                    await gate.async_semaphore.acquire()
+                    acquired.append(gate.async_semaphore)
+            delay = max(
+                (gate.bucket.reserve() for gate in gates if gate.bucket), default=0.0
+            )
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            raise
+        finally:
+            self._adjust(gates, waiting=-1)
+        self._adjust(gates, in_flight=1)
+        try:
+            yield
+        finally:
+            self._adjust(gates, in_flight=-1)
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a slot or a token."""
+        return self._global.waiting
+
+    def stats(self) -> Dict[str, object]:
+        """Return queue depth and in-flight counts, globally and per node."""
+        with self._lock:
+            return {
+                "queue_depth": self._global.waiting,
+                "in_flight": self._global.in_flight,
+                "nodes": {
+                    node: {"queue_depth": gate.waiting, "in_flight": gate.in_flight}
+                    for node, gate in self._nodes.items()
+                },
+            }
+
+
+__all__ = ["RequestLimiter", "TokenBucket"]
@@ -0,0 +1,188 @@
+"""Per-node, per-method RPC metrics for :class:`~nectarlite.api.Api` clients."""
+
+import bisect
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+#: Upper bounds (seconds) of the latency histogram buckets.
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+#: Signature of the callback invoked for every recorded event.
+MetricsCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class _Stats:
+    """Counters and latency histogram for one ``(node, method)`` pair."""
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "latency_counts",
+        "latency_sum",
+        "request_bytes",
+        "response_bytes",
+        "wire_bytes",
+        "failovers",
+        "hedges",
+    )
+
+    def __init__(self, buckets: int) -> None:
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.latency_counts = [0] * (buckets + 1)
+        self.latency_sum = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.wire_bytes = 0
+        self.failovers = 0
+        self.hedges = 0
+
+    def merge(self, other: "_Stats") -> None:
+        self.calls += other.calls
+        for name, count in other.errors.items():
+            self.errors[name] = self.errors.get(name, 0) + count
+        self.latency_counts = [
+            a + b for a, b in zip(self.latency_counts, other.latency_counts)
+        ]
+        self.latency_sum += other.latency_sum
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+        self.wire_bytes += other.wire_bytes
+        self.failovers += other.failovers
+        self.hedges += other.hedges
+
+
+class MetricsRegistry:
+    """Collect call counts, latency, payload sizes, failovers and errors.
+
+    Requests are recorded per node and per ``"api.method"`` (batches are
+    recorded under ``"batch"``).  :meth:`snapshot` returns plain dicts with
+    cumulative latency buckets keyed by their upper bound, ready to export.
+
+    ``callback`` is called as ``callback(event, data)`` for every ``"request"``,
+    ``"failover"`` and ``"hedge"`` event so they can be forwarded to
+    Prometheus, StatsD or a log; exceptions it raises are logged and ignored.
+    Clients created without a registry skip all of this work.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        callback: Optional[MetricsCallback] = None,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.callback = callback
+        self._stats: Dict[Tuple[str, str], _Stats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, node: str, method: str) -> _Stats:
+        stats = self._stats.get((node, method))
+        if stats is None:
+            stats = self._stats[(node, method)] = _Stats(len(self.buckets))
+        return stats
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        if self.callback is None:
+            return
+        try:
+            self.callback(event, data)
+        except Exception:
+            log.exception("Metrics callback failed for %s event.", event)
+
+    def record_request(
+        self,
+        node: str,
+        method: str,
+        elapsed: float,
+        request_bytes: int,
+        response_bytes: int,
+        error: Optional[str] = None,
+        wire_bytes: Optional[int] = None,
+    ) -> None:
+        """Record one HTTP round trip; ``error`` is the failure class, if any.
+
+        ``response_bytes`` is the decoded body size and ``wire_bytes`` what
+        was actually received (smaller when the response was compressed);
+        it defaults to ``response_bytes``.
+        """
+        if wire_bytes is None:
+            wire_bytes = response_bytes
+        with self._lock:
+            stats = self._get(node, method)
+            stats.calls += 1
+            stats.latency_counts[bisect.bisect_left(self.buckets, elapsed)] += 1
+            stats.latency_sum += elapsed
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            stats.wire_bytes += wire_bytes
+            if error is not None:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+        self._emit(
+            "request",
+            {
+                "node": node,
+                "method": method,
+                "elapsed": elapsed,
+                "request_bytes": request_bytes,
+                "response_bytes": response_bytes,
+                "wire_bytes": wire_bytes,
+                "error": error,
+            },
+        )
+
+    def record_failover(self, node: str, method: str) -> None:
+        """Record that a call moved on to ``node`` after a failure."""
+        with self._lock:
+            self._get(node, method).failovers += 1
+        self._emit("failover", {"node": node, "method": method})
+
+    def record_hedge(self, node: str, method: str) -> None:
+        """Record a speculative duplicate of a slow call sent to ``node``."""
+        with self._lock:
+            self._get(node, method).hedges += 1
+        self._emit("hedge", {"node": node, "method": method})
+
+    def _export(self, stats: _Stats) -> Dict[str, Any]:
+        cumulative = 0
+        buckets: Dict[str, int] = {}
+        for bound, count in zip(self.buckets + (float("inf"),), stats.latency_counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "calls": stats.calls,
+            "errors": dict(stats.errors),
+            "failovers": stats.failovers,
+            "hedges": stats.hedges,
+            "request_bytes": stats.request_bytes,
+            "response_bytes": stats.response_bytes,
+            "wire_bytes": stats.wire_bytes,
+            "latency": {
+                "count": stats.calls,
+                "sum": stats.latency_sum,
+                "buckets": buckets,
+            },
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return metrics per node and method, plus totals per method."""
+        with self._lock:
+            nodes: Dict[str, Dict[str, Any]] = {}
+            totals: Dict[str, _Stats] = {}
+            for (node, method), stats in self._stats.items():
+                nodes.setdefault(node, {})[method] = self._export(stats)
+                total = totals.get(method)
+                if total is None:
+                    total = totals[method] = _Stats(len(self.buckets))
+                total.merge(stats)
+            methods = {method: self._export(stats) for method, stats in totals.items()}
+        return {"nodes": nodes, "methods": methods}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+__all__ = ["MetricsRegistry", "DEFAULT_LATENCY_BUCKETS"]
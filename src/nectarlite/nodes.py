@@ -0,0 +1,368 @@
+"""Node health tracking used by :class:`~nectarlite.api.Api` for node selection."""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+class _NodeStats:
+    __slots__ = ("latency", "error_rate", "samples")
+
+    def __init__(self) -> None:
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples = 0
+
+
+class NodeScorer:
+    """Rank nodes by an exponentially weighted average of latency and errors.
+
+    Every completed request feeds :meth:`record_success` or
+    :meth:`record_failure`.  :meth:`ranked` orders nodes from best to worst
+    score, where the score is the latency EWMA plus ``failure_cost`` seconds
+    weighted by the error-rate EWMA.  Nodes without samples rank first so that
+    they get measured.  With probability ``exploration`` a random non-best node
+    is moved to the front so recovered nodes are rediscovered.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.3,
+        exploration: float = 0.05,
+        failure_cost: float = 5.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        if not 0 <= exploration <= 1:
+            raise ValueError("exploration must be in [0, 1]")
+        self.alpha = alpha
+        self.exploration = exploration
+        self.failure_cost = failure_cost
+        self._rng = rng or random.Random()
+        self._stats: Dict[str, _NodeStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, node: str) -> _NodeStats:
+        stats = self._stats.get(node)
+        if stats is None:
+            stats = self._stats[node] = _NodeStats()
+        return stats
+
+    def _update(self, node: str, latency: Optional[float], failed: bool) -> None:
+        with self._lock:
+            stats = self._get(node)
+            if latency is not None:
+                if stats.latency is None:
+                    stats.latency = latency
+                else:
+                    stats.latency += self.alpha * (latency - stats.latency)
+            stats.error_rate += self.alpha * (float(failed) - stats.error_rate)
+            stats.samples += 1
+
+    def record_success(self, node: str, latency: float) -> None:
+        """Record a request to ``node`` that completed in ``latency`` seconds."""
+        self._update(node, latency, failed=False)
+
+    def record_failure(self, node: str, latency: Optional[float] = None) -> None:
+        """Record a failed request to ``node``."""
+        self._update(node, latency, failed=True)
+
+    def score(self, node: str) -> float:
+        """Return the current score for ``node``; lower is better."""
+        with self._lock:
+            stats = self._stats.get(node)
+            if stats is None or stats.samples == 0:
+                return 0.0
+            latency = stats.latency or 0.0
+            return latency + stats.error_rate * self.failure_cost
+
+    def ranked(self, nodes: Iterable[str]) -> List[str]:
+        """Return ``nodes`` ordered from best to worst score."""
+        order = sorted(nodes, key=self.score)
+        if len(order) > 1 and self._rng.random() < self.exploration:
+            explored = order.pop(self._rng.randrange(1, len(order)))
+            order.insert(0, explored)
+        return order
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Return a copy of the tracked statistics keyed by node URL."""
+        with self._lock:
+            return {
+                node: {
+                    "latency": stats.latency,
+                    "error_rate": stats.error_rate,
+                    "samples": stats.samples,
+                }
+                for node, stats in self._stats.items()
+            }
+
+
+class MethodLatency:
+    """Sliding window of recent latencies per JSON-RPC method."""
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, latency: float) -> None:
+        with self._lock:
+            samples = self._samples.get(method)
+            if samples is None:
+                samples = self._samples[method] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def count(self, method: str) -> int:
+        with self._lock:
+            return len(self._samples.get(method, ()))
+
+    def percentile(self, method: str, q: float) -> Optional[float]:
+        """Return the ``q`` quantile (0-1) of recent latencies, if any."""
+        with self._lock:
+            samples = sorted(self._samples.get(method, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(q * len(samples)))
+        return samples[index]
+
+
+class HeadTracker:
+    """Track the head block each node reported and flag nodes that lag.
+
+    Observations are projected forward at one block per ``block_interval``
+    seconds so that a node seen a while ago is compared fairly with one seen
+    just now.  A node is lagging when its projected head is more than
+    ``max_lag`` blocks behind the best projected head.  Observations older
+    than ``ttl`` seconds are forgotten so demoted nodes get re-measured.
+    """
+
+    def __init__(
+        self,
+        max_lag: int = 20,
+        ttl: float = 60.0,
+        block_interval: float = 3.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_lag = max_lag
+        self.ttl = ttl
+        self.block_interval = block_interval
+        self._clock = clock
+        self._heads: Dict[str, Tuple[int, Optional[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, node: str, head_block: int, irreversible_block: Optional[int] = None
+    ) -> None:
+        """Record that ``node`` reported ``head_block`` just now."""
+        with self._lock:
+            self._heads[node] = (head_block, irreversible_block, self._clock())
+
+    def observe_properties(self, node: str, props: Any) -> None:
+        """Record the head from a dynamic global properties response."""
+        if isinstance(props, dict) and "head_block_number" in props:
+            self.observe(
+                node,
+                props["head_block_number"],
+                props.get("last_irreversible_block_num"),
+            )
+
+    def _projected(self, now: float) -> Dict[str, float]:
+        projected = {}
+        for node, (head, _, seen_at) in self._heads.items():
+            age = now - seen_at
+            if age <= self.ttl:
+                projected[node] = head + age / self.block_interval
+        return projected
+
+    def lag(self, node: str) -> Optional[float]:
+        """Return how many blocks ``node`` is behind the best node, if known."""
+        with self._lock:
+            projected = self._projected(self._clock())
+        if node not in projected:
+            return None
+        return max(projected.values()) - projected[node]
+
+    def is_lagging(self, node: str) -> bool:
+        lag = self.lag(node)
+        return lag is not None and lag > self.max_lag
+
+    def partition(self, nodes: Iterable[str]) -> List[str]:
+        """Return ``nodes`` with lagging ones moved to the end, order kept."""
+        with self._lock:
+            projected = self._projected(self._clock())
+        if not projected:
+            return list(nodes)
+        best = max(projected.values())
+        fresh: List[str] = []
+        lagging: List[str] = []
+        for node in nodes:
+            if node in projected and best - projected[node] > self.max_lag:
+                lagging.append(node)
+            else:
+                fresh.append(node)
+        return fresh + lagging
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Return the last reported head, irreversible block and lag per node."""
+        with self._lock:
+            now = self._clock()
+            projected = self._projected(now)
+            heads = dict(self._heads)
+        best = max(projected.values()) if projected else None
+        return {
+            node: {
+                "head_block_number": head,
+                "last_irreversible_block_num": irreversible,
+                "age": now - seen_at,
+                "lag": best - projected[node] if node in projected else None,
+            }
+            for node, (head, irreversible, seen_at) in heads.items()
+        }
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-node circuit breaker with half-open probing.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    :meth:`allow_request` rejects the node without touching the network.  Once
+    ``cooldown`` seconds have passed a single probe request is admitted
+    (half-open); its success closes the breaker, its failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._cooldown_elapsed(self._opened_at):
+                return HALF_OPEN
+            return self._state
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    def _cooldown_elapsed(self, since: float) -> bool:
+        return self._clock() - since >= self.cooldown
+
+    def allow_request(self) -> bool:
+        """Return ``True`` if a request may be sent to the node now.
+
+        In the half-open state only one probe is admitted at a time; a probe
+        that never reports back is abandoned after another ``cooldown``.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if not self._cooldown_elapsed(self._opened_at):
+                    return False
+                self._state = HALF_OPEN
+            elif self._probe_started is not None and not self._cooldown_elapsed(
+                self._probe_started
+            ):
+                return False
+            self._probe_started = self._clock()
+            return True
+
+    def release(self) -> None:
+        """Give back a probe slot for a request that reported no outcome."""
+        with self._lock:
+            self._probe_started = None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._probe_started = None
+
+
+class BreakerRegistry:
+    """Circuit breakers keyed by node URL.
+
+    Clients constructed without an explicit registry share
+    :data:`DEFAULT_BREAKERS`, so an :class:`~nectarlite.api.Api` and an
+    :class:`~nectarlite.api.AsyncApi` using the same node see the same state.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, node: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(node)
+            if breaker is None:
+                breaker = self._breakers[node] = CircuitBreaker(
+                    self.failure_threshold, self.cooldown, self._clock
+                )
+            return breaker
+
+    def states(self, nodes: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Return the breaker state for ``nodes`` (default: all known nodes)."""
+        if nodes is None:
+            with self._lock:
+                nodes = list(self._breakers)
+        return {node: self.get(node).state for node in nodes}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+DEFAULT_BREAKERS = BreakerRegistry()
+
+
+__all__ = [
+    "NodeScorer",
+    "MethodLatency",
+    "HeadTracker",
+    "CircuitBreaker",
+    "BreakerRegistry",
+    "DEFAULT_BREAKERS",
+    "CLOSED",
+    "OPEN",
+    "HALF_OPEN",
+]
@@ -0,0 +1,135 @@
+"""Retry policy for :class:`~nectarlite.api.Api` failover."""
+
+import logging
+import random
+import threading
+from typing import Iterable, Optional
+
+from .exceptions import DeadlineExceeded, NodeError
+
+log = logging.getLogger(__name__)
+
+#: JSON-RPC codes meaning the request itself is wrong; no node will accept it.
+FINAL_ERROR_CODES = frozenset(
+    {
+        -32700,  # parse error
+        -32600,  # invalid request
+        -32601,  # method not found: the API plugin is not enabled
+        -32602,  # invalid params
+    }
+)
+
+#: ``error.data.name`` values hived uses for deterministic chain rejections.
+FINAL_ERROR_NAMES = frozenset(
+    {
+        "assert_exception",
+        "missing_auth",
+        "tx_missing_active_auth",
+        "tx_missing_owner_auth",
+        "tx_missing_posting_auth",
+        "tx_missing_other_auth",
+        "tx_irrelevant_sig",
+        "tx_duplicate_sig",
+        "tx_duplicate_transaction",
+        "insufficient_funds",
+    }
+)
+
+#: Message fragments that identify deterministic chain rejections.
+FINAL_ERROR_MESSAGES = (
+    "Assert Exception",
+    "Missing Active Authority",
+    "Missing Owner Authority",
+    "Missing Posting Authority",
+    "Duplicate transaction check failed",
+    "does not have sufficient funds",
+    "Invalid cast",
+    "Parse Error",
+)
+
+
+class RetryPolicy:
+    """Decide whether and when a failed call is retried on another node.
+
+    * JSON-RPC errors are classified by :meth:`is_retriable`: deterministic
+      rejections (bad params, unknown methods, chain assertions, missing
+      authorities) are final and raised immediately, so callers can fall back
+      to another method at once; anything else (database locks, upstream
+      timeouts) is retried.  Transport errors are always retriable.
+    * The first failover is immediate; later retries wait :meth:`backoff`
+      seconds: exponential in the attempt number, capped at ``backoff_max``,
+      with full jitter.
+    * A retry budget stops a burst of failures from multiplying load: every
+      call deposits ``budget_ratio`` tokens (up to ``budget_max``) and every
+      retry spends one.  With the defaults at most ~20% extra requests are
+      sent once the initial balance is spent.
+
+    ``max_attempts`` caps attempts per call (default: one per node).
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        jitter: bool = True,
+        budget_ratio: float = 0.2,
+        budget_max: float = 10.0,
+        final_codes: Iterable[int] = FINAL_ERROR_CODES,
+        final_names: Iterable[str] = FINAL_ERROR_NAMES,
+        final_messages: Iterable[str] = FINAL_ERROR_MESSAGES,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.budget_ratio = budget_ratio
+        self.budget_max = budget_max
+        self.final_codes = frozenset(final_codes)
+        self.final_names = frozenset(final_names)
+        self.final_messages = tuple(final_messages)
+        self._rng = rng or random.Random()
+        self._tokens = budget_max
+        self._lock = threading.Lock()
+
+    def is_retriable(self, exc: BaseException) -> bool:
+        """Return ``False`` if ``exc`` would fail the same way on every node."""
+        if not isinstance(exc, NodeError):
+            return True
+        if isinstance(exc, DeadlineExceeded):
+            return False
+        if exc.code in self.final_codes:
+            return False
+        data = exc.data if isinstance(exc.data, dict) else {}
+        if data.get("name") in self.final_names:
+            return False
+        message = str(exc.message or "")
+        return not any(fragment in message for fragment in self.final_messages)
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before attempt number ``attempt`` (0 = first)."""
+        if attempt < 2:
+            return 0.0
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 2))
+        return self._rng.uniform(0, delay) if self.jitter else delay
+
+    def record_call(self) -> None:
+        """Deposit budget for one new call."""
+        with self._lock:
+            self._tokens = min(self.budget_max, self._tokens + self.budget_ratio)
+
+    def acquire_retry(self) -> bool:
+        """Spend budget for one retry; ``False`` once the budget is exhausted."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def budget(self) -> float:
+        return self._tokens
+
+
+__all__ = ["RetryPolicy"]
@@ -0,0 +1,357 @@
+"""In-process simulated Hive node for load tests and offline development.
+
+:class:`SimulatedNode` is an ``httpx`` transport that synthesizes a growing
+chain.  Pass it as ``transport`` to :class:`~nectarlite.api.Api` or
+:class:`~nectarlite.api.AsyncApi`; every node URL is then served locally::
+
+    node = SimulatedNode(block_interval=0.1, ops_per_block=(10, 200))
+    api = Api(["https://a.sim", "https://b.sim"], transport=node)
+    node.host_lag["b.sim"] = 40  # b.sim reports a stale head
+
+Blocks are generated deterministically from ``seed`` and the block number.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .cache import BLOCK_INTERVAL
+
+log = logging.getLogger(__name__)
+
+#: Error returned for injected failures; retriable like a real database lock.
+INJECTED_ERROR = {"code": -32003, "message": "Unable to acquire database lock"}
+
+OpsPerBlock = int | Tuple[int, int] | Callable[[random.Random], int]
+Latency = float | Tuple[float, float]
+
+
+def _rpc_error(code: int, message: str) -> Dict[str, Any]:
+    return {"code": code, "message": message}
+
+
+class SimulatedNode(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Synthesize a Hive chain and answer JSON-RPC requests against it.
+
+    * The head advances one block every ``block_interval`` seconds of
+      ``clock`` time (``None`` = only when :meth:`advance` is called).
+    * ``ops_per_block`` is a count, a ``(min, max)`` range or a callable
+      taking a :class:`random.Random`.
+    * ``latency`` (seconds, or a ``(min, max)`` range) delays each HTTP
+      request.  ``error_rate`` answers that share of calls with a JSON-RPC
+      error and ``drop_rate`` fails that share of requests with
+      :class:`httpx.ConnectError`.
+    * ``lag`` holds back the head reported to every host and ``host_lag``
+      adds per-host lag, keyed by host name.
+
+    Broadcast transactions are included in the block after the current head.
+    :attr:`calls` counts calls per ``"api.method"``.
+    """
+
+    def __init__(
+        self,
+        start_block: int = 1,
+        block_interval: Optional[float] = BLOCK_INTERVAL,
+        ops_per_block: OpsPerBlock = (0, 50),
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        lag: int = 0,
+        host_lag: Optional[Dict[str, int]] = None,
+        irreversible_lag: int = 20,
+        seed: int = 0,
+        start_time: datetime = datetime(2024, 1, 1),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.start_block = start_block
+        self.block_interval = block_interval
+        self.ops_per_block = ops_per_block
+        self.latency = latency
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.lag = lag
+        self.host_lag: Dict[str, int] = dict(host_lag or {})
+        self.irreversible_lag = irreversible_lag
+        self.seed = seed
+        self.start_time = start_time
+        self.calls: Counter = Counter()
+        self.requests = 0
+        self._clock = clock
+        self._started = clock()
+        self._advanced = 0
+        self._broadcasts: Dict[int, List[Dict[str, Any]]] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # -- chain ----------------------------------------------------------------
+
+    def advance(self, blocks: int = 1) -> int:
+        """Produce ``blocks`` blocks immediately and return the new head."""
+        with self._lock:
+            self._advanced += blocks
+        return self.head_block_number()
+
+    def head_block_number(self, host: Optional[str] = None) -> int:
+        """Return the head block, as reported to ``host`` if given."""
+        head = self.start_block + self._advanced
+        if self.block_interval:
+            head += int((self._clock() - self._started) / self.block_interval)
+        if host is not None:
+            head -= self.lag + self.host_lag.get(host, 0)
+        return max(self.start_block, head)
+
+    def block_id(self, block_num: int) -> str:
+        digest = hashlib.sha1(f"{self.seed}:{block_num}".encode()).hexdigest()
+        return f"{block_num:08x}{digest[:32]}"
+
+    def block_time(self, block_num: int) -> str:
+        delta = timedelta(seconds=(block_num - self.start_block) * BLOCK_INTERVAL)
+        return (self.start_time + delta).strftime("%Y-%m-%dT%H:%M:%S")
+
+    def _op_count(self, rng: random.Random) -> int:
+        if callable(self.ops_per_block):
+            return max(0, int(self.ops_per_block(rng)))
+        if isinstance(self.ops_per_block, tuple):
+            return rng.randint(*self.ops_per_block)
+        return self.ops_per_block
+
+    @staticmethod
+    def _operation(rng: random.Random) -> List[Any]:
+        kind = rng.random()
+        if kind < 0.6:
+            return [
+                "vote",
+                {
+                    "voter": f"voter{rng.randrange(10_000)}",
+                    "author": f"author{rng.randrange(1_000)}",
+                    "permlink": f"post-{rng.randrange(10**9):x}",
+                    "weight": rng.choice([10000, 5000, -10000]),
+                },
+            ]
+        if kind < 0.8:
+            return [
+                "transfer",
+                {
+                    "from": f"user{rng.randrange(10_000)}",
+                    "to": f"user{rng.randrange(10_000)}",
+                    "amount": f"{rng.randrange(1, 100_000) / 1000:.3f} HIVE",
+                    "memo": "",
+                },
+            ]
+        return [
+            "custom_json",
+            {
+                "required_auths": [],
+                "required_posting_auths": [f"user{rng.randrange(10_000)}"],
+                "id": "follow",
+                "json": '["follow",{}]',
+            },
+        ]
+
+    def block(self, block_num: int) -> Dict[str, Any]:
+        """Return block ``block_num`` in ``condenser_api`` format."""
+        rng = random.Random(f"{self.seed}:{block_num}")
+        transactions = []
+        for _ in range(self._op_count(rng)):
+            transactions.append(
+                {
+                    "ref_block_num": (block_num - 2) & 0xFFFF,
+                    "ref_block_prefix": rng.randrange(2**32),
+                    "expiration": self.block_time(block_num + 10),
+                    "operations": [self._operation(rng)],
+                    "extensions": [],
+                    "signatures": [f"1f{rng.randrange(2**256):064x}"],
+                }
+            )
+        with self._lock:
+            transactions.extend(self._broadcasts.get(block_num, ()))
+        return {
+            "previous": self.block_id(block_num - 1),
+            "timestamp": self.block_time(block_num),
+            "witness": f"witness{block_num % 21}",
+            "transaction_merkle_root": "0" * 40,
+            "extensions": [],
+            "witness_signature": "1f" + "0" * 128,
+            "transactions": transactions,
+            "block_id": self.block_id(block_num),
+            "signing_key": "STM" + "1" * 50,
+            "transaction_ids": [
+                hashlib.sha1(json.dumps(trx, sort_keys=True).encode()).hexdigest()
+                for trx in transactions
+            ],
+        }
+
+    def _appbase_block(self, block_num: int) -> Dict[str, Any]:
+        block = self.block(block_num)
+        block["transactions"] = [
+            dict(
+                trx,
+                operations=[
+                    op
+                    if isinstance(op, dict)
+                    else {"type": f"{op[0]}_operation", "value": op[1]}
+                    for op in trx["operations"]
+                ],
+            )
+            for trx in block["transactions"]
+        ]
+        return block
+
+    def dynamic_global_properties(self, host: Optional[str] = None) -> Dict[str, Any]:
+        head = self.head_block_number(host)
+        return {
+            "head_block_number": head,
+            "head_block_id": self.block_id(head),
+            "time": self.block_time(head),
+            "current_witness": f"witness{head % 21}",
+            "last_irreversible_block_num": max(
+                self.start_block, head - self.irreversible_lag
+            ),
+        }
+
+    @staticmethod
+    def account(name: str) -> Dict[str, Any]:
+        return {
+            "name": name,
+            "balance": "100.000 HIVE",
+            "hbd_balance": "10.000 HBD",
+            "vesting_shares": "100000.000000 VESTS",
+            "voting_manabar": {"current_mana": "10000", "last_update_time": 0},
+            "posting": {"weight_threshold": 1, "account_auths": [], "key_auths": []},
+            "memo_key": "STM" + "1" * 50,
+            "reputation": 0,
+            "json_metadata": "",
+        }
+
+    def _broadcast(self, host: str, trx: Dict[str, Any]) -> Dict[str, Any]:
+        block_num = self.head_block_number(host) + 1
+        with self._lock:
+            included = self._broadcasts.setdefault(block_num, [])
+            included.append(trx)
+            trx_num = len(included) - 1
+        txid = hashlib.sha1(json.dumps(trx, sort_keys=True).encode()).hexdigest()
+        return {
+            "id": txid,
+            "block_num": block_num,
+            "trx_num": trx_num,
+            "expired": False,
+        }
+
+    # -- JSON-RPC ---------------------------------------------------------------
+
+    def _result(self, host: str, name: str, params: Any) -> Any:
+        """Return the result of ``name``; raises ``LookupError`` if unknown."""
+        head = self.head_block_number(host)
+        if name in (
+            "condenser_api.get_dynamic_global_properties",
+            "database_api.get_dynamic_global_properties",
+        ):
+            return self.dynamic_global_properties(host)
+        if name == "condenser_api.get_block":
+            block_num = params[0]
+            return self.block(block_num) if block_num <= head else None
+        if name == "block_api.get_block":
+            block_num = params["block_num"]
+            return (
+                {"block": self._appbase_block(block_num)} if block_num <= head else {}
+            )
+        if name == "block_api.get_block_range":
+            first = params["starting_block_num"]
+            last = min(head, first + params["count"] - 1)
+            return {"blocks": [self._appbase_block(n) for n in range(first, last + 1)]}
+        if name == "condenser_api.get_accounts":
+            return [self.account(account) for account in params[0]]
+        if name == "condenser_api.get_transaction_hex":
+            encoded = json.dumps(params[0], sort_keys=True).encode()
+            return hashlib.sha256(encoded).hexdigest() + "00"
+        if name == "condenser_api.broadcast_transaction_synchronous":
+            return self._broadcast(host, params[0])
+        if name in (
+            "condenser_api.broadcast_transaction",
+            "network_broadcast_api.broadcast_transaction",
+        ):
+            trx = params[0] if isinstance(params, list) else params["trx"]
+            self._broadcast(host, trx)
+            return {}
+        raise LookupError(name)
+
+    def _answer(self, host: str, payload: Any) -> Dict[str, Any]:
+        if not isinstance(payload, dict) or "method" not in payload:
+            return {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": _rpc_error(-32600, "Invalid Request"),
+            }
+        answer: Dict[str, Any] = {"jsonrpc": "2.0", "id": payload.get("id")}
+        name = payload["method"]
+        with self._lock:
+            self.calls[name] += 1
+            inject = self.error_rate and self._rng.random() < self.error_rate
+        if inject:
+            answer["error"] = dict(INJECTED_ERROR)
+            return answer
+        try:
+            answer["result"] = self._result(host, name, payload.get("params"))
+        except LookupError:
+            answer["error"] = _rpc_error(-32601, f"Could not find method {name}")
+        except (KeyError, IndexError, TypeError) as exc:
+            answer["error"] = _rpc_error(-32602, f"Invalid parameters: {exc}")
+        return answer
+
+    def _prepare(self, request: httpx.Request) -> float:
+        """Count the request, apply drop injection and return its latency."""
+        with self._lock:
+            self.requests += 1
+            dropped = self.drop_rate and self._rng.random() < self.drop_rate
+            if isinstance(self.latency, tuple):
+                delay = self._rng.uniform(*self.latency)
+            else:
+                delay = self.latency
+        if dropped:
+            raise httpx.ConnectError("Simulated connection failure", request=request)
+        return delay
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "POST":
+            return httpx.Response(404, request=request)
+        try:
+            document = json.loads(request.content)
+        except ValueError:
+            body: Any = {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": _rpc_error(-32700, "Parse Error"),
+            }
+        else:
+            host = request.url.host
+            if isinstance(document, list):
+                body = [self._answer(host, payload) for payload in document]
+            else:
+                body = self._answer(host, document)
+        return httpx.Response(200, json=body, request=request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        delay = self._prepare(request)
+        if delay:
+            time.sleep(delay)
+        return self._respond(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        delay = self._prepare(request)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(request)
+
+
+__all__ = ["SimulatedNode"]
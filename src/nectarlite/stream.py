@@ -1,33 +1,191 @@
 # -*- coding: utf-8 -*-
 import asyncio
 import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 from .block import Block
+from .checkpoint import open_checkpoint
 from .exceptions import NodeError
+from .helpers import (
+    _NO_BLOCK_RANGE,
+    MAX_BLOCK_RANGE,
+    is_method_not_found,
+    normalize_block,
+)
 
 log = logging.getLogger(__name__)
 
+#: Block range requests in flight while catching up with the chain.
+DEFAULT_PREFETCH = 16
+
+#: Blocks requested per ``block_api.get_block_range`` call while catching up.
+DEFAULT_RANGE_SIZE = 50
+
+#: Distance from the target head below which blocks are fetched one by one.
+DEFAULT_CATCH_UP_THRESHOLD = 5
+
+#: Seconds between Hive blocks.
+BLOCK_INTERVAL = 3.0
+
+#: Seconds after a block's expected production time before polling for it.
+DEFAULT_WAKE_MARGIN = 0.2
+
+#: How long a block may be overdue before the next slot is waited for.
+LATE_BLOCK_WINDOW = 1.0
+
+#: First and largest pause (seconds) after consecutive node errors.
+DEFAULT_ERROR_BACKOFF = 1.0
+MAX_ERROR_BACKOFF = 30.0
+
+
+def _parse_time(value):
+    """Return the POSIX timestamp of a UTC chain time string, or ``None``."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=timezone.utc).timestamp()
+
+
+class BlockScheduler:
+    """Decide how long a listener waits between polls.
+
+    When caught up, the listener sleeps until ``wake_margin`` seconds after
+    the next block is due, based on the head block time and the 3 second
+    block interval.  If that block is late, it polls again every
+    ``wake_margin`` seconds for up to :data:`LATE_BLOCK_WINDOW`, then waits
+    for the following slot.  Consecutive errors back off exponentially from
+    ``error_backoff`` up to ``max_error_backoff`` seconds.
+    """
+
+    def __init__(
+        self,
+        block_interval=BLOCK_INTERVAL,
+        wake_margin=DEFAULT_WAKE_MARGIN,
+        error_backoff=DEFAULT_ERROR_BACKOFF,
+        max_error_backoff=MAX_ERROR_BACKOFF,
+        clock=time.time,
+    ):
+        self.block_interval = block_interval
+        self.wake_margin = wake_margin
+        self.error_backoff = error_backoff
+        self.max_error_backoff = max_error_backoff
+        self.clock = clock
+        self.head_time = None
+        self.failures = 0
+
+    def observe(self, props):
+        """Remember the head block time from dynamic global properties."""
+        head_time = _parse_time(props.get("time"))
+        if head_time is not None:
+            self.head_time = head_time
+
+    def idle_delay(self):
+        """Seconds to sleep before polling for the next block."""
+        if self.head_time is None:
+            return self.block_interval
+        age = max(0.0, self.clock() - self.head_time)
+        if self.block_interval <= age < self.block_interval + LATE_BLOCK_WINDOW:
+            return self.wake_margin
+        return self.block_interval - age % self.block_interval + self.wake_margin
+
+    def error_delay(self):
+        """Record a failure and return the backoff before the next attempt."""
+        self.failures += 1
+        delay = self.error_backoff * 2 ** (self.failures - 1)
+        return min(delay, self.max_error_backoff)
+
+    def reset_errors(self):
+        self.failures = 0
+
+    def delivery_delay(self, block_data):
+        """Seconds between a block's timestamp and now, if it has one."""
+        produced = _parse_time((block_data or {}).get("timestamp"))
+        if produced is None:
+            return None
+        return self.clock() - produced
+
 
 class BlockListener:
-    """The base class for listening to the blockchain for new blocks."""
+    """The base class for listening to the blockchain for new blocks.
+
+    When more than ``catch_up_threshold`` blocks behind the target head,
+    blocks are fetched with ``block_api.get_block_range`` in chunks of
+    ``range_size``, up to ``prefetch`` chunks at a time, and still yielded in
+    order; ``prefetch=1`` fetches one chunk at a time.
+
+    The target height is only re-read once it has been reached.
+    :attr:`rpc_count` and :attr:`block_count` count the RPC calls made and
+    the blocks yielded; :attr:`rpcs_per_block` is their ratio.
+
+    ``scheduler`` (a :class:`BlockScheduler` by default) times polls and
+    error backoff.  Every yielded block gets a ``delivery_delay``: seconds
+    from its production to its delivery.  The last one is kept in
+    :attr:`last_delivery_delay`.
+    """
 
     def __init__(
-        self, api, blockchain_mode="irreversible", start_block=None, end_block=None
+        self,
+        api,
+        blockchain_mode="irreversible",
+        start_block=None,
+        end_block=None,
+        prefetch=DEFAULT_PREFETCH,
+        catch_up_threshold=DEFAULT_CATCH_UP_THRESHOLD,
+        range_size=DEFAULT_RANGE_SIZE,
+        scheduler=None,
     ):
         self.api = api
         self.blockchain_mode = blockchain_mode
         self.start_block = start_block
         self.end_block = end_block
+        self.prefetch = max(1, prefetch)
+        self.catch_up_threshold = catch_up_threshold
+        self.range_size = max(1, min(range_size, MAX_BLOCK_RANGE))
+        self.rpc_count = 0
+        self.block_count = 0
+        self.scheduler = scheduler or BlockScheduler()
+        self.last_delivery_delay = None
+        self._lock = threading.Lock()
 
-    def get_last_block_height(self):
-        """Get the last block height based on the chosen blockchain mode."""
+    @property
+    def rpcs_per_block(self):
+        """RPC calls made per block yielded so far."""
+        return self.rpc_count / self.block_count if self.block_count else 0.0
+
+    def _delivered(self, block):
+        self.block_count += 1
+        self.scheduler.reset_errors()
+        block.delivery_delay = self.scheduler.delivery_delay(block.data)
+        if block.delivery_delay is not None:
+            self.last_delivery_delay = block.delivery_delay
+            log.debug(
+                "Block %s delivered %.3fs after production.",
+                block.block_num,
+                block.delivery_delay,
+            )
+        return block
+
+    def _call(self, api_name, method, *params):
+        with self._lock:
+            self.rpc_count += 1
         try:
-            props = self.api.call("condenser_api", "get_dynamic_global_properties")
+            return self.api.call(api_name, method, *params)
         except Exception as exc:  # noqa: BLE001 - surface as NodeError
             if isinstance(exc, NodeError):
                 raise
             raise NodeError(str(exc)) from exc
+
+    def get_last_block_height(self):
+        """Get the last block height based on the chosen blockchain mode."""
+        props = self._call("condenser_api", "get_dynamic_global_properties")
+        self.scheduler.observe(props)
         if self.blockchain_mode == "irreversible":
             return props["last_irreversible_block_num"]
         elif self.blockchain_mode == "head":
@@ -47,38 +205,131 @@ class BlockListener:
                     break
                 except NodeError as exc:
                     log.warning("Unable to determine starting block: %s", exc)
-                    time.sleep(3)
+                    time.sleep(self.scheduler.error_delay())
+            target = current_block
+        else:
+            target = current_block - 1
 
         while True:
             try:
-                while (self.get_last_block_height() - current_block) > 0:
+                while True:
                     if self.end_block and current_block > self.end_block:
                         return
+                    if current_block > target:
+                        target = self.get_last_block_height()
+                    # Blocks up to and including the target can be fetched.
+                    behind = target - current_block + 1
+                    if behind <= 0:
+                        break
+
+                    if behind > self.catch_up_threshold:
+                        for block in self._catch_up(current_block, behind):
+                            yield self._delivered(block)
+                            current_block = block.block_num + 1
+                        continue
 
                     log.debug(f"Getting block: {current_block}")
-                    try:
-                        block_data = self.api.call(
-                            "condenser_api", "get_block", [current_block]
-                        )
-                    except Exception as exc:  # noqa: BLE001 - surface as NodeError
-                        if isinstance(exc, NodeError):
-                            raise
-                        raise NodeError(str(exc)) from exc
-                    if block_data:
-                        yield Block(
+                    block_data = self._call(
+                        "condenser_api", "get_block", [current_block]
+                    )
+                    if not block_data:
+                        raise NodeError(f"Block {current_block} is not available yet")
+                    yield self._delivered(
+                        Block(
                             current_block,
                             api=self.api,
                             data=block_data,
                         )
+                    )
 
                     current_block += 1
             except NodeError as exc:
-                log.warning("Node error while streaming blocks: %s", exc)
-                time.sleep(3)
+                delay = self.scheduler.error_delay()
+                log.warning(
+                    "Node error while streaming blocks: %s (retrying in %.1fs)",
+                    exc,
+                    delay,
+                )
+                time.sleep(delay)
                 continue
 
-            log.debug("Waiting for new blocks...")
-            time.sleep(3)
+            self.scheduler.reset_errors()
+            delay = self.scheduler.idle_delay()
+            log.debug("Waiting %.2fs for new blocks...", delay)
+            time.sleep(delay)
+
+    def _get_range(self, start, count):
+        """Fetch ``count`` blocks from ``start`` like :func:`~.helpers.get_blocks`."""
+        response = None
+        if self.api not in _NO_BLOCK_RANGE:
+            try:
+                response = self._call(
+                    "block_api",
+                    "get_block_range",
+                    {"starting_block_num": start, "count": count},
+                )
+            except NodeError as exc:
+                if not is_method_not_found(exc):
+                    raise
+                log.info("%s; fetching blocks one by one from now on.", exc)
+                _NO_BLOCK_RANGE.add(self.api)
+        if isinstance(response, dict) and "blocks" in response:
+            return [
+                normalize_block(block, start + offset)
+                for offset, block in enumerate(response["blocks"])
+            ]
+        blocks = []
+        for block_num in range(start, start + count):
+            block_data = self._call("condenser_api", "get_block", [block_num])
+            if not block_data:
+                break
+            blocks.append(block_data)
+        return blocks
+
+    def _catch_up(self, start, count):
+        """Yield ``count`` blocks from ``start`` in order, fetched concurrently.
+
+        A block the node does not have yet raises :class:`NodeError` so it is
+        retried instead of skipped.
+        """
+        stop = start + count
+        if self.end_block:
+            stop = min(stop, self.end_block + 1)
+        log.debug("Catching up on blocks %s to %s.", start, stop - 1)
+        pending = deque()
+        next_block = start
+        with ThreadPoolExecutor(
+            max_workers=self.prefetch, thread_name_prefix="nectarlite-prefetch"
+        ) as executor:
+            try:
+                while pending or next_block < stop:
+                    while next_block < stop and len(pending) < self.prefetch:
+                        size = min(self.range_size, stop - next_block)
+                        future = executor.submit(self._get_range, next_block, size)
+                        pending.append((next_block, size, future))
+                        next_block += size
+                    first, size, future = pending.popleft()
+                    blocks = future.result()
+                    for offset, block_data in enumerate(blocks):
+                        yield Block(first + offset, api=self.api, data=block_data)
+                    if len(blocks) < size:
+                        raise NodeError(
+                            f"Block {first + len(blocks)} is not available yet"
+                        )
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+
+
+def _resume_from(checkpoint, start_block):
+    """Return the block after the checkpoint, or ``start_block`` without one."""
+    if checkpoint is None:
+        return start_block
+    saved = checkpoint.load()
+    if saved is None:
+        return start_block
+    log.info("Resuming stream after checkpointed block %s.", saved)
+    return saved + 1
 
 
 class Op:
@@ -152,22 +403,58 @@ class Op:
 
 
 class Stream:
-    """Listen for specific events on the Hive blockchain."""
+    """Listen for specific events on the Hive blockchain.
+
+    ``checkpoint`` (a path or a :class:`~nectarlite.checkpoint.CheckpointStore`)
+    makes the stream resume after the last block it saved, ignoring
+    ``start_block``.  A block is saved once the consumer asks for what comes
+    after it, so every block is processed at least once.
+
+    ``prefetch``, ``catch_up_threshold``, ``range_size`` and ``scheduler`` are
+    passed to the :class:`BlockListener`.
+    """
 
     def __init__(
-        self, api, blockchain_mode="irreversible", start_block=None, end_block=None
+        self,
+        api,
+        blockchain_mode="irreversible",
+        start_block=None,
+        end_block=None,
+        prefetch=DEFAULT_PREFETCH,
+        checkpoint=None,
+        catch_up_threshold=DEFAULT_CATCH_UP_THRESHOLD,
+        range_size=DEFAULT_RANGE_SIZE,
+        scheduler=None,
     ):
         self.api = api
+        self.checkpoint = open_checkpoint(checkpoint)
+        start_block = _resume_from(self.checkpoint, start_block)
         self.block_listener = BlockListener(
             self.api,
             blockchain_mode=blockchain_mode,
             start_block=start_block,
             end_block=end_block,
+            prefetch=prefetch,
+            catch_up_threshold=catch_up_threshold,
+            range_size=range_size,
+            scheduler=scheduler,
         )
 
+    def _blocks(self):
+        """Yield listener blocks, checkpointing each one once it is consumed."""
+        if self.checkpoint is None:
+            yield from self.block_listener.stream_blocks()
+            return
+        try:
+            for block in self.block_listener.stream_blocks():
+                yield block
+                self.checkpoint.save(block.block_num)
+        finally:
+            self.checkpoint.flush()
+
     def stream_ops(self):
         """Yields all operations from the blockchain."""
-        for block in self.block_listener.stream_blocks():
+        for block in self._blocks():
             transactions = block["transactions"]
             if not transactions:
                 continue
@@ -201,20 +488,41 @@ class Stream:
 
     def stream_blocks(self):
         """Yields all blocks from the blockchain."""
-        for block in self.block_listener.stream_blocks():
+        for block in self._blocks():
             yield block
 
 
 class AsyncBlockListener:
-    """Async variant of :class:`BlockListener` using asyncio-friendly calls."""
+    """Async variant of :class:`BlockListener` using asyncio-friendly calls.
+
+    Catch-up chunks are fetched by concurrent tasks instead of threads.
+    """
+
+    rpcs_per_block = BlockListener.rpcs_per_block
+    _delivered = BlockListener._delivered
 
     def __init__(
-        self, api, blockchain_mode="irreversible", start_block=None, end_block=None
+        self,
+        api,
+        blockchain_mode="irreversible",
+        start_block=None,
+        end_block=None,
+        prefetch=DEFAULT_PREFETCH,
+        catch_up_threshold=DEFAULT_CATCH_UP_THRESHOLD,
+        range_size=DEFAULT_RANGE_SIZE,
+        scheduler=None,
     ):
         self.api = api
         self.blockchain_mode = blockchain_mode
         self.start_block = start_block
         self.end_block = end_block
+        self.prefetch = max(1, prefetch)
+        self.catch_up_threshold = catch_up_threshold
+        self.range_size = max(1, min(range_size, MAX_BLOCK_RANGE))
+        self.rpc_count = 0
+        self.block_count = 0
+        self.scheduler = scheduler or BlockScheduler()
+        self.last_delivery_delay = None
         self._closed = False
 
     def close(self):
@@ -222,6 +530,7 @@ class AsyncBlockListener:
 
     async def _call(self, api_name, method, params=None):
         params = params or []
+        self.rpc_count += 1
         try:
             if getattr(self.api, "is_async", False):
                 return await self.api.call(api_name, method, params)
@@ -233,6 +542,7 @@ class AsyncBlockListener:
 
     async def get_last_block_height(self):
         props = await self._call("condenser_api", "get_dynamic_global_properties", [])
+        self.scheduler.observe(props)
         if self.blockchain_mode == "irreversible":
             return props["last_irreversible_block_num"]
         elif self.blockchain_mode == "head":
@@ -253,56 +563,148 @@ class AsyncBlockListener:
                     break
                 except NodeError as exc:
                     log.warning("Unable to determine starting block: %s", exc)
-                    await asyncio.sleep(3)
+                    await asyncio.sleep(self.scheduler.error_delay())
             if self._closed:
                 return
+            target = current_block
+        else:
+            target = current_block - 1
 
         while not self._closed:
             try:
-                while (
-                    not self._closed
-                    and (await self.get_last_block_height() - current_block) > 0
-                ):
+                while not self._closed:
                     if self.end_block and current_block > self.end_block:
                         return
+                    if current_block > target:
+                        target = await self.get_last_block_height()
+                    # Blocks up to and including the target can be fetched.
+                    behind = target - current_block + 1
+                    if behind <= 0:
+                        break
+
+                    if behind > self.catch_up_threshold:
+                        async for block in self._catch_up(current_block, behind):
+                            if self._closed:
+                                return
+                            yield self._delivered(block)
+                            current_block = block.block_num + 1
+                        continue
 
                     log.debug(f"Getting block: {current_block}")
                     block_data = await self._call(
                         "condenser_api", "get_block", [current_block]
                     )
-                    if block_data:
-                        yield Block(
+                    if not block_data:
+                        raise NodeError(f"Block {current_block} is not available yet")
+                    yield self._delivered(
+                        Block(
                             current_block,
                             api=self.api,
                             data=block_data,
                         )
+                    )
 
                     current_block += 1
             except NodeError as exc:
-                log.warning("Node error while streaming blocks: %s", exc)
                 if self._closed:
                     return
-                await asyncio.sleep(3)
+                delay = self.scheduler.error_delay()
+                log.warning(
+                    "Node error while streaming blocks: %s (retrying in %.1fs)",
+                    exc,
+                    delay,
+                )
+                await asyncio.sleep(delay)
                 continue
 
-            log.debug("Waiting for new blocks...")
             if self._closed:
                 return
-            await asyncio.sleep(3)
+            self.scheduler.reset_errors()
+            delay = self.scheduler.idle_delay()
+            log.debug("Waiting %.2fs for new blocks...", delay)
+            await asyncio.sleep(delay)
+
+    async def _get_range(self, start, count):
+        """Fetch ``count`` blocks from ``start`` like :func:`~.helpers.get_blocks`."""
+        response = None
+        if self.api not in _NO_BLOCK_RANGE:
+            try:
+                response = await self._call(
+                    "block_api",
+                    "get_block_range",
+                    {"starting_block_num": start, "count": count},
+                )
+            except NodeError as exc:
+                if not is_method_not_found(exc):
+                    raise
+                log.info("%s; fetching blocks one by one from now on.", exc)
+                _NO_BLOCK_RANGE.add(self.api)
+        if isinstance(response, dict) and "blocks" in response:
+            return [
+                normalize_block(block, start + offset)
+                for offset, block in enumerate(response["blocks"])
+            ]
+        blocks = []
+        for block_num in range(start, start + count):
+            block_data = await self._call("condenser_api", "get_block", [block_num])
+            if not block_data:
+                break
+            blocks.append(block_data)
+        return blocks
+
+    async def _catch_up(self, start, count):
+        """Yield ``count`` blocks from ``start`` in order, fetched concurrently."""
+        stop = start + count
+        if self.end_block:
+            stop = min(stop, self.end_block + 1)
+        log.debug("Catching up on blocks %s to %s.", start, stop - 1)
+        pending = deque()
+        next_block = start
+        try:
+            while pending or next_block < stop:
+                while next_block < stop and len(pending) < self.prefetch:
+                    size = min(self.range_size, stop - next_block)
+                    task = asyncio.ensure_future(self._get_range(next_block, size))
+                    pending.append((next_block, size, task))
+                    next_block += size
+                first, size, task = pending.popleft()
+                blocks = await task
+                for offset, block_data in enumerate(blocks):
+                    yield Block(first + offset, api=self.api, data=block_data)
+                if len(blocks) < size:
+                    raise NodeError(f"Block {first + len(blocks)} is not available yet")
+        finally:
+            for _, _, task in pending:
+                task.cancel()
 
 
 class AsyncStream:
     """Async listener mirroring :class:`Stream` semantics with asyncio support."""
 
     def __init__(
-        self, api, blockchain_mode="irreversible", start_block=None, end_block=None
+        self,
+        api,
+        blockchain_mode="irreversible",
+        start_block=None,
+        end_block=None,
+        prefetch=DEFAULT_PREFETCH,
+        checkpoint=None,
+        catch_up_threshold=DEFAULT_CATCH_UP_THRESHOLD,
+        range_size=DEFAULT_RANGE_SIZE,
+        scheduler=None,
     ):
         self.api = api
+        self.checkpoint = open_checkpoint(checkpoint)
+        start_block = _resume_from(self.checkpoint, start_block)
         self.block_listener = AsyncBlockListener(
             self.api,
             blockchain_mode=blockchain_mode,
             start_block=start_block,
             end_block=end_block,
+            prefetch=prefetch,
+            catch_up_threshold=catch_up_threshold,
+            range_size=range_size,
+            scheduler=scheduler,
         )
         self._closed = False
 
@@ -312,10 +714,21 @@ class AsyncStream:
         self._closed = True
         self.block_listener.close()
 
+    async def _blocks(self):
+        """Yield listener blocks, checkpointing each one once it is consumed."""
+        try:
+            async for block in self.block_listener.stream_blocks():
+                yield block
+                if self.checkpoint is not None:
+                    self.checkpoint.save(block.block_num)
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.flush()
+
     async def stream_ops(self):
         """Asynchronously yield all operations from the blockchain."""
 
-        async for block in self.block_listener.stream_blocks():
+        async for block in self._blocks():
             transactions = block["transactions"]
             if self._closed:
                 return
@@ -357,7 +770,7 @@ class AsyncStream:
     async def stream_blocks(self):
         """Asynchronously yield all blocks from the blockchain."""
 
-        async for block in self.block_listener.stream_blocks():
+        async for block in self._blocks():
             if self._closed:
                 return
             yield block
@@ -4,6 +4,7 @@ import json
 from datetime import datetime, timedelta, timezone
 
 from .amount import Amount
+from .api import Api, deadline
 from .chain import HIVE_CHAIN_ID
 from .crypto.ecdsa import sign
 from .exceptions import TransactionError
@@ -272,6 +273,20 @@ class Transaction:
         self.ref_block_prefix = ref_block_prefix
         self.ops = []
         self.signatures = []
+        self._session = None
+
+    def _rpc(self):
+        """Return the client for this transaction's calls.
+
+        With an :class:`Api`, every call of one transaction (reference block,
+        transaction hex, broadcast) goes through one node session so they
+        agree about the chain head.
+        """
+        if not isinstance(self.api, Api):
+            return self.api
+        if self._session is None or self._session.client is not self.api:
+            self._session = self.api.session()
+        return self._session
 
     def append_op(self, op):
         """Append an operation to the transaction."""
@@ -292,7 +307,7 @@ class Transaction:
         if not self.api:
             raise TransactionError("API not configured to get transaction hex.")
 
-        tx_hex = self.api.call("condenser_api", "get_transaction_hex", [tx_for_hex])
+        tx_hex = self._rpc().call("condenser_api", "get_transaction_hex", [tx_for_hex])
         if isinstance(tx_hex, dict):
             tx_hex = tx_hex.get("hex") or tx_hex.get("transaction_hex")
         if not isinstance(tx_hex, str):
@@ -308,8 +323,12 @@ class Transaction:
         message = bytes.fromhex(HIVE_CHAIN_ID + digest_hex)
         self.signatures.append(sign(message, wif))
 
-    def broadcast(self):
-        """Broadcast the transaction to the network."""
+    def broadcast(self, timeout=None):
+        """Broadcast the transaction to the network.
+
+        :param float timeout: Seconds the broadcast may take across all node
+            failovers before it is abandoned; ``None`` for no limit.
+        """
         if not self.api:
             raise TransactionError("API not configured to broadcast.")
         if not self.signatures:
@@ -318,21 +337,22 @@ class Transaction:
         tx = self._construct_tx()
         tx["signatures"] = [s.hex() for s in self.signatures]
         try:
-            response = self.api.call(
-                "condenser_api", "broadcast_transaction_synchronous", [tx]
-            )
+            with deadline(timeout):
+                response = self._rpc().call(
+                    "condenser_api", "broadcast_transaction_synchronous", [tx]
+                )
         except Exception as exc:
             raise TransactionError(str(exc)) from exc
         return response
 
     def _set_block_params(self):
         """Get the reference block number and prefix from the blockchain."""
-        props = self.api.call("condenser_api", "get_dynamic_global_properties", [])
+        props = self._rpc().call("condenser_api", "get_dynamic_global_properties", [])
         head_block_number = props["head_block_number"]
         self.ref_block_num = (head_block_number - 3) & 0xFFFF
 
         block_num = head_block_number - 2
-        block_response = self.api.call(
+        block_response = self._rpc().call(
             "block_api", "get_block", {"block_num": block_num}
         )
         block_data = (
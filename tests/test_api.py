@@ -1,11 +1,48 @@
 """Unit tests for the Api class."""
 
+import asyncio
+import gzip
+import http.server
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 import httpx
 
-from nectarlite.api import Api
+from nectarlite.api import Api, AsyncApi, _remaining, deadline
+from nectarlite.cache import ResponseCache
+from nectarlite.exceptions import DeadlineExceeded, NodeError
+from nectarlite.metrics import MetricsRegistry
+from nectarlite.nodes import DEFAULT_BREAKERS, OPEN, BreakerRegistry, NodeScorer
+from nectarlite.retry import RetryPolicy
+
+
+def _response(body):
+    """Build a real ``httpx.Response`` carrying ``body`` as JSON."""
+    return httpx.Response(200, json=body, request=httpx.Request("POST", "https://x"))
+
+
+def _posted(content):
+    """Decode the JSON document a test double received as ``content``."""
+    return json.loads(content)
+
+
+def _batch_echo(url, content=None, **kwargs):
+    """Answer a batch payload, failing any item whose params contain ``-1``."""
+    items = []
+    for payload in reversed(_posted(content)):
+        if payload["params"] == [-1]:
+            items.append({"id": payload["id"], "error": {"message": "bad block"}})
+        else:
+            items.append({"id": payload["id"], "result": payload["params"][0]})
+    return _response(items)
 
 
 class TestApi(unittest.TestCase):
@@ -18,9 +55,7 @@ class TestApi(unittest.TestCase):
     @patch("httpx.Client.post")
     def test_successful_call(self, mock_post):
         """Test a successful API call."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"result": "success"}
+        mock_response = _response({"result": "success"})
         mock_post.return_value = mock_response
 
         result = self.api.call("condenser_api", "get_block", [1])
@@ -29,9 +64,7 @@ class TestApi(unittest.TestCase):
     @patch("httpx.Client.post")
     def test_failed_call(self, mock_post):
         """Test a failed API call."""
-        mock_response_success = MagicMock()
-        mock_response_success.status_code = 200
-        mock_response_success.json.return_value = {"result": "success"}
+        mock_response_success = _response({"result": "success"})
 
         mock_post.side_effect = [
             httpx.HTTPError("Connection error"),
@@ -44,9 +77,7 @@ class TestApi(unittest.TestCase):
     @patch("httpx.Client.post")
     def test_call_with_mapping_params(self, mock_post):
         """Ensure dict parameters are passed through unmodified."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"result": {"block": {}}}
+        mock_response = _response({"result": {"block": {}}})
         mock_post.return_value = mock_response
 
         params = {"block_num": 42}
@@ -54,9 +85,619 @@ class TestApi(unittest.TestCase):
 
         self.assertEqual(result, {"block": {}})
         mock_post.assert_called_once()
-        posted_payload = mock_post.call_args.kwargs["json"]
+        posted_payload = _posted(mock_post.call_args.kwargs["content"])
         self.assertEqual(posted_payload["params"], params)
 
+    @patch("httpx.Client.post")
+    def test_call_with_generator_params(self, mock_post):
+        """One-shot iterables are posted in full, also after a failover."""
+        mock_post.side_effect = [
+            httpx.ConnectError("down"),
+            _response({"result": [{"name": "alice"}]}),
+        ]
+        api = Api(self.nodes, breakers=BreakerRegistry())
+
+        result = api.call("condenser_api", "get_accounts", (n for n in ["alice"]))
+
+        self.assertEqual(result, [{"name": "alice"}])
+        for call in mock_post.call_args_list:
+            self.assertEqual(_posted(call.kwargs["content"])["params"], ["alice"])
+
+    @patch("httpx.Client.post")
+    def test_invalid_json_fails_over(self, mock_post):
+        """A body that is not JSON counts as a node failure."""
+        garbage = httpx.Response(
+            200, content=b"<html>", request=httpx.Request("POST", "https://x")
+        )
+        mock_post.side_effect = [garbage, _response({"result": "success"})]
+        api = Api(self.nodes, breakers=BreakerRegistry())
+
+        self.assertEqual(api.call("condenser_api", "get_block", [1]), "success")
+
+    @patch("httpx.Client.post")
+    def test_call_prefers_fastest_node(self, mock_post):
+        """Calls are routed to the node with the best latency score."""
+        mock_response = _response({"result": "success"})
+        mock_post.return_value = mock_response
+        scorer = NodeScorer(exploration=0.0)
+        scorer.record_success(self.nodes[0], 0.8)
+        scorer.record_success(self.nodes[1], 0.1)
+        api = Api(self.nodes, scorer=scorer)
+
+        api.call("condenser_api", "get_block", [1])
+
+        self.assertEqual(mock_post.call_args.args[0], self.nodes[1])
+
+    @patch("httpx.Client.post")
+    def test_lagging_node_is_demoted(self, mock_post):
+        """A fast node that reports a stale head is tried after fresh ones."""
+        heads = {self.nodes[0]: 100, self.nodes[1]: 500}
+
+        def post(url, content=None, **kwargs):
+            props = {"head_block_number": heads[url], "last_irreversible_block_num": 1}
+            return _response({"result": props})
+
+        mock_post.side_effect = post
+        scorer = NodeScorer(exploration=0.0)
+        api = Api(self.nodes, scorer=scorer, breakers=BreakerRegistry())
+        api.probe_nodes()
+        scorer.record_success(self.nodes[0], 0.01)
+        scorer.record_success(self.nodes[1], 0.5)
+
+        props = api.call("condenser_api", "get_dynamic_global_properties")
+
+        self.assertEqual(props["head_block_number"], 500)
+        self.assertGreater(api.node_heads()[self.nodes[0]]["lag"], 20)
+
+    @patch("httpx.Client.post")
+    def test_open_breaker_skips_node(self, mock_post):
+        """Nodes with an open circuit are not contacted."""
+        mock_post.side_effect = httpx.ConnectError("down")
+        api = Api(self.nodes, breakers=BreakerRegistry(failure_threshold=1))
+
+        with self.assertRaises(NodeError):
+            api.call("condenser_api", "get_block", [1])
+        self.assertEqual(api.breaker_states(), dict.fromkeys(self.nodes, OPEN))
+
+        mock_post.reset_mock()
+        with self.assertRaises(NodeError):
+            api.call("condenser_api", "get_block", [1])
+        mock_post.assert_not_called()
+
+    @patch("httpx.Client.post")
+    def test_final_error_is_not_retried(self, mock_post):
+        """Deterministic chain rejections are raised without failover."""
+        error = {"code": -32000, "message": "Assert Exception:false: Voting weight"}
+        mock_post.return_value = _response({"error": error})
+        api = Api(self.nodes, breakers=BreakerRegistry())
+
+        with self.assertRaises(NodeError) as ctx:
+            api.call("condenser_api", "broadcast_transaction", [{}])
+        self.assertEqual(ctx.exception.code, -32000)
+        mock_post.assert_called_once()
+
+    @patch("httpx.Client.post")
+    def test_retry_budget_stops_failover(self, mock_post):
+        """No further nodes are tried once the retry budget is spent."""
+        mock_post.side_effect = httpx.ConnectError("down")
+        api = Api(
+            self.nodes,
+            breakers=BreakerRegistry(),
+            retry=RetryPolicy(budget_ratio=0, budget_max=0),
+        )
+
+        with self.assertRaises(NodeError):
+            api.call("condenser_api", "get_block", [1])
+        mock_post.assert_called_once()
+
+    @patch("httpx.Client.post", side_effect=httpx.ConnectError("down"))
+    def test_unused_half_open_probe_is_not_claimed(self, mock_post):
+        """Stopping on max_attempts or the budget leaves the probe slot free."""
+        now = [0.0]
+        breakers = BreakerRegistry(
+            failure_threshold=1, cooldown=10, clock=lambda: now[0]
+        )
+        probed = breakers.get(self.nodes[1])
+        probed.record_failure()
+        now[0] = 10.0  # cooled down: the next request is a half-open probe
+
+        for retry in (
+            RetryPolicy(max_attempts=1),
+            RetryPolicy(budget_ratio=0, budget_max=0),
+        ):
+            scorer = NodeScorer(exploration=0.0)
+            scorer.record_success(self.nodes[0], 0.01)
+            scorer.record_success(self.nodes[1], 0.5)
+            api = Api(self.nodes, scorer=scorer, breakers=breakers, retry=retry)
+            with self.assertRaises(NodeError):
+                api.call("condenser_api", "get_block", [1])
+            breakers.get(self.nodes[0]).record_success()
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertTrue(probed.allow_request())
+
+    @patch("httpx.Client.post")
+    def test_metrics_record_failover_and_errors(self, mock_post):
+        """Metrics see each round trip, its error class and the failover."""
+        mock_post.side_effect = [
+            httpx.ConnectError("down"),
+            _response({"result": "success"}),
+        ]
+        scorer = NodeScorer(exploration=0.0)
+        api = Api(
+            self.nodes,
+            scorer=scorer,
+            breakers=BreakerRegistry(),
+            metrics=MetricsRegistry(),
+        )
+
+        api.call("condenser_api", "get_block", [1])
+
+        stats = api.metrics.snapshot()["methods"]["condenser_api.get_block"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["errors"], {"ConnectError": 1})
+        self.assertEqual(stats["failovers"], 1)
+        self.assertGreater(stats["request_bytes"], 0)
+
+    def test_pool_limits_scale_with_nodes(self):
+        """The connection cap is per node and keep-alive outlives a block."""
+        api = Api(self.nodes, max_connections_per_node=4, keepalive_expiry=15)
+        self.assertEqual(api.pool_limits.max_connections, 8)
+        self.assertEqual(api.pool_limits.keepalive_expiry, 15)
+        self.assertFalse(api.http2)
+
+    @patch("nectarlite.api.h2", None)
+    def test_http2_falls_back_without_h2(self):
+        """Requesting HTTP/2 without ``h2`` installed keeps HTTP/1.1."""
+        with self.assertLogs("nectarlite.api", "WARNING"):
+            api = Api(self.nodes, http2=True)
+        self.assertFalse(api.http2)
+
+    @patch("httpx.Client.post")
+    def test_warm_up_contacts_every_node(self, mock_post):
+        """Warm-up opens the requested connections and reports each node."""
+        props = {"head_block_number": 10, "last_irreversible_block_num": 1}
+
+        def post(url, content=None, **kwargs):
+            if url == self.nodes[1]:
+                raise httpx.ConnectError("down")
+            return _response({"result": props})
+
+        mock_post.side_effect = post
+        api = Api(self.nodes, breakers=BreakerRegistry())
+
+        status = api.warm_up(connections=2)
+
+        self.assertEqual(status, {self.nodes[0]: True, self.nodes[1]: False})
+        self.assertEqual(mock_post.call_count, 4)
+
+    def test_breakers_shared_with_async_api(self):
+        """Sync and async clients share breaker state by default."""
+        self.assertIs(self.api.breakers, DEFAULT_BREAKERS)
+        self.assertIs(AsyncApi(self.nodes).breakers, DEFAULT_BREAKERS)
+
+    @patch("httpx.Client.post")
+    def test_concurrent_identical_calls_are_coalesced(self, mock_post):
+        """Identical in-flight calls share a single HTTP request."""
+
+        def slow_post(url, content=None, **kwargs):
+            time.sleep(0.2)
+            return _response({"result": {"head_block_number": 5}})
+
+        mock_post.side_effect = slow_post
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(
+                    self.api.call, "condenser_api", "get_dynamic_global_properties"
+                )
+                for _ in range(4)
+            ]
+            results = [future.result() for future in futures]
+
+        self.assertEqual(results, [{"head_block_number": 5}] * 4)
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch("httpx.Client.post")
+    def test_coalesced_errors_reach_every_caller(self, mock_post):
+        """A failure of the shared request is raised in every waiter."""
+        mock_post.side_effect = httpx.ConnectError("down")
+        api = Api(self.nodes, breakers=BreakerRegistry())
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [
+                pool.submit(api.call, "condenser_api", "get_accounts", [["alice"]])
+                for _ in range(3)
+            ]
+            for future in futures:
+                with self.assertRaises(NodeError):
+                    future.result()
+
+    @patch("httpx.Client.post")
+    def test_cache_serves_repeated_reads(self, mock_post):
+        """Cached reads skip the network; broadcasts are never cached."""
+        mock_response = _response({"result": [{"name": "alice"}]})
+        mock_post.return_value = mock_response
+        api = Api(self.nodes, cache=ResponseCache())
+
+        for _ in range(3):
+            api.call("condenser_api", "get_accounts", [["alice"]])
+            api.call("condenser_api", "broadcast_transaction", [{}])
+
+        self.assertEqual(mock_post.call_count, 4)
+        self.assertEqual(api.cache_stats()["hits"], 2)
+
+    @patch("httpx.Client.post", side_effect=_batch_echo)
+    def test_call_batch_demultiplexes_in_order(self, mock_post):
+        """Batch results come back in request order with per-item errors."""
+        requests = [("condenser_api", "get_block", [n]) for n in (1, -1, 3)]
+        results = self.api.call_batch(requests)
+
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], NodeError)
+        self.assertEqual(results[2], 3)
+        payloads = _posted(mock_post.call_args.kwargs["content"])
+        self.assertEqual(len({p["id"] for p in payloads}), 3)
+
+    @patch("httpx.Client.post")
+    def test_timeout_caps_total_failover_time(self, mock_post):
+        """A call timeout bounds all attempts and shrinks each HTTP timeout."""
+
+        def slow_failure(url, content=None, timeout=None, **kwargs):
+            time.sleep(0.05)
+            raise httpx.ReadTimeout("slow")
+
+        mock_post.side_effect = slow_failure
+        nodes = [f"https://node{n}.example" for n in range(6)]
+        api = Api(nodes, breakers=BreakerRegistry())
+
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            api.call("condenser_api", "get_block", [1], timeout=0.12)
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.assertLess(mock_post.call_count, len(nodes))
+        self.assertLessEqual(mock_post.call_args.kwargs["timeout"], 0.12)
+
+    @patch("httpx.Client.post", side_effect=httpx.ReadTimeout("slow"))
+    def test_deadline_cut_attempt_leaves_breakers_closed(self, mock_post):
+        """A timeout caused by the caller's deadline is not the node's fault."""
+        scorer = NodeScorer()
+        api = Api(
+            self.nodes,
+            scorer=scorer,
+            breakers=BreakerRegistry(failure_threshold=1),
+        )
+
+        for _ in range(3):
+            with self.assertRaises(DeadlineExceeded):
+                api.call("condenser_api", "get_block", [1], timeout=0.05)
+
+        self.assertEqual(set(api.breaker_states().values()), {"closed"})
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(scorer.snapshot(), {})
+
+    def test_nested_deadline_never_extends(self):
+        """An inner deadline cannot outlive the enclosing one."""
+        self.assertIsNone(_remaining())
+        with deadline(0.5):
+            with deadline(10):
+                self.assertLessEqual(_remaining(), 0.5)
+            with deadline(None):
+                self.assertLessEqual(_remaining(), 0.5)
+
+    def test_stream_call_resumes_on_next_node(self):
+        """A body cut short mid-array fails over without repeating items."""
+        items = list(range(6))
+        body = json.dumps({"jsonrpc": "2.0", "result": {"blocks": items}, "id": 1})
+
+        def handler(request):
+            if request.url.host == "api.hive.blog":
+                return httpx.Response(200, content=body[:40].encode())
+            return httpx.Response(200, content=body.encode())
+
+        scorer = NodeScorer(exploration=0.0)
+        scorer.record_success(self.nodes[0], 0.01)
+        api = Api(
+            self.nodes,
+            scorer=scorer,
+            breakers=BreakerRegistry(),
+            transport=httpx.MockTransport(handler),
+        )
+        streamed = list(
+            api.stream_call(
+                "block_api",
+                "get_block_range",
+                {"starting_block_num": 1, "count": 6},
+                key="blocks",
+            )
+        )
+        self.assertEqual(streamed, items)
+
+    def test_compression_negotiated_per_node_and_wire_bytes_recorded(self):
+        """Compressed bodies are decoded and their wire size is reported."""
+        body = json.dumps({"jsonrpc": "2.0", "result": ["x" * 500], "id": 1})
+        seen = {}
+
+        def handler(request):
+            encoding = request.headers["accept-encoding"]
+            seen[request.url.host] = encoding
+            if "gzip" in encoding:
+                return httpx.Response(
+                    200,
+                    headers={"content-encoding": "gzip"},
+                    # An iterator is read by the client, like a network body.
+                    content=iter([gzip.compress(body.encode())]),
+                )
+            return httpx.Response(200, content=body.encode())
+
+        api = Api(
+            self.nodes,
+            breakers=BreakerRegistry(),
+            metrics=MetricsRegistry(),
+            compression={self.nodes[1]: False},
+            transport=httpx.MockTransport(handler),
+        )
+        for node in self.nodes:
+            self.assertEqual(api._post(node, {"method": "m"})["result"], ["x" * 500])
+
+        self.assertIn("gzip", seen["api.hive.blog"])
+        self.assertEqual(seen["api.syncad.com"], "identity")
+        nodes = api.metrics.snapshot()["nodes"]
+        compressed = nodes[self.nodes[0]]["m"]
+        self.assertEqual(compressed["response_bytes"], len(body))
+        self.assertLess(compressed["wire_bytes"], len(body))
+        plain = nodes[self.nodes[1]]["m"]
+        self.assertEqual(plain["wire_bytes"], plain["response_bytes"])
+
+        api.set_compression(self.nodes[0], False)
+        self.assertFalse(api.compression_enabled(self.nodes[0] + "/"))
+
+    def test_local_node_preferred_and_uncompressed(self):
+        """A loopback node is tried before remote ones without compression."""
+        seen = []
+
+        def handler(request):
+            seen.append((request.url.host, request.headers["accept-encoding"]))
+            return httpx.Response(200, json={"result": 1})
+
+        local = "http://127.0.0.1:8091"
+        scorer = NodeScorer(exploration=0.0)
+        scorer.record_success(self.nodes[0], 0.001)
+        api = Api(
+            self.nodes + [local],
+            scorer=scorer,
+            breakers=BreakerRegistry(),
+            transport=httpx.MockTransport(handler),
+        )
+        self.assertEqual(api.call("condenser_api", "get_config"), 1)
+        self.assertEqual(seen, [("127.0.0.1", "identity")])
+        self.assertEqual(api.local_nodes, [local])
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+    def test_unix_socket_node(self):
+        """``unix://`` nodes are reached through the socket."""
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                )
+                body = json.dumps({"id": request["id"], "result": "local"}).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+            def get_request(self):
+                request, _ = super().get_request()
+                # BaseHTTPRequestHandler expects a (host, port) client address.
+                return request, ("local", 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hived.sock")
+            server = Server(path, Handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            try:
+                with Api([self.nodes[0], f"unix://{path}"]) as api:
+                    result = api.call("condenser_api", "get_config")
+            finally:
+                server.shutdown()
+                server.server_close()
+        self.assertEqual(result, "local")
+
+    @patch("httpx.Client.post")
+    def test_session_pins_calls_and_fails_over_as_unit(self, mock_post):
+        """Session calls stay on one node and move together after a failure."""
+        mock_post.return_value = _response({"result": "ok"})
+        scorer = NodeScorer(exploration=0.0)
+        scorer.record_success(self.nodes[0], 0.01)
+        scorer.record_success(self.nodes[1], 0.5)
+        api = Api(self.nodes, scorer=scorer, breakers=BreakerRegistry())
+
+        with api.session() as session:
+            self.assertEqual(session.node, self.nodes[0])
+            session.call("condenser_api", "get_dynamic_global_properties")
+            scorer.record_success(self.nodes[1], 0.0001)
+            scorer.record_success(self.nodes[1], 0.0001)
+            session.call("condenser_api", "get_transaction_hex", [{}])
+            self.assertEqual(mock_post.call_args.args[0], self.nodes[0])
+
+            mock_post.side_effect = [
+                httpx.ConnectError("down"),
+                _response({"result": "ok"}),
+                _response({"result": "ok"}),
+            ]
+            session.call("condenser_api", "get_block", [1])
+            session.call("condenser_api", "broadcast_transaction", [{}])
+        self.assertEqual(session.node, self.nodes[1])
+        self.assertEqual(mock_post.call_args.args[0], self.nodes[1])
+
+    @patch("httpx.Client.post")
+    def test_call_many_spreads_and_keeps_order(self, mock_post):
+        """Concurrent calls keep input order, spread over nodes, return errors."""
+
+        def post(url, content=None, **kwargs):
+            params = _posted(content)["params"]
+            if params == [-1]:
+                return _response({"error": {"code": -32602, "message": "bad"}})
+            time.sleep(0.01)
+            return _response({"result": params[0]})
+
+        mock_post.side_effect = post
+        api = Api(self.nodes, breakers=BreakerRegistry())
+        results = api.call_many(
+            [("condenser_api", "get_block", [n]) for n in (1, 2, -1, 4)],
+            max_workers=4,
+        )
+
+        self.assertEqual(results[:2] + results[3:], [1, 2, 4])
+        self.assertIsInstance(results[2], NodeError)
+        used = {call.args[0] for call in mock_post.call_args_list}
+        self.assertEqual(used, set(self.nodes))
+
+    @patch("httpx.Client.post", side_effect=_batch_echo)
+    def test_call_batch_chunks_per_node(self, mock_post):
+        """Batches are split according to the configured per-node size."""
+        api = Api(self.nodes, batch_sizes={self.nodes[0]: 2, self.nodes[1]: 2})
+        results = api.call_batch(
+            [("condenser_api", "get_block", [n]) for n in range(5)]
+        )
+
+        self.assertEqual(results, [0, 1, 2, 3, 4])
+        self.assertEqual(mock_post.call_count, 3)
+
+
+class TestAsyncApi(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the AsyncApi class."""
+
+    async def test_call_batch(self):
+        async def fake_post(url, content=None, **kwargs):
+            return _batch_echo(url, content=content)
+
+        api = AsyncApi(["https://api.hive.blog"], max_batch_size=2)
+        with patch.object(api._client, "post", side_effect=fake_post) as mock_post:
+            results = await api.call_batch(
+                [("condenser_api", "get_block", [n]) for n in (7, 8, 9)]
+            )
+        self.assertEqual(results, [7, 8, 9])
+        self.assertEqual(mock_post.call_count, 2)
+        await api.aclose()
+
+    async def test_call_with_generator_params(self):
+        posted = []
+
+        async def fake_post(url, content=None, **kwargs):
+            posted.append(_posted(content)["params"])
+            return _response({"result": "ok"})
+
+        api = AsyncApi(["https://api.hive.blog"])
+        with patch.object(api._client, "post", side_effect=fake_post):
+            await api.call("condenser_api", "get_accounts", iter(["alice"]))
+        self.assertEqual(posted, [["alice"]])
+        await api.aclose()
+
+    def _hedging_api(self, **kwargs):
+        scorer = NodeScorer(exploration=0.0)
+        scorer.record_success("https://slow.example", 0.01)
+        scorer.record_success("https://fast.example", 0.02)
+        return AsyncApi(
+            ["https://slow.example", "https://fast.example"],
+            scorer=scorer,
+            breakers=BreakerRegistry(),
+            hedge=True,
+            hedge_delay=0.01,
+            **kwargs,
+        )
+
+    async def _fake_post(self, url, content=None, **kwargs):
+        if url == "https://slow.example":
+            await asyncio.sleep(5)
+        return _response({"id": _posted(content)["id"], "result": url})
+
+    async def test_hedged_call_returns_fastest_answer(self):
+        api = self._hedging_api()
+        with patch.object(api._client, "post", side_effect=self._fake_post):
+            result = await asyncio.wait_for(
+                api.call("condenser_api", "get_dynamic_global_properties"), 1
+            )
+        self.assertEqual(result, "https://fast.example")
+        await api.aclose()
+
+    async def test_hedged_call_respects_retry_policy(self):
+        async def down(url, content=None, **kwargs):
+            raise httpx.ConnectError("down")
+
+        for retry, posts in (
+            (RetryPolicy(max_attempts=1), 1),
+            (RetryPolicy(budget_ratio=0, budget_max=0), 1),
+            (RetryPolicy(), 2),
+        ):
+            api = self._hedging_api(retry=retry)
+            with patch.object(api._client, "post", side_effect=down) as mock_post:
+                with self.assertRaises(NodeError):
+                    await api.call("condenser_api", "get_dynamic_global_properties")
+            self.assertEqual(mock_post.call_count, posts)
+            await api.aclose()
+
+    async def test_concurrent_identical_calls_are_coalesced(self):
+        async def slow_post(url, content=None, **kwargs):
+            await asyncio.sleep(0.01)
+            return _response({"id": _posted(content)["id"], "result": ["alice"]})
+
+        api = AsyncApi(["https://api.hive.blog"], breakers=BreakerRegistry())
+        with patch.object(api._client, "post", side_effect=slow_post) as mock_post:
+            results = await asyncio.gather(
+                *(
+                    api.call("condenser_api", "get_accounts", [["alice"]])
+                    for _ in range(5)
+                )
+            )
+        self.assertEqual(results, [["alice"]] * 5)
+        self.assertEqual(mock_post.call_count, 1)
+        await api.aclose()
+
+    async def test_timeout_bounds_async_call(self):
+        async def hang(url, content=None, **kwargs):
+            await asyncio.sleep(5)
+
+        api = AsyncApi(["https://api.hive.blog"], breakers=BreakerRegistry())
+        with patch.object(api._client, "post", side_effect=hang):
+            with self.assertRaises(DeadlineExceeded):
+                await api.call("condenser_api", "get_accounts", [["a"]], timeout=0.05)
+        await api.aclose()
+
+    async def test_stream_call(self):
+        def handler(request):
+            result = [[n, {"op": n}] for n in range(3)]
+            return httpx.Response(200, json={"jsonrpc": "2.0", "result": result})
+
+        async with AsyncApi(
+            ["https://api.hive.blog"],
+            breakers=BreakerRegistry(),
+            transport=httpx.MockTransport(handler),
+        ) as api:
+            items = [
+                item
+                async for item in api.stream_call(
+                    "condenser_api", "get_account_history", ["alice", -1, 3]
+                )
+            ]
+        self.assertEqual([index for index, _ in items], [0, 1, 2])
+
+    async def test_broadcast_is_never_hedged(self):
+        api = self._hedging_api()
+        self.assertFalse(
+            api._should_hedge("condenser_api", "broadcast_transaction_synchronous")
+        )
+        api = self._hedging_api(hedge_exclude=["condenser_api.get_block"])
+        self.assertFalse(api._should_hedge("condenser_api", "get_block"))
+        self.assertTrue(api._should_hedge("condenser_api", "get_accounts"))
+        await api.aclose()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,7 +4,8 @@ from unittest.mock import Mock
 import pytest
 
 from nectarlite.api import Api
-from nectarlite.stream import AsyncStream
+from nectarlite.checkpoint import CheckpointStore
+from nectarlite.stream import AsyncBlockListener, AsyncStream, BlockScheduler
 
 
 @pytest.fixture
@@ -82,3 +83,98 @@ async def test_async_stream_on_filter(async_mock_api_factory):
 
     assert len(collected) == 1
     assert collected[0].sender == "a"
+
+
+@pytest.mark.asyncio
+async def test_async_catch_up_prefetches_in_order():
+    api = Mock(spec=Api)
+
+    def call_side_effect(api_name, method, params=None):
+        if method == "get_dynamic_global_properties":
+            return {"last_irreversible_block_num": 100}
+        first, count = params["starting_block_num"], params["count"]
+        return {
+            "blocks": [
+                {"block_id": n, "transactions": []} for n in range(first, first + count)
+            ]
+        }
+
+    api.call.side_effect = call_side_effect
+    listener = AsyncStream(api=api, start_block=1, end_block=50, prefetch=8)
+
+    collected = [block.block_num async for block in listener.stream_blocks()]
+
+    assert collected == list(range(1, 51))
+    assert {c.args[1] for c in api.call.call_args_list} == {
+        "get_dynamic_global_properties",
+        "get_block_range",
+    }
+    dgp_calls = [
+        c
+        for c in api.call.call_args_list
+        if c.args[1] == "get_dynamic_global_properties"
+    ]
+    assert len(dgp_calls) < 10
+
+
+@pytest.mark.asyncio
+async def test_async_single_block_not_yet_available_is_retried():
+    api = Mock(spec=Api)
+    missing = {6}
+
+    def call_side_effect(api_name, method, params=None):
+        if method == "get_dynamic_global_properties":
+            return {"last_irreversible_block_num": 10}
+        if params[0] in missing:
+            missing.discard(params[0])
+            return None
+        return {"block_id": params[0], "transactions": []}
+
+    api.call.side_effect = call_side_effect
+    listener = AsyncBlockListener(
+        api, start_block=5, end_block=9, scheduler=BlockScheduler(error_backoff=0)
+    )
+
+    collected = [block.block_num async for block in listener.stream_blocks()]
+
+    assert collected == [5, 6, 7, 8, 9]
+
+
+def test_async_stream_passes_listener_options():
+    scheduler = BlockScheduler(wake_margin=0.5)
+    stream = AsyncStream(
+        api=Mock(spec=Api),
+        catch_up_threshold=20,
+        range_size=7,
+        scheduler=scheduler,
+    )
+    assert stream.block_listener.catch_up_threshold == 20
+    assert stream.block_listener.range_size == 7
+    assert stream.block_listener.scheduler is scheduler
+
+
+@pytest.mark.asyncio
+async def test_async_rpcs_per_block(async_mock_api_factory):
+    mock_api = async_mock_api_factory()
+    listener = AsyncStream(api=mock_api, start_block=1, end_block=2)
+
+    collected = [block async for block in listener.stream_blocks()]
+
+    block_listener = listener.block_listener
+    assert block_listener.block_count == len(collected) == 2
+    assert block_listener.rpc_count == mock_api.call.call_count
+    assert block_listener.rpcs_per_block == block_listener.rpc_count / 2
+
+
+@pytest.mark.asyncio
+async def test_async_stream_saves_checkpoint(async_mock_api_factory):
+    store = CheckpointStore()
+    store.save(0)
+    listener = AsyncStream(
+        api=async_mock_api_factory(), start_block=5, end_block=2, checkpoint=store
+    )
+
+    collected = [block.block_num async for block in listener.stream_blocks()]
+
+    assert collected == [1, 2]
+    assert store.load() == 2
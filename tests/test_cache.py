@@ -0,0 +1,71 @@
+"""Unit tests for the ResponseCache class."""
+
+import unittest
+
+from nectarlite.cache import ResponseCache, request_key
+
+
+class TestResponseCache(unittest.TestCase):
+    """Unit tests for the ResponseCache class."""
+
+    def setUp(self):
+        self.now = [0.0]
+        self.cache = ResponseCache(ttl=30.0, clock=lambda: self.now[0])
+
+    def _put(self, api, method, params, result):
+        key = request_key(api, method, params)
+        self.cache.put(key, params, result)
+        return key
+
+    def test_global_properties_expire_after_one_block(self):
+        key = self._put(
+            "condenser_api",
+            "get_dynamic_global_properties",
+            [],
+            {"head_block_number": 10, "last_irreversible_block_num": 5},
+        )
+        self.assertEqual(self.cache.get(key)[0], True)
+        self.now[0] = 3.0
+        self.assertEqual(self.cache.get(key), (False, None))
+        self.assertEqual(self.cache.last_irreversible_block, 5)
+
+    def test_blocks_cached_only_once_irreversible(self):
+        self.cache.observe_irreversible(100)
+        old = self._put("condenser_api", "get_block", [100], {"previous": "a"})
+        new = self._put("block_api", "get_block", {"block_num": 101}, {"block": {}})
+        self.now[0] = 1e9
+        self.assertEqual(self.cache.get(old), (True, {"previous": "a"}))
+        self.assertFalse(self.cache.get(new)[0])
+
+    def test_accounts_use_configured_ttl(self):
+        key = self._put("condenser_api", "get_accounts", [["alice"]], [{"a": 1}])
+        self.now[0] = 29.0
+        self.assertTrue(self.cache.get(key)[0])
+        self.now[0] = 31.0
+        self.assertFalse(self.cache.get(key)[0])
+
+    def test_unknown_methods_are_not_cached(self):
+        key = self._put("condenser_api", "get_feed_history", [], {"a": 1})
+        self.assertFalse(self.cache.get(key)[0])
+        self.cache.ttls["condenser_api.get_feed_history"] = 60.0
+        self._put("condenser_api", "get_feed_history", [], {"a": 1})
+        self.assertTrue(self.cache.get(key)[0])
+
+    def test_lru_eviction_by_bytes(self):
+        cache = ResponseCache(max_bytes=50)
+        cache.observe_irreversible(10)
+        keys = []
+        for num in range(3):
+            key = request_key("condenser_api", "get_block", [num])
+            cache.put(key, [num], {"data": "x" * 10})
+            keys.append(key)
+        self.assertFalse(cache.get(keys[0])[0])
+        self.assertTrue(cache.get(keys[2])[0])
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Unit tests for cassette recording and replay."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import httpx
+
+from nectarlite.api import Api, AsyncApi
+from nectarlite.cassette import RecordingTransport, ReplayTransport
+from nectarlite.exceptions import CassetteError, NodeError
+from nectarlite.haf import HAF
+from nectarlite.nodes import BreakerRegistry
+
+NODE = "https://api.hive.blog"
+
+
+def _node(request):
+    """Answer JSON-RPC calls with their params and HAF GETs with a reputation."""
+    if request.method == "GET":
+        return httpx.Response(200, json={"account": "alice", "reputation": 70})
+    document = json.loads(request.content)
+    items = document if isinstance(document, list) else [document]
+    answers = [{"jsonrpc": "2.0", "id": p["id"], "result": p["params"]} for p in items]
+    return httpx.Response(
+        200, json=answers if isinstance(document, list) else answers[0]
+    )
+
+
+class TestCassette(unittest.TestCase):
+    """Round-trip tests for RecordingTransport and ReplayTransport."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".jsonl.gz")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def _record(self):
+        transport = RecordingTransport(self.path, transport=httpx.MockTransport(_node))
+        with Api(NODE, breakers=BreakerRegistry(), transport=transport) as api:
+            api.call("condenser_api", "get_block", [1])
+            api.call_batch([("condenser_api", "get_block", [n]) for n in (2, 3)])
+        HAF(NODE, transport=transport).reputation("alice")
+        transport.close()
+        return transport
+
+    def test_replay_serves_recorded_exchanges(self):
+        self.assertEqual(self._record().recorded, 3)
+
+        replay = ReplayTransport(self.path)
+        api = Api(NODE, breakers=BreakerRegistry(), transport=replay)
+        api._request_ids = iter(range(100, 200))  # ids differ from the recording
+        self.assertEqual(api.call("condenser_api", "get_block", [1]), [1])
+        self.assertEqual(
+            api.call_batch([("condenser_api", "get_block", [n]) for n in (2, 3)]),
+            [[2], [3]],
+        )
+        self.assertEqual(
+            HAF(NODE, transport=replay).reputation("alice")["reputation"], 70
+        )
+        with self.assertRaises(CassetteError):
+            api.call("condenser_api", "get_block", [4])
+
+    def test_transport_errors_are_replayed(self):
+        def down(request):
+            raise httpx.ConnectError("down", request=request)
+
+        transport = RecordingTransport(self.path, transport=httpx.MockTransport(down))
+        api = Api(NODE, breakers=BreakerRegistry(), transport=transport)
+        with self.assertRaises(NodeError):
+            api.call("condenser_api", "get_block", [1])
+        transport.close()
+
+        replay = ReplayTransport(self.path)
+        api = Api(NODE, breakers=BreakerRegistry(), transport=replay)
+        with self.assertLogs("nectarlite.api", "ERROR") as logs:
+            with self.assertRaises(NodeError):
+                api.call("condenser_api", "get_block", [1])
+        self.assertIn("down", logs.output[0])
+
+
+class TestAsyncCassette(unittest.IsolatedAsyncioTestCase):
+    """Replay through AsyncApi."""
+
+    async def test_async_round_trip(self):
+        handle, path = tempfile.mkstemp(suffix=".jsonl.gz")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        transport = RecordingTransport(path, async_transport=httpx.MockTransport(_node))
+        async with AsyncApi(
+            NODE, breakers=BreakerRegistry(), transport=transport
+        ) as api:
+            await api.call("condenser_api", "get_accounts", [["alice"]])
+
+        async with AsyncApi(
+            NODE, breakers=BreakerRegistry(), transport=ReplayTransport(path, speed=100)
+        ) as api:
+            result = await api.call("condenser_api", "get_accounts", [["alice"]])
+        self.assertEqual(result, [["alice"]])
@@ -0,0 +1,60 @@
+"""Unit tests for stream checkpoint stores."""
+
+import os
+import tempfile
+import unittest
+
+from nectarlite.checkpoint import (
+    CheckpointStore,
+    FileCheckpointStore,
+    open_checkpoint,
+)
+
+
+class TestFileCheckpointStore(unittest.TestCase):
+    """Unit tests for the FileCheckpointStore class."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "stream.checkpoint")
+
+    def test_writes_are_batched_by_count(self):
+        store = FileCheckpointStore(self.path, flush_every=3, flush_interval=None)
+        self.assertIsNone(store.load())
+        store.save(10)
+        store.save(11)
+        self.assertFalse(os.path.exists(self.path))
+        store.save(12)
+        self.assertEqual(FileCheckpointStore(self.path).load(), 12)
+        store.save(13)
+        store.close()
+        self.assertEqual(FileCheckpointStore(self.path).load(), 13)
+        self.assertEqual(os.listdir(self._tmp.name), ["stream.checkpoint"])
+
+    def test_writes_are_batched_by_interval(self):
+        now = [0.0]
+        store = FileCheckpointStore(
+            self.path, flush_every=1000, flush_interval=5.0, clock=lambda: now[0]
+        )
+        store.save(1)
+        self.assertFalse(os.path.exists(self.path))
+        now[0] = 5.0
+        store.save(2)
+        self.assertEqual(FileCheckpointStore(self.path).load(), 2)
+
+    def test_unreadable_checkpoint_is_ignored(self):
+        with open(self.path, "w", encoding="utf-8") as fh:
+            fh.write("{not json")
+        with self.assertLogs("nectarlite.checkpoint", "WARNING"):
+            self.assertIsNone(FileCheckpointStore(self.path).load())
+
+    def test_open_checkpoint(self):
+        store = CheckpointStore()
+        self.assertIs(open_checkpoint(store), store)
+        self.assertIsNone(open_checkpoint(None))
+        self.assertIsInstance(open_checkpoint(self.path), FileCheckpointStore)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""Unit tests for the JSON codecs."""
+
+import unittest
+
+from nectarlite.codec import JsonCodec, available_codecs, get_codec
+
+
+class TestCodecs(unittest.TestCase):
+    """Unit tests for the pluggable JSON codecs."""
+
+    def test_round_trip_every_installed_codec(self):
+        document = {"jsonrpc": "2.0", "result": {"ops": [["vote", {"weight": -1}]]}}
+        for name in available_codecs():
+            codec = get_codec(name)
+            encoded = codec.dumps(document)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(codec.loads(encoded), document)
+
+    def test_out_of_range_integers_fall_back(self):
+        big = {"value": 2**70}
+        for name in available_codecs():
+            codec = get_codec(name)
+            self.assertEqual(codec.loads(codec.dumps(big)), big)
+
+    def test_invalid_json_raises_value_error(self):
+        for name in available_codecs():
+            with self.assertRaises(ValueError):
+                get_codec(name).loads(b"{not json")
+
+    def test_default_prefers_fastest(self):
+        self.assertEqual(get_codec().name, next(iter(available_codecs())))
+        self.assertIsInstance(get_codec("json"), JsonCodec)
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,10 +14,7 @@ def _setup_client_mock(mock_client_cls):
 def test_haf_reputation_dict_response(mock_client_cls):
     mock_client = _setup_client_mock(mock_client_cls)
     mock_response = MagicMock()
-    mock_response.json.return_value = {
-        "reputation": 75,
-        "account": "testaccount",
-    }
+    mock_response.content = b'{"reputation": 75, "account": "testaccount"}'
     mock_response.raise_for_status.return_value = None
     mock_client.request.return_value = mock_response
 
@@ -38,7 +35,7 @@ def test_haf_reputation_dict_response(mock_client_cls):
 def test_haf_reputation_int_response(mock_client_cls):
     mock_client = _setup_client_mock(mock_client_cls)
     mock_response = MagicMock()
-    mock_response.json.return_value = 75
+    mock_response.content = b"75"
     mock_response.raise_for_status.return_value = None
     mock_client.request.return_value = mock_response
 
@@ -59,7 +56,7 @@ def test_haf_reputation_int_response(mock_client_cls):
 def test_haf_account_balances(mock_client_cls):
     mock_client = _setup_client_mock(mock_client_cls)
     mock_response = MagicMock()
-    mock_response.json.return_value = {"balance": "1.000 HIVE"}
+    mock_response.content = b'{"balance": "1.000 HIVE"}'
     mock_response.raise_for_status.return_value = None
     mock_client.request.return_value = mock_response
 
@@ -73,3 +70,18 @@ def test_haf_account_balances(mock_client_cls):
         "https://api.hive.blog/balance-api/accounts/testaccount/balances",
         headers={"accept": "application/json", "User-Agent": "nectarlite/0.0.1"},
     )
+
+
+@patch("httpx.Client")
+def test_haf_compression_disabled(mock_client_cls):
+    mock_client = _setup_client_mock(mock_client_cls)
+    mock_response = MagicMock()
+    mock_response.content = b"75"
+    mock_response.raise_for_status.return_value = None
+    mock_client.request.return_value = mock_response
+
+    HAF(compression=False).reputation("testaccount")
+
+    mock_client_cls.assert_called_once_with(
+        timeout=30.0, headers={"Accept-Encoding": "identity"}
+    )
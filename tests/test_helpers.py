@@ -10,10 +10,13 @@ from nectarlite.helpers import (
     RewardFunds,
     get_account_history,
     get_block,
+    get_blocks,
     get_market_ticker,
     get_ops_in_block,
     get_ranked_posts,
     get_rc_accounts,
+    iter_account_history,
+    iter_block_range,
 )
 
 
@@ -73,6 +76,64 @@ class TestHelpers(unittest.TestCase):
         self.assertEqual(block, {"transactions": []})
         self.api.call.assert_called_with("block_api", "get_block", {"block_num": 42})
 
+    def test_get_blocks_normalizes_appbase_blocks(self):
+        transfer = {
+            "type": "transfer_operation",
+            "value": {
+                "from": "alice",
+                "to": "bob",
+                "amount": {"amount": "1500", "precision": 3, "nai": "@@000000021"},
+                "memo": "",
+            },
+        }
+        self.api.call.return_value = {
+            "blocks": [
+                {
+                    "block_id": "0000002a",
+                    "transaction_ids": ["abc"],
+                    "transactions": [{"operations": [transfer]}],
+                }
+            ]
+        }
+        blocks = get_blocks(self.api, 42, 5)
+        self.assertEqual(len(blocks), 1)
+        trx = blocks[0]["transactions"][0]
+        self.assertEqual(trx["transaction_id"], "abc")
+        self.assertEqual(trx["block_num"], 42)
+        self.assertEqual(
+            trx["operations"],
+            [
+                [
+                    "transfer",
+                    {"from": "alice", "to": "bob", "amount": "1.500 HIVE", "memo": ""},
+                ]
+            ],
+        )
+        self.api.call.assert_called_once_with(
+            "block_api", "get_block_range", {"starting_block_num": 42, "count": 5}
+        )
+
+    def test_get_blocks_falls_back_to_condenser(self):
+        def call(api, method, params=None):
+            if method == "get_block_range":
+                raise NodeError("Could not find API block_api")
+            return {"block_id": params[0]} if params[0] < 12 else None
+
+        self.api.call.side_effect = call
+        blocks = get_blocks(self.api, 10, 5)
+        self.assertEqual(blocks, [{"block_id": 10}, {"block_id": 11}])
+
+        # The missing range API is remembered for this client.
+        self.api.call.reset_mock()
+        self.assertEqual(get_blocks(self.api, 10, 1), [{"block_id": 10}])
+        self.api.call.assert_called_once_with("condenser_api", "get_block", [10])
+
+    def test_get_blocks_raises_other_range_errors(self):
+        self.api.call.side_effect = NodeError("Unable to acquire database lock")
+        with self.assertRaises(NodeError):
+            get_blocks(self.api, 10, 5)
+        self.api.call.assert_called_once()
+
     def test_get_ops_in_block(self):
         self.api.call.return_value = [{"op": "vote"}]
         ops = get_ops_in_block(self.api, 123)
@@ -84,6 +145,19 @@ class TestHelpers(unittest.TestCase):
         result = get_account_history(self.api, "alice")
         self.assertEqual(result, history)
 
+    def test_iter_account_history_streams(self):
+        history = [[0, {"op": "vote"}], [1, {"op": "transfer"}]]
+        self.api.stream_call.return_value = iter(history)
+        self.assertEqual(list(iter_account_history(self.api, "alice")), history)
+        self.api.stream_call.assert_called_once_with(
+            "condenser_api", "get_account_history", ["alice", -1, 1000]
+        )
+
+    def test_iter_block_range_wraps_errors(self):
+        self.api.stream_call.side_effect = RuntimeError("boom")
+        with self.assertRaises(NodeError):
+            list(iter_block_range(self.api, 1, 10))
+
     def test_get_rc_accounts(self):
         rc_info = {"rc_accounts": [{"account": "alice"}]}
         self.api.call.return_value = rc_info
@@ -0,0 +1,44 @@
+"""Unit tests for incremental JSON-RPC result parsing."""
+
+import json
+import unittest
+
+from nectarlite.exceptions import NodeError
+from nectarlite.jsonstream import ResultItemParser, iter_result_items
+
+
+def _chunks(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestResultItemParser(unittest.TestCase):
+    """Unit tests for ResultItemParser."""
+
+    def test_items_across_chunk_boundaries(self):
+        blocks = [{"n": n, "memo": 'é"\\x' * n, "big": 2**70} for n in range(20)]
+        body = json.dumps(
+            {"jsonrpc": "2.0", "result": {"blocks": blocks}, "id": 1},
+            ensure_ascii=False,
+        ).encode()
+        for size in (1, 7, 64, len(body)):
+            self.assertEqual(
+                list(iter_result_items(_chunks(body, size), "blocks")), blocks
+            )
+
+    def test_items_are_returned_before_the_body_ends(self):
+        parser = ResultItemParser()
+        self.assertEqual(
+            parser.feed(b'{"jsonrpc":"2.0","result":[[1,{"a":1}],'), [[1, {"a": 1}]]
+        )
+        self.assertEqual(parser.feed(b'[2,{"a":2}]]'), [[2, {"a": 2}]])
+        self.assertEqual(parser.close(), [])
+
+    def test_errors(self):
+        body = b'{"jsonrpc":"2.0","error":{"code":-32602,"message":"bad"},"id":1}'
+        with self.assertRaises(NodeError) as ctx:
+            list(iter_result_items([body]))
+        self.assertEqual(ctx.exception.code, -32602)
+        with self.assertRaises(ValueError):
+            list(iter_result_items([b'{"result":{"blocks":5}}'], "blocks"))
+        with self.assertRaises(ValueError):
+            list(iter_result_items([b'{"result":[1,2'], None))
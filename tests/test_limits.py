@@ -0,0 +1,121 @@
+"""Unit tests for request limiting."""
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from nectarlite.limits import RequestLimiter, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Unit tests for the TokenBucket class."""
+
+    def test_reservations_queue_in_order(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0])
+        waits = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(waits, [0.0, 0.0, 0.5, 1.0])
+        now[0] = 10.0
+        self.assertEqual(bucket.reserve(), 0.0)
+
+
+class TestRequestLimiter(unittest.TestCase):
+    """Unit tests for the RequestLimiter class."""
+
+    def test_per_node_concurrency_cap(self):
+        limiter = RequestLimiter(per_node_concurrency=2)
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def request():
+            with limiter.slot("https://a.example"):
+                with lock:
+                    active["now"] += 1
+                    active["peak"] = max(active["peak"], active["now"])
+                time.sleep(0.02)
+                with lock:
+                    active["now"] -= 1
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            for future in [pool.submit(request) for _ in range(6)]:
+                future.result()
+
+        self.assertEqual(active["peak"], 2)
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+    def test_queue_depth_is_reported(self):
+        limiter = RequestLimiter(max_concurrency=1)
+        release = threading.Event()
+
+        def hold():
+            with limiter.slot("https://a.example"):
+                release.wait(1)
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(hold) for _ in range(3)]
+            deadline = time.monotonic() + 1
+            while limiter.queue_depth < 2 and time.monotonic() < deadline:
+                time.sleep(0.005)
+            self.assertEqual(limiter.queue_depth, 2)
+            release.set()
+            for future in futures:
+                future.result()
+        self.assertEqual(limiter.queue_depth, 0)
+
+
+class TestAsyncRequestLimiter(unittest.IsolatedAsyncioTestCase):
+    """Async tests for the RequestLimiter class."""
+
+    async def test_global_concurrency_cap(self):
+        limiter = RequestLimiter(max_concurrency=3)
+        active = {"now": 0, "peak": 0}
+
+        async def request(node):
+            async with limiter.async_slot(node):
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+                await asyncio.sleep(0.01)
+                active["now"] -= 1
+
+        await asyncio.gather(*(request(f"https://{n % 2}.example") for n in range(10)))
+        self.assertEqual(active["peak"], 3)
+
+
+class TestLimiterAcrossEventLoops(unittest.TestCase):
+    """A limiter is not bound to the event loop that first used it."""
+
+    def test_limiter_survives_a_second_event_loop(self):
+        limiter = RequestLimiter(max_concurrency=1, per_node_concurrency=1)
+
+        async def burst():
+            async def request():
+                async with limiter.async_slot("https://a.example"):
+                    await asyncio.sleep(0.005)
+
+            await asyncio.gather(*(request() for _ in range(3)))
+
+        asyncio.run(burst())
+        asyncio.run(burst())
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+    def test_cancelled_waiter_gives_up_its_turn(self):
+        limiter = RequestLimiter(max_concurrency=1)
+
+        async def request():
+            async with limiter.async_slot("https://a.example"):
+                pass
+
+        async def scenario():
+            async with limiter.async_slot("https://a.example"):
+                waiter = asyncio.ensure_future(request())
+                await asyncio.sleep(0)
+                waiter.cancel()
+            await request()
+
+        asyncio.run(asyncio.wait_for(scenario(), 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
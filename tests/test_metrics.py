@@ -0,0 +1,40 @@
+"""Unit tests for RPC metrics."""
+
+import unittest
+
+from nectarlite.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Unit tests for the MetricsRegistry class."""
+
+    def test_snapshot_aggregates_per_node_and_method(self):
+        metrics = MetricsRegistry(buckets=(0.1, 1.0))
+        metrics.record_request("https://a", "condenser_api.get_block", 0.05, 80, 900)
+        metrics.record_request("https://b", "condenser_api.get_block", 0.5, 80, 0, "X")
+        metrics.record_failover("https://b", "condenser_api.get_block")
+
+        snapshot = metrics.snapshot()
+        node_a = snapshot["nodes"]["https://a"]["condenser_api.get_block"]
+        self.assertEqual(node_a["response_bytes"], 900)
+        self.assertEqual(node_a["wire_bytes"], 900)
+        total = snapshot["methods"]["condenser_api.get_block"]
+        self.assertEqual(total["calls"], 2)
+        self.assertEqual(total["errors"], {"X": 1})
+        self.assertEqual(total["failovers"], 1)
+        self.assertEqual(total["latency"]["buckets"], {"0.1": 1, "1.0": 2, "inf": 2})
+
+    def test_callback_receives_events_and_errors_are_ignored(self):
+        events = []
+
+        def callback(event, data):
+            events.append((event, data["node"]))
+            raise RuntimeError("exporter down")
+
+        metrics = MetricsRegistry(callback=callback)
+        with self.assertLogs("nectarlite.metrics", "ERROR"):
+            metrics.record_request("https://a", "batch", 0.2, 10, 10)
+            metrics.record_hedge("https://b", "batch")
+        self.assertEqual(events, [("request", "https://a"), ("hedge", "https://b")])
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {"nodes": {}, "methods": {}})
@@ -0,0 +1,130 @@
+"""Unit tests for node selection helpers."""
+
+import random
+import unittest
+
+from nectarlite.nodes import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerRegistry,
+    CircuitBreaker,
+    HeadTracker,
+    NodeScorer,
+)
+
+
+class TestNodeScorer(unittest.TestCase):
+    """Unit tests for the NodeScorer class."""
+
+    def setUp(self):
+        self.nodes = ["https://a.example", "https://b.example", "https://c.example"]
+        self.scorer = NodeScorer(exploration=0.0)
+
+    def test_unmeasured_nodes_rank_first(self):
+        self.scorer.record_success(self.nodes[0], 0.1)
+        self.assertEqual(self.scorer.ranked(self.nodes)[-1], self.nodes[0])
+
+    def test_prefers_lowest_latency(self):
+        for node, latency in zip(self.nodes, (0.5, 0.1, 0.3)):
+            self.scorer.record_success(node, latency)
+        self.assertEqual(
+            self.scorer.ranked(self.nodes),
+            ["https://b.example", "https://c.example", "https://a.example"],
+        )
+
+    def test_errors_demote_fast_node(self):
+        self.scorer.record_success(self.nodes[0], 0.05)
+        self.scorer.record_success(self.nodes[1], 0.2)
+        self.scorer.record_failure(self.nodes[0], 0.01)
+        self.assertEqual(self.scorer.ranked(self.nodes[:2])[0], self.nodes[1])
+
+    def test_exploration_moves_other_node_first(self):
+        scorer = NodeScorer(exploration=1.0, rng=random.Random(1))
+        for node, latency in zip(self.nodes, (0.1, 0.2, 0.3)):
+            scorer.record_success(node, latency)
+        self.assertNotEqual(scorer.ranked(self.nodes)[0], self.nodes[0])
+
+    def test_snapshot(self):
+        self.scorer.record_success(self.nodes[0], 0.2)
+        self.scorer.record_success(self.nodes[0], 0.4)
+        stats = self.scorer.snapshot()[self.nodes[0]]
+        self.assertAlmostEqual(stats["latency"], 0.26)
+        self.assertEqual(stats["samples"], 2)
+
+
+class TestHeadTracker(unittest.TestCase):
+    """Unit tests for the HeadTracker class."""
+
+    def setUp(self):
+        self.now = [0.0]
+        self.tracker = HeadTracker(max_lag=10, ttl=60.0, clock=lambda: self.now[0])
+
+    def test_lagging_node_moves_last(self):
+        self.tracker.observe("https://a.example", 100)
+        self.tracker.observe("https://b.example", 150)
+        self.assertTrue(self.tracker.is_lagging("https://a.example"))
+        self.assertEqual(
+            self.tracker.partition(["https://a.example", "https://b.example"]),
+            ["https://b.example", "https://a.example"],
+        )
+
+    def test_older_observations_are_projected_forward(self):
+        self.tracker.observe("https://a.example", 100)
+        self.now[0] = 30.0
+        self.tracker.observe("https://b.example", 110)
+        self.assertAlmostEqual(self.tracker.lag("https://a.example"), 0.0)
+        self.assertFalse(self.tracker.is_lagging("https://a.example"))
+
+    def test_stale_observations_expire(self):
+        self.tracker.observe("https://a.example", 100)
+        self.tracker.observe("https://b.example", 200)
+        self.now[0] = 61.0
+        self.assertIsNone(self.tracker.lag("https://a.example"))
+        self.assertFalse(self.tracker.is_lagging("https://a.example"))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Unit tests for the CircuitBreaker class."""
+
+    def setUp(self):
+        self.now = [0.0]
+        self.breaker = CircuitBreaker(
+            failure_threshold=2, cooldown=10.0, clock=lambda: self.now[0]
+        )
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_half_open_admits_single_probe(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now[0] = 10.0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_probe_reopens(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now[0] = 10.0
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.now[0] = 15.0
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_registry_shares_breakers(self):
+        registry = BreakerRegistry(failure_threshold=1)
+        registry.get("https://a.example").record_failure()
+        self.assertEqual(registry.states(), {"https://a.example": OPEN})
+
+
+if __name__ == "__main__":
+    unittest.main()
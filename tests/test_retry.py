@@ -0,0 +1,44 @@
+"""Unit tests for the retry policy."""
+
+import random
+import unittest
+
+import httpx
+
+from nectarlite.exceptions import NodeError
+from nectarlite.retry import RetryPolicy
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Unit tests for the RetryPolicy class."""
+
+    def test_classifies_errors(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retriable(httpx.ConnectError("down")))
+        self.assertTrue(policy.is_retriable(NodeError("Unable to acquire lock")))
+        self.assertFalse(policy.is_retriable(NodeError("bad", code=-32602)))
+        self.assertFalse(policy.is_retriable(NodeError("no api", code=-32601)))
+        self.assertFalse(
+            policy.is_retriable(NodeError("x", data={"name": "missing_auth"}))
+        )
+        self.assertFalse(
+            policy.is_retriable(NodeError("Assert Exception:false: bad weight"))
+        )
+
+    def test_backoff_is_capped_with_full_jitter(self):
+        policy = RetryPolicy(backoff_base=0.1, backoff_max=0.3, rng=random.Random(1))
+        self.assertEqual(policy.backoff(0), 0.0)
+        self.assertEqual(policy.backoff(1), 0.0)
+        for attempt in range(2, 10):
+            self.assertLessEqual(policy.backoff(attempt), 0.3)
+        policy.jitter = False
+        self.assertEqual([policy.backoff(n) for n in (2, 3, 5)], [0.1, 0.2, 0.3])
+
+    def test_budget_limits_retries(self):
+        policy = RetryPolicy(budget_ratio=0.5, budget_max=2)
+        self.assertTrue(policy.acquire_retry())
+        self.assertTrue(policy.acquire_retry())
+        self.assertFalse(policy.acquire_retry())
+        policy.record_call()
+        policy.record_call()
+        self.assertTrue(policy.acquire_retry())
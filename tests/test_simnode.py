@@ -0,0 +1,86 @@
+"""Unit tests for the simulated Hive node."""
+
+import unittest
+
+from nectarlite.api import Api, AsyncApi
+from nectarlite.exceptions import NodeError
+from nectarlite.nodes import BreakerRegistry, NodeScorer
+from nectarlite.simnode import SimulatedNode
+from nectarlite.stream import Stream
+
+NODES = ["https://a.sim", "https://b.sim"]
+
+
+class TestSimulatedNode(unittest.TestCase):
+    """Drive Api and Stream against a SimulatedNode."""
+
+    def setUp(self):
+        self.node = SimulatedNode(start_block=100, block_interval=None, ops_per_block=3)
+        self.api = Api(NODES, breakers=BreakerRegistry(), transport=self.node)
+
+    def test_chain_grows_and_streams(self):
+        self.node.advance(30)
+        props = self.api.call("condenser_api", "get_dynamic_global_properties")
+        self.assertEqual(props["head_block_number"], 130)
+        self.assertEqual(props["last_irreversible_block_num"], 110)
+
+        blocks = list(Stream(self.api, start_block=101, end_block=103).stream_blocks())
+        self.assertEqual([block.block_num for block in blocks], [101, 102, 103])
+        self.assertEqual(len(blocks[0]["transactions"]), 3)
+        self.assertEqual(blocks[1]["previous"], blocks[0]["block_id"])
+
+        block_range = self.api.call(
+            "block_api", "get_block_range", {"starting_block_num": 129, "count": 5}
+        )
+        self.assertEqual(len(block_range["blocks"]), 2)
+        self.assertIsNone(self.api.call("condenser_api", "get_block", [131]))
+
+    def test_broadcast_lands_in_next_block(self):
+        trx = {"operations": [["vote", {"voter": "alice"}]], "signatures": []}
+        receipt = self.api.call(
+            "condenser_api", "broadcast_transaction_synchronous", [trx]
+        )
+        self.assertEqual(receipt["block_num"], 101)
+        self.node.advance()
+        block = self.api.call("block_api", "get_block", {"block_num": 101})["block"]
+        self.assertEqual(
+            block["transactions"][-1]["operations"][0]["type"], "vote_operation"
+        )
+
+    def test_host_lag_demotes_node(self):
+        self.node.advance(100)
+        self.node.host_lag["a.sim"] = 50
+        scorer = NodeScorer(exploration=0.0)
+        scorer.record_success(NODES[0], 0.01)
+        scorer.record_success(NODES[1], 0.5)
+        api = Api(NODES, scorer=scorer, breakers=BreakerRegistry(), transport=self.node)
+        api.probe_nodes()
+
+        props = api.call("condenser_api", "get_dynamic_global_properties")
+        self.assertEqual(props["head_block_number"], 200)
+
+    def test_injected_errors_fail_over(self):
+        node = SimulatedNode(error_rate=0.5, seed=3)
+        api = Api(NODES, breakers=BreakerRegistry(), transport=node)
+        for _ in range(10):
+            try:
+                api.call("condenser_api", "get_accounts", [["alice"]])
+            except NodeError:
+                pass
+        self.assertGreater(node.requests, 10)
+        self.assertEqual(node.calls["condenser_api.get_accounts"], node.requests)
+
+
+class TestAsyncSimulatedNode(unittest.IsolatedAsyncioTestCase):
+    """Drive AsyncApi against a SimulatedNode."""
+
+    async def test_async_batch(self):
+        node = SimulatedNode(block_interval=None, latency=(0.0, 0.001))
+        node.advance(10)
+        async with AsyncApi(NODES, breakers=BreakerRegistry(), transport=node) as api:
+            blocks = await api.call_batch(
+                [("condenser_api", "get_block", [n]) for n in range(1, 6)]
+            )
+        self.assertEqual(
+            [b["block_id"] for b in blocks], [node.block_id(n) for n in range(1, 6)]
+        )
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
-from unittest.mock import Mock
+import threading
+from unittest.mock import Mock, patch
 
 import pytest
 
 from nectarlite.api import Api
-from nectarlite.stream import Stream
+from nectarlite.checkpoint import FileCheckpointStore
+from nectarlite.exceptions import NodeError
+from nectarlite.stream import BlockListener, BlockScheduler, Stream
 
 
 @pytest.fixture
@@ -84,3 +87,154 @@ def test_on_filter_by_op_type(mock_api_factory):
     listener = Stream(api=mock_api, start_block=1, end_block=3)
     transfer_ops = list(listener.on("transfer"))
     assert len(transfer_ops) == 2
+
+
+def _chain_api(head, missing_once=(), ranges=True):
+    """Mock Api with blocks ``1..head`` and a fixed irreversible head."""
+    api = Mock(spec=Api)
+    missing = set(missing_once)
+    threads = set()
+
+    def call_side_effect(api_name, method, params=[]):
+        if method == "get_dynamic_global_properties":
+            return {"last_irreversible_block_num": head}
+        threads.add(threading.current_thread().name)
+        if method == "get_block_range" and ranges:
+            blocks = []
+            first = params["starting_block_num"]
+            for block_num in range(first, min(head, first + params["count"] - 1) + 1):
+                if block_num in missing:
+                    missing.discard(block_num)
+                    break
+                blocks.append(
+                    {"block_id": block_num, "transactions": [], "transaction_ids": []}
+                )
+            return {"blocks": blocks}
+        if method == "get_block":
+            if params[0] in missing:
+                missing.discard(params[0])
+                return None
+            return {"block_id": params[0], "transactions": []}
+        raise NodeError(f"Could not find method {api_name}.{method}", code=-32601)
+
+    api.call.side_effect = call_side_effect
+    api.threads = threads
+    return api
+
+
+def test_catch_up_prefetches_in_order():
+    """Blocks far behind the head are fetched concurrently but yielded in order."""
+    api = _chain_api(head=100)
+    listener = Stream(api=api, start_block=1, end_block=60, prefetch=8, range_size=7)
+    blocks = list(listener.stream_blocks())
+    assert [block.block_num for block in blocks] == list(range(1, 61))
+    assert [block.data["block_id"] for block in blocks] == list(range(1, 61))
+    assert any(name.startswith("nectarlite-prefetch") for name in api.threads)
+    methods = [c.args[1] for c in api.call.call_args_list]
+    assert "get_block" not in methods
+    assert methods.count("get_block_range") == 9
+
+
+@patch("nectarlite.stream.time.sleep")
+def test_catch_up_retries_block_not_yet_available(mock_sleep):
+    """A block missing from the node is retried rather than skipped."""
+    api = _chain_api(head=100, missing_once={10})
+    listener = Stream(api=api, start_block=1, end_block=30, prefetch=4)
+    blocks = list(listener.stream_blocks())
+    assert [block.block_num for block in blocks] == list(range(1, 31))
+    mock_sleep.assert_called_once_with(1.0)
+
+
+def test_catch_up_falls_back_to_single_blocks():
+    """Nodes without block_api ranges are asked for one block at a time."""
+    api = _chain_api(head=100, ranges=False)
+    listener = Stream(api=api, start_block=1, end_block=20, range_size=5)
+    blocks = list(listener.stream_blocks())
+    assert [block.block_num for block in blocks] == list(range(1, 21))
+    methods = [c.args[1] for c in api.call.call_args_list]
+    assert methods.count("get_block_range") == 1
+
+
+def test_target_height_cached_until_reached():
+    """The head is re-read only after the known target has been reached."""
+    api = _chain_api(head=100)
+    listener = BlockListener(api, start_block=91, end_block=99, catch_up_threshold=20)
+    blocks = list(listener.stream_blocks())
+    assert [block.block_num for block in blocks] == list(range(91, 100))
+    methods = [c.args[1] for c in api.call.call_args_list]
+    assert methods.count("get_dynamic_global_properties") == 1
+    assert listener.rpc_count == 10
+    assert listener.rpcs_per_block == pytest.approx(10 / 9)
+
+
+@patch("nectarlite.stream.time.sleep")
+def test_single_block_not_yet_available_is_retried(mock_sleep):
+    """Near the head, a block the node returns as empty is not skipped."""
+    api = _chain_api(head=10, missing_once={6})
+    listener = BlockListener(api, start_block=5, end_block=9, catch_up_threshold=20)
+    blocks = list(listener.stream_blocks())
+    assert [block.block_num for block in blocks] == [5, 6, 7, 8, 9]
+    mock_sleep.assert_called_once_with(1.0)
+
+
+def test_stream_passes_listener_options():
+    scheduler = BlockScheduler(wake_margin=0.5)
+    stream = Stream(
+        api=_chain_api(head=10),
+        catch_up_threshold=20,
+        range_size=7,
+        scheduler=scheduler,
+    )
+    assert stream.block_listener.catch_up_threshold == 20
+    assert stream.block_listener.range_size == 7
+    assert stream.block_listener.scheduler is scheduler
+
+
+def test_scheduler_wakes_just_after_next_block():
+    now = [1_700_000_001.0]
+    scheduler = BlockScheduler(wake_margin=0.2, clock=lambda: now[0])
+    scheduler.observe({"time": "2023-11-14T22:13:20"})  # 1_700_000_000
+    assert scheduler.idle_delay() == pytest.approx(2.2)
+    now[0] += 2.5  # the next block is overdue: poll again soon
+    assert scheduler.idle_delay() == pytest.approx(0.2)
+    now[0] += 2.0  # long overdue: wait for the following slot
+    assert scheduler.idle_delay() == pytest.approx(0.7)
+
+
+def test_scheduler_error_backoff_is_capped():
+    scheduler = BlockScheduler(error_backoff=1.0, max_error_backoff=5.0)
+    assert [scheduler.error_delay() for _ in range(5)] == [1, 2, 4, 5, 5]
+    scheduler.reset_errors()
+    assert scheduler.error_delay() == 1
+
+
+def test_head_block_delivered_with_delay():
+    """The target block itself is fetched and carries its delivery delay."""
+    api = Mock(spec=Api)
+
+    def call_side_effect(api_name, method, params=[]):
+        if method == "get_dynamic_global_properties":
+            return {"last_irreversible_block_num": 5, "time": "2023-11-14T22:13:20"}
+        return {"timestamp": "2023-11-14T22:13:20", "transactions": []}
+
+    api.call.side_effect = call_side_effect
+    scheduler = BlockScheduler(clock=lambda: 1_700_000_000.4)
+    listener = BlockListener(api, start_block=5, end_block=5, scheduler=scheduler)
+    blocks = list(listener.stream_blocks())
+    assert [block.block_num for block in blocks] == [5]
+    assert blocks[0].delivery_delay == pytest.approx(0.4)
+    assert listener.last_delivery_delay == pytest.approx(0.4)
+
+
+def test_checkpoint_resumes_after_last_consumed_block(tmp_path):
+    """A restarted stream continues after the last block fully consumed."""
+    path = tmp_path / "stream.checkpoint"
+    api = _chain_api(head=100)
+    stream = Stream(api=api, start_block=1, end_block=10, checkpoint=str(path))
+    blocks = stream.stream_blocks()
+    assert [next(blocks).block_num for _ in range(3)] == [1, 2, 3]
+    blocks.close()  # crash while block 3 is still being handled
+
+    resumed = Stream(api=api, start_block=1, end_block=10, checkpoint=str(path))
+    assert [block.block_num for block in resumed.stream_blocks()] == list(range(3, 11))
+    assert FileCheckpointStore(path).load() == 10
@@ -4,7 +4,10 @@ import json
 import unittest
 from unittest.mock import MagicMock, patch
 
+from nectarlite.api import Api
 from nectarlite.exceptions import TransactionError
+from nectarlite.nodes import BreakerRegistry
+from nectarlite.simnode import SimulatedNode
 from nectarlite.transaction import (
     CommentOperation,
     CommentOptionsOperation,
@@ -55,6 +58,33 @@ class TestTransaction(unittest.TestCase):
 
         self.assertEqual(result, {"id": "123"})
 
+    @patch("nectarlite.transaction.sign")
+    def test_calls_share_one_node_session(self, mock_sign):
+        """Signing and broadcasting with an Api stay on a single node."""
+        mock_sign.return_value = b"\x1f" * 65
+        node = SimulatedNode(block_interval=None, ops_per_block=0)
+        node.advance(50)
+        hosts = []
+        handle = node.handle_request
+
+        def record_host(request):
+            hosts.append(request.url.host)
+            return handle(request)
+
+        node.handle_request = record_host
+        api = Api(
+            ["https://a.sim", "https://b.sim", "https://c.sim"],
+            breakers=BreakerRegistry(),
+            transport=node,
+        )
+        tx = Transaction(api=api)
+        tx.append_op(Transfer(to="bob", amount="1.000", asset="HIVE", frm="alice"))
+        tx.sign("5J...")
+        tx.broadcast()
+
+        self.assertEqual(len(hosts), 4)
+        self.assertEqual(len(set(hosts)), 1)
+
     @patch("nectarlite.transaction.sign")
     def test_failed_broadcast(self, mock_sign):
         """Test a failed transaction broadcast."""